@@ -0,0 +1,208 @@
+"""Benchmarks for the moving average kernels in `app.moving_avg`.
+
+Run from the repository root:
+
+    PYTHONPATH=src python benchmarks/bench_moving_avg.py --rows 1000000
+"""
+
+import argparse
+import io
+import logging
+import time
+from collections.abc import Callable
+
+import numpy as np
+import pandas as pd
+
+# Route app loggers through a quiet root handler so per-call logging does not skew timings.
+logging.basicConfig(level=logging.WARNING)
+
+# config_shared must be initialised before app.utils is imported directly.
+from app import config_shared  # noqa: E402
+from app import moving_avg, moving_avg_array  # noqa: E402
+from app.moving_avg import (  # noqa: E402
+    calculate_moving_average,
+    calculate_moving_averages,
+    calculate_panel_moving_average,
+)
+from app.moving_avg_array import moving_average  # noqa: E402
+
+BATCH_SPECS = [
+    (method, window) for method in ("sma", "ema", "dema", "tema") for window in (5, 10, 20, 50, 200)
+]
+
+
+def _legacy_wma(data: pd.Series, window: int) -> pd.Series:
+    """Reference WMA using the former per-window Python callback."""
+    weights = np.arange(1, window + 1)
+    return data.rolling(window).apply(lambda x: float(np.dot(x, weights) / weights.sum()), raw=True)
+
+
+def _legacy_kama(data: pd.Series, window: int) -> pd.Series:
+    """Reference KAMA using the former per-row `.iloc` loop."""
+    change = (data - data.shift(window)).abs()
+    volatility = data.diff().abs().rolling(window=window).sum().replace(0, np.nan)
+    sc = (change / volatility * (2 / 3 - 2 / 31) + 2 / 31) ** 2
+    kama = data.copy().astype("float64")
+    for i in range(window, len(data)):
+        kama.iloc[i] = kama.iloc[i - 1] + sc.iloc[i] * (data.iloc[i] - kama.iloc[i - 1])
+    return kama
+
+
+def _timeit(func: Callable[[], object], repeat: int) -> float:
+    """Return the best wall-clock time of `repeat` runs, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_wma(prices: pd.Series, window: int, repeat: int) -> None:
+    """Compare the vectorized WMA against the legacy rolling-apply implementation."""
+    legacy = _timeit(lambda: _legacy_wma(prices, window), 1)
+    fast = _timeit(lambda: calculate_moving_average(prices, window, "wma"), repeat)
+    error = np.nanmax(
+        np.abs(calculate_moving_average(prices, window, "wma") - _legacy_wma(prices, window))
+    )
+    print(
+        f"wma  window={window:<4d} legacy={legacy:8.3f}s  vectorized={fast:8.4f}s  "
+        f"speedup={legacy / fast:7.1f}x  max_abs_err={error:.2e}"
+    )
+
+
+def bench_kama(prices: pd.Series, window: int, repeat: int) -> None:
+    """Compare the buffer-based KAMA recurrence against the legacy `.iloc` loop."""
+    calculate_moving_average(prices.iloc[: window + 1], window, "kama")  # JIT warm-up
+    legacy = _timeit(lambda: _legacy_kama(prices, window), 1)
+    fast = _timeit(lambda: calculate_moving_average(prices, window, "kama"), repeat)
+    identical = np.array_equal(
+        calculate_moving_average(prices, window, "kama").to_numpy(),
+        _legacy_kama(prices, window).to_numpy(),
+        equal_nan=True,
+    )
+    print(
+        f"kama window={window:<4d} legacy={legacy:8.3f}s  kernel={fast:8.4f}s  "
+        f"speedup={legacy / fast:7.1f}x  identical={identical}  backend={_kama_backend()}"
+    )
+
+
+def _kama_backend() -> str:
+    """Return the name of the active KAMA kernel backend."""
+    kernel = moving_avg_array._kama_kernel_impl
+    return "python" if kernel is moving_avg_array._kama_kernel_py else "numba"
+
+
+def bench_batch(prices: pd.Series, repeat: int) -> None:
+    """Compare one shared-intermediate batch call against separate per-spec calls."""
+    separate = _timeit(
+        lambda: [calculate_moving_average(prices, w, method) for method, w in BATCH_SPECS],
+        repeat,
+    )
+    batch = _timeit(lambda: calculate_moving_averages(prices, BATCH_SPECS), repeat)
+    print(
+        f"batch specs={len(BATCH_SPECS):<3d} separate={separate:8.4f}s  batch={batch:8.4f}s  "
+        f"speedup={separate / batch:7.1f}x"
+    )
+
+
+def bench_small_arrays(n_series: int, length: int, repeat: int) -> None:
+    """Compare the pandas API against the ndarray API with a reused buffer on short series."""
+    rng = np.random.default_rng(1)
+    arrays = list(100 + np.cumsum(rng.normal(size=(n_series, length)), axis=1))
+    series = [pd.Series(values) for values in arrays]
+    out = np.empty(length)
+    for method in ("sma", "ema", "kama"):
+        moving_average(arrays[0], 10, method, out=out)  # JIT warm-up
+        pandas_api = _timeit(
+            lambda: [calculate_moving_average(data, 10, method) for data in series], repeat
+        )
+        array_api = _timeit(
+            lambda: [moving_average(values, 10, method, out=out) for values in arrays], repeat
+        )
+        print(
+            f"ndarray {method:<4s} series={n_series}x{length} pandas={pandas_api:8.4f}s  "
+            f"ndarray={array_api:8.4f}s  speedup={pandas_api / array_api:7.1f}x"
+        )
+
+
+def bench_panel(n_symbols: int, length: int, repeat: int) -> None:
+    """Compare one panel call against a per-symbol loop over a ragged wide matrix."""
+    rng = np.random.default_rng(2)
+    panel = pd.DataFrame(100 + np.cumsum(rng.normal(size=(length, n_symbols)), axis=0))
+    starts = rng.integers(0, length // 2, size=n_symbols)
+    panel = panel.mask(np.arange(length)[:, None] < starts)
+    for method in ("sma", "ema", "kama"):
+        calculate_panel_moving_average(panel.iloc[:, :2], 20, method)  # JIT warm-up
+        per_symbol = _timeit(
+            lambda: [
+                calculate_moving_average(panel[column].dropna(), 20, method)
+                for column in panel.columns
+            ],
+            1,
+        )
+        vectorized = _timeit(lambda: calculate_panel_moving_average(panel, 20, method), repeat)
+        print(
+            f"panel {method:<4s} symbols={n_symbols}x{length} per_symbol={per_symbol:8.3f}s  "
+            f"panel={vectorized:8.4f}s  speedup={per_symbol / vectorized:7.1f}x"
+        )
+
+
+def bench_logging(n_calls: int, length: int, repeat: int) -> None:
+    """Compare per-call INFO logging against hot-path mode on short series.
+
+    The moving average logger writes to an in-memory stream at INFO, as a
+    production logger writes to stdout, so the default mode pays for
+    formatting and emitting a record on every call.
+    """
+    series = pd.Series(100 + np.cumsum(np.random.default_rng(3).normal(size=length)))
+    log = moving_avg.logger
+    saved = log.handlers[:], log.level, log.propagate, config_shared.get_hot_path_logging
+    log.handlers[:] = [logging.StreamHandler(io.StringIO())]
+    log.setLevel(logging.INFO)
+    log.propagate = False
+    try:
+        config_shared.get_hot_path_logging = lambda: False
+        info = _timeit(
+            lambda: [calculate_moving_average(series, 10, "sma") for _ in range(n_calls)], repeat
+        )
+        config_shared.get_hot_path_logging = lambda: True
+        hot = _timeit(
+            lambda: [calculate_moving_average(series, 10, "sma") for _ in range(n_calls)], repeat
+        )
+    finally:
+        log.handlers[:], level, log.propagate, config_shared.get_hot_path_logging = saved
+        log.setLevel(level)
+    print(
+        f"logging calls={n_calls}x{length} info={info:8.4f}s  hot_path={hot:8.4f}s  "
+        f"saved={(info - hot) / n_calls * 1e6:6.2f}us/call  speedup={info / hot:5.2f}x"
+    )
+
+
+def main() -> None:
+    """Parse arguments and run the benchmarks."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--kama-rows", type=int, default=100_000, help="rows for the (slow) legacy KAMA loop"
+    )
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    prices = pd.Series(100 + np.cumsum(rng.normal(size=args.rows)))
+    print(f"rows={args.rows}")
+
+    for window in (10, 200):
+        bench_wma(prices, window, args.repeat)
+
+    bench_kama(prices.iloc[: args.kama_rows], 10, args.repeat)
+    bench_batch(prices, args.repeat)
+    bench_small_arrays(2_000, 500, args.repeat)
+    bench_panel(6_000, 500, args.repeat)
+    bench_logging(20_000, 100, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,382 @@
+"""Optional asyncio runtime for the consume, compute and dispatch pipeline.
+
+Enabled with ``RUNTIME=async``; the blocking runtime in `app.main` stays the
+default. Consuming, computing and dispatching run as concurrent stages joined
+by bounded queues, so a slow sink applies backpressure to the consumer instead
+of stalling the broker connection. Indicator math runs in a single worker
+thread, which keeps price history updates in arrival order and leaves the
+event loop free while NumPy works.
+
+RabbitMQ is consumed with aio-pika and REST output is posted with aiohttp
+(``pip install .[async]``). SQS and the other sinks keep their blocking
+clients and run in worker threads.
+"""
+
+import asyncio
+import json
+import signal
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import app.config_shared as config
+from app.output_handler import OutputDispatcher
+from app.processor import process_batch_with_metrics
+from app.queue_handler import _delete_sqs_messages, _VisibilityHeartbeat
+from app.utils.metrics import record_sink_metrics
+from app.utils.setup_logger import setup_logger
+
+try:
+    import aio_pika
+except ImportError:
+    aio_pika = None  # async RabbitMQ consumer unavailable
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None  # REST output falls back to the blocking client
+
+logger = setup_logger(__name__)
+
+# Seconds to wait before polling SQS again after a receive error
+SQS_ERROR_BACKOFF_SECONDS = 5
+
+
+class ReceivedBatch:
+    """A batch of decoded messages and the coroutine that settles it with the broker."""
+
+    def __init__(self, messages: list[dict], settle: Callable[[bool], Awaitable[None]]) -> None:
+        """Create a received batch.
+
+        Args:
+            messages (list[dict]): Decoded message bodies.
+            settle (Callable[[bool], Awaitable[None]]): Acknowledges the batch when
+                called with True, rejects it when called with False.
+
+        """
+        self.messages = messages
+        self.settle = settle
+
+
+async def run_pipeline(
+    source: AsyncIterator[ReceivedBatch],
+    compute: Callable[[list[dict]], list[dict]],
+    dispatch: Callable[[list[dict]], Awaitable[None]],
+    queue_size: int = 2,
+) -> None:
+    """Run the consume, compute and dispatch stages until the source is exhausted.
+
+    Each stage runs as its own task, and at most `queue_size` batches wait
+    between two stages. Batches are settled in the order they were received,
+    after their outputs are dispatched or once they fail.
+
+    Args:
+        source (AsyncIterator[ReceivedBatch]): Received message batches.
+        compute (Callable[[list[dict]], list[dict]]): Blocking batch processor,
+            run in a worker thread.
+        dispatch (Callable[[list[dict]], Awaitable[None]]): Sends one output batch.
+        queue_size (int): Maximum batches waiting between two stages.
+
+    """
+    loop = asyncio.get_running_loop()
+    received: asyncio.Queue[ReceivedBatch | None] = asyncio.Queue(maxsize=queue_size)
+    computed: asyncio.Queue[tuple[ReceivedBatch, list[dict] | None] | None] = asyncio.Queue(
+        maxsize=queue_size
+    )
+
+    async def consume() -> None:
+        try:
+            async for batch in source:
+                await received.put(batch)
+        finally:
+            await received.put(None)
+
+    async def compute_stage(executor: ThreadPoolExecutor) -> None:
+        while (batch := await received.get()) is not None:
+            try:
+                outputs = await loop.run_in_executor(executor, compute, batch.messages)
+            except Exception:
+                logger.error("❌ Batch processing failed (details redacted)")
+                outputs = None
+            # Failed batches still pass through so that batches settle in order
+            await computed.put((batch, outputs))
+        await computed.put(None)
+
+    async def dispatch_stage() -> None:
+        while (item := await computed.get()) is not None:
+            batch, outputs = item
+            success = outputs is not None
+            if outputs:
+                try:
+                    await dispatch(outputs)
+                except Exception:
+                    logger.error("❌ Output dispatch failed (details redacted)")
+                    success = False
+            try:
+                await batch.settle(success)
+            except Exception:
+                logger.error("❌ Failed to settle message batch (details redacted)")
+
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="compute") as executor:
+        await asyncio.gather(consume(), compute_stage(executor), dispatch_stage())
+
+
+async def _connect_rabbitmq() -> Any:
+    """Open a robust aio-pika connection to the configured broker.
+
+    Raises:
+        RuntimeError: If aio-pika is not installed.
+
+    """
+    if aio_pika is None:
+        raise RuntimeError("RUNTIME=async with RabbitMQ requires aio-pika (pip install .[async])")
+
+    return await aio_pika.connect_robust(
+        host=config.get_rabbitmq_host(),
+        port=int(config.get_rabbitmq_port()),
+        virtualhost=config.get_rabbitmq_vhost(),
+        login=config.get_rabbitmq_user(),
+        password=config.get_rabbitmq_password(),
+    )
+
+
+async def _rabbitmq_batches(connection: Any, stop: asyncio.Event) -> AsyncIterator[ReceivedBatch]:
+    """Consume RabbitMQ with aio-pika and yield batches by size and linger time.
+
+    The caller owns `connection` and must keep it open until every yielded
+    batch has been settled, including batches still in the pipeline when
+    consumption stops.
+
+    Args:
+        connection: Open aio-pika connection.
+        stop (asyncio.Event): Ends consumption once set.
+
+    Yields:
+        ReceivedBatch: Batches settled with one multiple ack or nack.
+
+    """
+    batch_size = config.get_batch_size()
+    linger = config.get_batch_linger_ms() / 1000
+    requeue = config.get_rabbitmq_requeue_on_failure()
+    channel = await connection.channel()
+    # Leave room for the batches held in the pipeline queues
+    await channel.set_qos(prefetch_count=batch_size * (config.get_work_queue_size() + 2))
+    amqp_queue = await channel.declare_queue(config.get_rabbitmq_queue(), durable=True)
+    # Deliveries are pushed into a local queue, so waiting on it with a timeout never
+    # cancels the consumer itself; prefetch bounds how many it holds
+    deliveries: asyncio.Queue[Any] = asyncio.Queue()
+    consumer_tag = await amqp_queue.consume(deliveries.put)
+    logger.info("🚀 Consuming RabbitMQ messages with aio-pika")
+
+    try:
+        pending: list[dict] = []
+        last = None
+        deadline = 0.0
+        while not stop.is_set():
+            timeout = max(deadline - time.monotonic(), 0) if pending else 1.0
+            try:
+                delivery = await asyncio.wait_for(deliveries.get(), timeout)
+            except asyncio.TimeoutError:
+                delivery = None
+
+            if delivery is not None:
+                try:
+                    message = json.loads(delivery.body)
+                except Exception:
+                    logger.warning("⚠️ Failed to parse RabbitMQ message body (redacted)")
+                    await delivery.nack(requeue=False)
+                    continue
+                if not pending:
+                    deadline = time.monotonic() + linger
+                pending.append(message)
+                last = delivery
+
+            if pending and (len(pending) >= batch_size or time.monotonic() >= deadline):
+                yield ReceivedBatch(pending, _rabbitmq_settler(last, requeue))
+                pending, last = [], None
+
+        if pending:
+            yield ReceivedBatch(pending, _rabbitmq_settler(last, requeue))
+    finally:
+        # Deliveries still in the local queue stay unacknowledged and are requeued
+        # by the broker when the connection closes
+        await amqp_queue.cancel(consumer_tag)
+
+
+def _rabbitmq_settler(last: Any, requeue: bool) -> Callable[[bool], Awaitable[None]]:
+    """Return a coroutine function that settles every delivery up to `last`."""
+
+    async def settle(success: bool) -> None:
+        if success:
+            await last.ack(multiple=True)
+        else:
+            await last.nack(multiple=True, requeue=requeue)
+
+    return settle
+
+
+async def _sqs_batches(stop: asyncio.Event) -> AsyncIterator[ReceivedBatch]:
+    """Poll SQS from a worker thread and yield each received batch.
+
+    As in the blocking consumer, receive errors are logged and polling resumes
+    after a backoff, and each batch gets a visibility heartbeat until it is
+    settled, so batches waiting in the pipeline queues or on a slow sink are
+    not redelivered.
+
+    Args:
+        stop (asyncio.Event): Ends polling once set.
+
+    Yields:
+        ReceivedBatch: Batches deleted from the queue once dispatched.
+
+    """
+    import boto3
+    from botocore.exceptions import BotoCoreError, ClientError, NoCredentialsError
+
+    sqs = boto3.client("sqs", region_name=config.get_sqs_region())
+    queue_url = config.get_sqs_queue_url()
+    batch_size = min(config.get_batch_size(), 10)
+    visibility_timeout = config.get_sqs_visibility_timeout()
+    logger.info("🚀 Polling SQS messages in the asyncio runtime")
+
+    while not stop.is_set():
+        try:
+            response = await asyncio.to_thread(
+                sqs.receive_message,
+                QueueUrl=queue_url,
+                MaxNumberOfMessages=batch_size,
+                WaitTimeSeconds=10,
+                VisibilityTimeout=visibility_timeout,
+            )
+        except (BotoCoreError, ClientError, NoCredentialsError):
+            logger.error("❌ SQS error encountered (details redacted)")
+            try:
+                await asyncio.wait_for(stop.wait(), SQS_ERROR_BACKOFF_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            continue
+
+        messages, handles = [], []
+        for message in response.get("Messages", []):
+            try:
+                messages.append(json.loads(message["Body"]))
+                handles.append(message["ReceiptHandle"])
+            except Exception:
+                logger.warning("⚠️ Failed to parse SQS message body (redacted)")
+        if not messages:
+            continue
+
+        heartbeat = _VisibilityHeartbeat(sqs, queue_url, handles, visibility_timeout).start()
+
+        async def settle(
+            success: bool, handles: list[str] = handles, heartbeat: Any = heartbeat
+        ) -> None:
+            await asyncio.to_thread(heartbeat.stop)
+            # Failed messages become visible again once their visibility timeout ends
+            if success:
+                await asyncio.to_thread(_delete_sqs_messages, sqs, queue_url, handles)
+
+        yield ReceivedBatch(messages, settle)
+
+
+class AsyncOutputDispatcher:
+    """Dispatches output batches without blocking the event loop.
+
+    REST output is posted with a shared aiohttp session. The other configured
+    modes go through the blocking `OutputDispatcher` in a worker thread.
+    """
+
+    def __init__(self, dispatcher: OutputDispatcher | None = None) -> None:
+        """Initialize from the configured output modes.
+
+        Args:
+            dispatcher (OutputDispatcher | None): Blocking dispatcher for the modes
+                that have no asyncio client (default: a new `OutputDispatcher`).
+
+        """
+        self.dispatcher = dispatcher or OutputDispatcher()
+        self.rest = (
+            aiohttp is not None
+            and "rest" in self.dispatcher.output_modes
+            and not config.get_paper_trading_enabled()
+        )
+        if self.rest:
+            self.dispatcher.output_modes = [m for m in self.dispatcher.output_modes if m != "rest"]
+        self._session: Any = None
+
+    async def send(self, data: list[dict[str, Any]]) -> None:
+        """Send one output batch to every configured mode concurrently.
+
+        Args:
+            data (list[dict[str, Any]]): Output payloads.
+
+        """
+        sends = [asyncio.to_thread(self.dispatcher.send, data)]
+        if self.rest:
+            sends.append(self._post_rest(data))
+        await asyncio.gather(*sends)
+
+    async def close(self) -> None:
+        """Close the HTTP session if one was opened."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def _post_rest(self, data: list[dict[str, Any]]) -> None:
+        """Post the data to the configured REST endpoint.
+
+        Args:
+            data (list[dict[str, Any]]): Data to post to REST API.
+
+        """
+        if self._session is None:
+            self._session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=10))
+        start = time.perf_counter()
+        try:
+            async with self._session.post(config.get_rest_output_url(), json=data) as response:
+                duration = time.perf_counter() - start
+                ok = response.status < 400
+                record_sink_metrics("rest", str(response.status), duration, failed=not ok)
+            if ok:
+                logger.info("🚀 Sent data to REST: HTTP %d", response.status)
+            else:
+                logger.error("❌ REST output failed: HTTP %d", response.status)
+        except Exception as e:
+            logger.error("❌ REST output error: %s", e)
+            record_sink_metrics("rest", "exception", 0, failed=True)
+
+
+async def _run() -> None:
+    """Wire the configured queue, processor and outputs into the pipeline."""
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, stop.set)
+
+    queue_type = config.get_queue_type().lower()
+    connection = None
+    if queue_type == "rabbitmq":
+        connection = await _connect_rabbitmq()
+        source = _rabbitmq_batches(connection, stop)
+    elif queue_type == "sqs":
+        source = _sqs_batches(stop)
+    else:
+        raise ValueError("Unsupported QUEUE_TYPE: [REDACTED]")
+
+    output = AsyncOutputDispatcher()
+    try:
+        await run_pipeline(
+            source, process_batch_with_metrics, output.send, config.get_work_queue_size()
+        )
+    finally:
+        await output.close()
+        if connection is not None:
+            # Closed only once the pipeline has drained, so queued batches can still settle
+            await connection.close()
+        logger.info("🛑 Asyncio runtime stopped.")
+
+
+def run() -> None:
+    """Run the asyncio runtime until a shutdown signal is received."""
+    asyncio.run(_run())
@@ -0,0 +1,246 @@
+"""Columnar (Arrow and Parquet) output of analysis results.
+
+Computed DataFrames are converted to Arrow tables column by column, without
+building a dict per row, and written as Parquet files or Arrow IPC files.
+Arrow IPC files can be memory-mapped by readers for zero-copy access. Tables
+are split into the same ``date=YYYY-MM-DD/symbol=SYM`` partitions used by the
+S3 sink, and `LocalFileSink` writes them below a local directory.
+
+Requires pyarrow (``pip install .[s3]``).
+"""
+
+import os
+import re
+import time
+import uuid
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import IO, Any
+
+import pandas as pd
+
+import app.config_shared as config
+from app.utils.setup_logger import setup_logger
+
+try:
+    import pyarrow
+    import pyarrow.compute
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None  # columnar output unavailable
+
+logger = setup_logger(__name__)
+
+COLUMNAR_FORMATS = ("parquet", "arrow")
+FILE_EXTENSIONS = {"parquet": ".parquet", "arrow": ".arrow"}
+
+# Columns searched, in order, for the partition date of a table row
+_DATE_COLUMNS = ("timestamp", "Date", "date", "datetime", "__index_level_0__")
+
+
+def require_pyarrow() -> None:
+    """Raise if pyarrow is not installed.
+
+    Raises:
+        RuntimeError: If pyarrow cannot be imported.
+
+    """
+    if pyarrow is None:
+        raise RuntimeError("Columnar output requires pyarrow (pip install .[s3])")
+
+
+def frame_to_table(frame: pd.DataFrame, constants: dict[str, Any] | None = None) -> "pyarrow.Table":
+    """Convert a computed DataFrame to an Arrow table.
+
+    Numeric columns are converted without per-row Python objects. A
+    non-default index, such as the DatetimeIndex of a price history, is kept
+    as a column.
+
+    Args:
+        frame (pd.DataFrame): Computed results.
+        constants (dict[str, Any] | None): Values added as constant columns,
+            such as the analysis type; columns already in the frame are kept.
+
+    Returns:
+        pyarrow.Table: Columnar results.
+
+    """
+    require_pyarrow()
+    table = pyarrow.Table.from_pandas(frame, preserve_index=None)
+    for name, value in (constants or {}).items():
+        if name not in table.column_names:
+            table = table.append_column(name, pyarrow.repeat(value, table.num_rows))
+    return table
+
+
+def records_to_table(records: list[dict[str, Any]]) -> "pyarrow.Table":
+    """Convert row records (for example queue output payloads) to an Arrow table."""
+    require_pyarrow()
+    return pyarrow.Table.from_pylist(records)
+
+
+def safe_symbol(symbol: Any) -> str:
+    """Return a symbol made safe for use as an S3 key or path segment."""
+    return re.sub(r"[^\w.\-]", "_", str(symbol or "unknown"))
+
+
+def partition_path(day: date, symbol: Any) -> str:
+    """Return the ``date=.../symbol=...`` path of a partition."""
+    return f"date={day.isoformat()}/symbol={safe_symbol(symbol)}"
+
+
+def _date_array(table: "pyarrow.Table") -> "pyarrow.Array | None":
+    """Return the UTC date of each row as a date32 array, or None if it has no time column."""
+    for name in _DATE_COLUMNS:
+        if name not in table.column_names:
+            continue
+        column = table.column(name)
+        if pyarrow.types.is_timestamp(column.type) or pyarrow.types.is_date(column.type):
+            return pyarrow.compute.cast(column, pyarrow.date32())
+        if pyarrow.types.is_integer(column.type) or pyarrow.types.is_floating(column.type):
+            # Epoch seconds or milliseconds, as in queue messages
+            values = pyarrow.compute.cast(column, pyarrow.int64(), safe=False)
+            maximum = pyarrow.compute.max(values).as_py() or 0
+            unit = "ms" if maximum > 1e11 else "s"
+            stamps = values.cast(pyarrow.timestamp(unit, tz="UTC"))
+            return pyarrow.compute.cast(stamps, pyarrow.date32())
+    return None
+
+
+def partition_table(table: "pyarrow.Table") -> dict[tuple[date, str], "pyarrow.Table"]:
+    """Split a table into ``(date, symbol)`` partitions.
+
+    Rows without a time column are assigned today's UTC date, and rows
+    without a ``symbol`` column the symbol "unknown". Symbols in the keys are
+    made safe with `safe_symbol`.
+
+    Args:
+        table (pyarrow.Table): Table to split.
+
+    Returns:
+        dict[tuple[date, str], pyarrow.Table]: Rows of each partition, in order.
+
+    """
+    require_pyarrow()
+    if table.num_rows == 0:
+        return {}
+
+    today = datetime.now(timezone.utc).date()
+    days = _date_array(table)
+    if days is None:
+        days = pyarrow.array([today] * table.num_rows, pyarrow.date32())
+    if "symbol" in table.column_names:
+        symbols = pyarrow.compute.cast(table.column("symbol"), pyarrow.string())
+    else:
+        symbols = pyarrow.array(["unknown"] * table.num_rows)
+
+    keys = pyarrow.table({"day": days, "symbol": symbols})
+    groups = keys.group_by(["day", "symbol"]).aggregate([])
+    if groups.num_rows == 1:
+        day, symbol = groups.column("day")[0].as_py(), groups.column("symbol")[0].as_py()
+        return {(day or today, safe_symbol(symbol)): table}
+
+    partitions = {}
+    for day, symbol in zip(groups.column("day").to_pylist(), groups.column("symbol").to_pylist()):
+        day_mask = (
+            pyarrow.compute.is_null(keys.column("day"))
+            if day is None
+            else pyarrow.compute.equal(keys.column("day"), day)
+        )
+        symbol_mask = (
+            pyarrow.compute.is_null(keys.column("symbol"))
+            if symbol is None
+            else pyarrow.compute.equal(keys.column("symbol"), symbol)
+        )
+        mask = pyarrow.compute.and_(day_mask, symbol_mask)
+        partitions[(day or today, safe_symbol(symbol))] = table.filter(mask)
+    return partitions
+
+
+def write_table(
+    table: "pyarrow.Table", sink: str | Path | IO[bytes], output_format: str, compression: str
+) -> None:
+    """Write a table as Parquet or as an Arrow IPC file.
+
+    Args:
+        table (pyarrow.Table): Table to write.
+        sink (str | Path | IO[bytes]): Destination path or binary file object.
+        output_format (str): "parquet" or "arrow".
+        compression (str): Codec name, or "none". Arrow IPC supports "zstd" and "lz4".
+
+    Raises:
+        ValueError: If the format is unknown.
+
+    """
+    require_pyarrow()
+    codec = None if compression == "none" else compression
+    if output_format == "parquet":
+        pyarrow.parquet.write_table(table, sink, compression=codec or "NONE")
+    elif output_format == "arrow":
+        options = pyarrow.ipc.IpcWriteOptions(compression=codec)
+        with pyarrow.ipc.new_file(sink, table.schema, options=options) as writer:
+            writer.write_table(table)
+    else:
+        raise ValueError(f"Unsupported columnar format: {output_format}")
+
+
+class LocalFileSink:
+    """Writes output tables to partitioned Parquet or Arrow files in a local directory.
+
+    Each call writes one new file per ``(date, symbol)`` partition. Files are
+    written under a temporary name and renamed, so readers never see a
+    partially written file.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path | None = None,
+        output_format: str | None = None,
+        compression: str | None = None,
+    ) -> None:
+        """Configure the sink; unset arguments are read from configuration.
+
+        Args:
+            directory (str | Path | None): Output root (default: FILE_OUTPUT_DIR).
+            output_format (str | None): "parquet" or "arrow" (default: FILE_OUTPUT_FORMAT).
+            compression (str | None): Codec or "none" (default: FILE_OUTPUT_COMPRESSION).
+
+        Raises:
+            ValueError: If the format is unknown.
+            RuntimeError: If pyarrow is not installed.
+
+        """
+        require_pyarrow()
+        self.directory = Path(directory or config.get_file_output_dir())
+        self.output_format = output_format or config.get_file_output_format()
+        self.compression = compression or config.get_file_output_compression()
+        if self.output_format not in COLUMNAR_FORMATS:
+            raise ValueError(f"Unsupported file output format: {self.output_format}")
+
+    def write(self, table: "pyarrow.Table") -> list[Path]:
+        """Write a table, one file per partition.
+
+        Args:
+            table (pyarrow.Table): Results to write.
+
+        Returns:
+            list[Path]: Paths of the written files.
+
+        """
+        paths = []
+        for (day, symbol), partition in partition_table(table).items():
+            directory = self.directory / partition_path(day, symbol)
+            directory.mkdir(parents=True, exist_ok=True)
+            name = f"{time.strftime('%H%M%S', time.gmtime())}-{uuid.uuid4().hex}"
+            path = directory / f"{name}{FILE_EXTENSIONS[self.output_format]}"
+            temporary = path.with_name(f".{path.name}.tmp")
+            write_table(partition, temporary, self.output_format, self.compression)
+            os.replace(temporary, path)
+            paths.append(path)
+        logger.info("💾 Wrote %d row(s) to %d file(s)", table.num_rows, len(paths))
+        return paths
+
+    def write_records(self, records: list[dict[str, Any]]) -> list[Path]:
+        """Write row records, converting them to a table first."""
+        return self.write(records_to_table(records))
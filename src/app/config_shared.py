@@ -1,14 +1,15 @@
 """Shared configuration module for all polling services.
 
 Provides typed, cached getter functions to retrieve configuration values
-from Vault, environment variables, or defaults — in that order.
+from Vault, environment variables, or defaults — in that order. The caches
+are cleared when the Vault refresher publishes changed values.
 """
 
 from functools import lru_cache
 
-from app.utils.config_utils import get_config_bool
+from app.utils.config_utils import get_config_bool, get_config_value
 from app.utils.types import OutputMode
-from app.utils.vault_client import get_config_value_cached
+from app.utils.vault_client import get_config_value_cached, on_config_change
 
 
 @lru_cache
@@ -63,6 +64,19 @@ def get_batch_size() -> int:
     return int(get_config_value_cached("BATCH_SIZE", "10"))
 
 
+@lru_cache
+def get_batch_linger_ms() -> int:
+    """Retrieve how long a consumer waits to fill a batch before processing it.
+
+    Returns:
+        int: Maximum time in milliseconds a partial batch is held.
+
+    Defaults to 500 if not set.
+
+    """
+    return int(get_config_value_cached("BATCH_LINGER_MS", "500"))
+
+
 @lru_cache
 def get_rate_limit() -> int:
     """Retrieve the rate limit in requests per second.
@@ -219,6 +233,45 @@ def get_rabbitmq_queue() -> str:
     return get_config_value_cached("RABBITMQ_QUEUE", "default_queue")
 
 
+@lru_cache
+def get_rabbitmq_requeue_on_failure() -> bool:
+    """Retrieve whether a failed RabbitMQ batch is requeued instead of dead-lettered.
+
+    Returns:
+        bool: True to requeue failed deliveries.
+
+    Defaults to False if not set.
+
+    """
+    return get_config_value_cached("RABBITMQ_REQUEUE_ON_FAILURE", "false").lower() == "true"
+
+
+@lru_cache
+def get_rabbitmq_confirm_window() -> int:
+    """Retrieve how many RabbitMQ publishes may await a publisher confirm at once.
+
+    Returns:
+        int: Maximum number of unconfirmed publishes; 0 disables publisher confirms.
+
+    Defaults to 0 if not set.
+
+    """
+    return int(get_config_value_cached("RABBITMQ_CONFIRM_WINDOW", "0"))
+
+
+@lru_cache
+def get_rabbitmq_confirm_timeout() -> float:
+    """Retrieve how long to wait for outstanding RabbitMQ publisher confirms.
+
+    Returns:
+        float: Seconds without a confirm before a publish fails.
+
+    Defaults to 30 if not set.
+
+    """
+    return float(get_config_value_cached("RABBITMQ_CONFIRM_TIMEOUT", "30"))
+
+
 @lru_cache
 def get_dlq_name() -> str:
     """Retrieve the name of the Dead Letter Queue (DLQ) for failed messages.
@@ -258,6 +311,63 @@ def get_sqs_region() -> str:
     return get_config_value_cached("SQS_REGION", "us-east-1")
 
 
+@lru_cache
+def get_sqs_visibility_timeout() -> int:
+    """Retrieve the visibility timeout applied to received SQS messages.
+
+    Messages still being processed have their visibility extended by this
+    amount every half timeout.
+
+    Returns:
+        int: Visibility timeout in seconds.
+
+    Defaults to 30 if not set.
+
+    """
+    return int(get_config_value_cached("SQS_VISIBILITY_TIMEOUT", "30"))
+
+
+@lru_cache
+def get_sqs_poller_count() -> int:
+    """Retrieve the number of concurrent SQS receive loops.
+
+    Returns:
+        int: Number of poller threads.
+
+    Defaults to 1 if not set.
+
+    """
+    return max(1, int(get_config_value_cached("SQS_POLLERS", "1")))
+
+
+@lru_cache
+def get_worker_count() -> int:
+    """Retrieve the number of worker threads processing received batches.
+
+    Returns:
+        int: Number of worker threads.
+
+    Defaults to 1 if not set.
+
+    """
+    return max(1, int(get_config_value_cached("WORKER_COUNT", "1")))
+
+
+@lru_cache
+def get_work_queue_size() -> int:
+    """Retrieve how many received batches may wait for a free worker.
+
+    Pollers stop receiving while this many batches are queued.
+
+    Returns:
+        int: Maximum number of queued batches.
+
+    Defaults to 2 if not set.
+
+    """
+    return max(1, int(get_config_value_cached("WORK_QUEUE_SIZE", "2")))
+
+
 @lru_cache
 def get_log_level() -> str:
     """Retrieve the application log level.
@@ -281,6 +391,89 @@ def get_log_format() -> str:
     return get_config_value_cached("LOG_FORMAT", "text").lower()
 
 
+@lru_cache
+def get_hot_path_logging() -> bool:
+    """Retrieve whether hot-path logging mode is enabled.
+
+    In this mode per-computation log messages are demoted to sampled DEBUG
+    and per-symbol results are counted instead of logged.
+
+    Returns:
+        bool: True if HOT_PATH_LOGGING is enabled.
+
+    Defaults to False if not set.
+
+    """
+    return get_config_bool("HOT_PATH_LOGGING", False)
+
+
+@lru_cache
+def get_log_sample_every() -> int:
+    """Retrieve the sampling rate of hot-path DEBUG messages.
+
+    Returns:
+        int: One in this many per-computation messages is logged.
+
+    Defaults to 100 if not set.
+
+    """
+    return max(1, int(get_config_value_cached("LOG_SAMPLE_EVERY", "100")))
+
+
+@lru_cache
+def get_log_summary_seconds() -> float:
+    """Retrieve how often hot-path mode logs a per-symbol results summary.
+
+    Returns:
+        float: Seconds between summary log lines.
+
+    Defaults to 60 if not set.
+
+    """
+    return float(get_config_value_cached("LOG_SUMMARY_SECONDS", "60"))
+
+
+# Queued logging is set up before Vault is reachable, so its settings are
+# read from the environment only.
+@lru_cache
+def get_log_queue_enabled() -> bool:
+    """Retrieve whether log records are written by a background thread.
+
+    Returns:
+        bool: True if LOG_QUEUE is enabled.
+
+    Defaults to False if not set.
+
+    """
+    return get_config_bool("LOG_QUEUE", False)
+
+
+@lru_cache
+def get_log_queue_size() -> int:
+    """Retrieve the maximum number of log records waiting to be written.
+
+    Returns:
+        int: Capacity of the log queue.
+
+    Defaults to 10000 if not set.
+
+    """
+    return max(1, int(get_config_value("LOG_QUEUE_SIZE", "10000")))
+
+
+@lru_cache
+def get_log_queue_drop_policy() -> str:
+    """Retrieve which record is dropped when the log queue is full.
+
+    Returns:
+        str: 'newest' (the record being logged) or 'oldest' (the longest queued).
+
+    Defaults to 'newest' if not set.
+
+    """
+    return get_config_value("LOG_QUEUE_DROP", "newest").lower()
+
+
 @lru_cache
 def get_poller_type() -> str:
     """Retrieve the type/category of this poller.
@@ -1607,6 +1800,114 @@ def get_s3_output_prefix() -> str:
     return get_config_value_cached("S3_OUTPUT_KEY_PREFIX", "output/")
 
 
+@lru_cache
+def get_s3_output_format() -> str:
+    """Retrieve the file format of buffered S3 output objects.
+
+    Returns:
+        str: "ndjson", "parquet" or "arrow" (Arrow IPC file).
+
+    Defaults to 'ndjson' if not set.
+
+    """
+    return get_config_value_cached("S3_OUTPUT_FORMAT", "ndjson").lower()
+
+
+@lru_cache
+def get_s3_output_compression() -> str:
+    """Retrieve the compression applied to buffered S3 output objects.
+
+    Returns:
+        str: "gzip", "zstd" or "none".
+
+    Defaults to 'gzip' if not set.
+
+    """
+    return get_config_value_cached("S3_OUTPUT_COMPRESSION", "gzip").lower()
+
+
+@lru_cache
+def get_s3_output_flush_bytes() -> int:
+    """Retrieve how much buffered S3 output triggers a flush.
+
+    Returns:
+        int: Uncompressed bytes buffered before objects are written.
+
+    Defaults to 67108864 (64 MiB) if not set.
+
+    """
+    return int(get_config_value_cached("S3_OUTPUT_FLUSH_BYTES", str(64 * 1024 * 1024)))
+
+
+@lru_cache
+def get_s3_output_flush_seconds() -> float:
+    """Retrieve the longest time S3 output is buffered before a flush.
+
+    Returns:
+        float: Maximum age in seconds of the oldest buffered record.
+
+    Defaults to 60 if not set.
+
+    """
+    return float(get_config_value_cached("S3_OUTPUT_FLUSH_SECONDS", "60"))
+
+
+@lru_cache
+def get_s3_output_multipart_bytes() -> int:
+    """Retrieve the object size from which S3 output uses multipart upload.
+
+    Also used as the part size. S3 requires parts of at least 5 MiB.
+
+    Returns:
+        int: Multipart threshold and part size in bytes.
+
+    Defaults to 16777216 (16 MiB) if not set.
+
+    """
+    size = int(get_config_value_cached("S3_OUTPUT_MULTIPART_BYTES", str(16 * 1024 * 1024)))
+    return max(size, 5 * 1024 * 1024)
+
+
+@lru_cache
+def get_file_output_dir() -> str:
+    """Retrieve the root directory of the local file output sink.
+
+    Returns:
+        str: Directory that partitioned output files are written below.
+
+    Defaults to 'output' if not set.
+
+    """
+    return get_config_value_cached("FILE_OUTPUT_DIR", "output")
+
+
+@lru_cache
+def get_file_output_format() -> str:
+    """Retrieve the file format of the local file output sink.
+
+    Returns:
+        str: "parquet" or "arrow" (Arrow IPC file, memory-mappable by readers).
+
+    Defaults to 'parquet' if not set.
+
+    """
+    return get_config_value_cached("FILE_OUTPUT_FORMAT", "parquet").lower()
+
+
+@lru_cache
+def get_file_output_compression() -> str:
+    """Retrieve the compression codec of local output files.
+
+    Returns:
+        str: Codec name ("zstd", "lz4", "snappy", "gzip") or "none". Arrow
+        files support only "zstd", "lz4" and "none".
+
+    Defaults to 'zstd' if not set.
+
+    """
+    return get_config_value_cached("FILE_OUTPUT_COMPRESSION", "zstd").lower()
+
+
 @lru_cache
 def get_database_connection_url() -> str:
     """Retrieve the database connection URL for output.
@@ -1646,6 +1947,72 @@ def get_database_insert_sql() -> str:
     return get_config_value_cached("DATABASE_INSERT_SQL", "")
 
 
+@lru_cache
+def get_database_pool_size() -> int:
+    """Retrieve the number of pooled connections kept by the database output engine.
+
+    Returns:
+        int: Connection pool size.
+
+    Defaults to 5 if not set.
+
+    """
+    return int(get_config_value_cached("DATABASE_POOL_SIZE", "5"))
+
+
+@lru_cache
+def get_database_max_overflow() -> int:
+    """Retrieve how many connections the database output engine may open beyond its pool.
+
+    Returns:
+        int: Maximum overflow connections.
+
+    Defaults to 10 if not set.
+
+    """
+    return int(get_config_value_cached("DATABASE_MAX_OVERFLOW", "10"))
+
+
+@lru_cache
+def get_database_pool_recycle() -> int:
+    """Retrieve the age in seconds after which pooled database connections are replaced.
+
+    Returns:
+        int: Connection recycle time in seconds.
+
+    Defaults to 1800 if not set.
+
+    """
+    return int(get_config_value_cached("DATABASE_POOL_RECYCLE", "1800"))
+
+
+@lru_cache
+def get_database_copy_table() -> str:
+    """Retrieve the table loaded with COPY when the output database is PostgreSQL.
+
+    Returns:
+        str: Table name, optionally schema-qualified; empty to always use DATABASE_INSERT_SQL.
+
+    Defaults to empty string if not set.
+
+    """
+    return get_config_value_cached("DATABASE_COPY_TABLE", "")
+
+
+@lru_cache
+def get_database_copy_columns() -> list[str]:
+    """Retrieve the columns, and record keys, written by the COPY fast path.
+
+    Returns:
+        list[str]: Column names; empty to use the keys of the first record.
+
+    Defaults to empty list if not set.
+
+    """
+    columns = get_config_value_cached("DATABASE_COPY_COLUMNS", "")
+    return [c.strip() for c in columns.split(",") if c.strip()]
+
+
 @lru_cache
 def get_output_modes() -> list[str]:
     """Retrieve a list of enabled output modes.
@@ -1660,6 +2027,66 @@ def get_output_modes() -> list[str]:
     return [m.strip().lower() for m in modes.split(",") if m.strip()]
 
 
+@lru_cache
+def get_output_max_workers() -> int:
+    """Retrieve how many output sinks may be dispatched to concurrently.
+
+    Returns:
+        int: Size of the shared output dispatch thread pool.
+
+    Defaults to 4 if not set.
+
+    """
+    return max(1, int(get_config_value_cached("OUTPUT_MAX_WORKERS", "4")))
+
+
+@lru_cache
+def get_output_sink_timeout() -> float:
+    """Retrieve how long a batch waits for each output sink.
+
+    Returns:
+        float: Seconds before a sink that has not finished is reported as timed out.
+
+    Defaults to 30 if not set.
+
+    """
+    return float(get_config_value_cached("OUTPUT_SINK_TIMEOUT", "30"))
+
+
+@lru_cache
+def get_output_sink_max_in_flight() -> int:
+    """Retrieve how many dispatches to one output sink may run at once.
+
+    A sink still busy with this many earlier batches, for example because it
+    hangs past OUTPUT_SINK_TIMEOUT, is skipped for new batches so it cannot
+    take over the shared output pool.
+
+    Returns:
+        int: Maximum number of concurrent dispatches per sink.
+
+    Defaults to 2 if not set.
+
+    """
+    return max(1, int(get_config_value_cached("OUTPUT_SINK_MAX_IN_FLIGHT", "2")))
+
+
+@lru_cache
+def get_output_columnar() -> bool:
+    """Retrieve whether analysis results are output as columnar tables.
+
+    When enabled, the whole computed DataFrame is sent as an Arrow table
+    instead of a record for its last row, and the S3 and file sinks write it
+    without converting it to records.
+
+    Returns:
+        bool: True to output whole result tables.
+
+    Defaults to False if not set.
+
+    """
+    return get_config_bool("OUTPUT_COLUMNAR", False)
+
+
 @lru_cache
 def get_rest_output_url() -> str:
     """Retrieve the REST endpoint URL for output dispatch.
@@ -1672,3 +2099,161 @@ def get_rest_output_url() -> str:
 
     """
     return get_config_value_cached("REST_OUTPUT_URL")
+
+
+@lru_cache
+def get_rest_output_pool_size() -> int:
+    """Retrieve how many connections the REST output session keeps open.
+
+    Returns:
+        int: Maximum pooled connections to the REST endpoint.
+
+    Defaults to 10 if not set.
+
+    """
+    return max(1, int(get_config_value_cached("REST_OUTPUT_POOL_SIZE", "10")))
+
+
+@lru_cache
+def get_rest_output_retries() -> int:
+    """Retrieve how often a REST output request is retried on 429 or 5xx responses.
+
+    Returns:
+        int: Maximum number of retries.
+
+    Defaults to 3 if not set.
+
+    """
+    return int(get_config_value_cached("REST_OUTPUT_RETRIES", "3"))
+
+
+@lru_cache
+def get_rest_output_backoff() -> float:
+    """Retrieve the backoff factor between REST output retries.
+
+    Returns:
+        float: Seconds multiplied by 2**(retry - 1) to get each retry delay.
+
+    Defaults to 0.5 if not set.
+
+    """
+    return float(get_config_value_cached("REST_OUTPUT_BACKOFF", "0.5"))
+
+
+@lru_cache
+def get_rest_output_keepalive_idle() -> int:
+    """Retrieve the idle time before TCP keep-alive probes on pooled REST connections.
+
+    Returns:
+        int: Idle seconds before the first probe; 0 disables TCP keep-alive.
+
+    Defaults to 60 if not set.
+
+    """
+    return int(get_config_value_cached("REST_OUTPUT_KEEPALIVE_IDLE", "60"))
+
+
+@lru_cache
+def get_rest_output_gzip() -> bool:
+    """Retrieve whether REST output request bodies are gzip-compressed.
+
+    Returns:
+        bool: True to send bodies with ``Content-Encoding: gzip``.
+
+    Defaults to False if not set.
+
+    """
+    return get_config_value_cached("REST_OUTPUT_GZIP", "false").lower() == "true"
+
+
+# --- Processing Configuration ---
+
+
+@lru_cache
+def get_history_max_depth() -> int:
+    """Retrieve the number of bars kept per symbol in the price history store.
+
+    Returns:
+        int: Maximum history depth per symbol.
+
+    Defaults to 500 if not set.
+
+    """
+    return int(get_config_value_cached("HISTORY_MAX_DEPTH", "500"))
+
+
+@lru_cache
+def get_history_max_symbols() -> int:
+    """Retrieve the number of symbols the price history store can hold.
+
+    Least recently updated symbols are evicted once this is exceeded.
+
+    Returns:
+        int: Maximum number of tracked symbols.
+
+    Defaults to 10000 if not set.
+
+    """
+    return int(get_config_value_cached("HISTORY_MAX_SYMBOLS", "10000"))
+
+
+@lru_cache
+def get_moving_average_specs() -> list[tuple[str, int]]:
+    """Retrieve the moving averages computed for each batch of bars.
+
+    Read from MOVING_AVERAGES as comma-separated ``method:window`` pairs,
+    e.g. ``"sma:20,ema:50,vwap:1"``.
+
+    Returns:
+        list[tuple[str, int]]: ``(method, window)`` pairs.
+
+    Defaults to 'sma:20' if not set.
+
+    Raises:
+        ValueError: If an entry is not a ``method:window`` pair, names an
+            unknown method, or has a window below 1.
+
+    """
+    from app.processor import VALID_METHODS
+
+    specs = []
+    for entry in get_config_value_cached("MOVING_AVERAGES", "sma:20").split(","):
+        if not entry.strip():
+            continue
+        method, _, window = entry.partition(":")
+        method = method.strip().lower()
+        if not window.strip().isdigit():
+            raise ValueError(f"Invalid MOVING_AVERAGES entry: {entry!r}")
+        if method not in VALID_METHODS:
+            raise ValueError(
+                f"Invalid MOVING_AVERAGES method: '{method}'. "
+                f"Must be one of: {sorted(VALID_METHODS)}"
+            )
+        if int(window) < 1:
+            raise ValueError(f"Invalid MOVING_AVERAGES window: {entry!r} must be at least 1.")
+        specs.append((method, int(window)))
+    return specs
+
+
+@lru_cache
+def get_runtime() -> str:
+    """Retrieve which runtime drives the consume, compute and dispatch loop.
+
+    Returns:
+        str: "sync" for the blocking runtime or "async" for the asyncio pipeline.
+
+    Defaults to 'sync' if not set.
+
+    """
+    return get_config_value_cached("RUNTIME", "sync").lower()
+
+
+def _clear_getter_caches(changed: frozenset[str]) -> None:
+    """Clear every cached getter so it re-reads the refreshed Vault config."""
+    for value in list(globals().values()):
+        if getattr(value, "__module__", None) == __name__ and hasattr(value, "cache_clear"):
+            value.cache_clear()
+
+
+# Registered first, so sink listeners already see the new values
+on_config_change(None, _clear_getter_caches)
@@ -0,0 +1,322 @@
+"""Bounded in-memory price history per symbol, backed by preallocated ring buffers.
+
+Consumers append single bars as they arrive instead of relying on producers
+to resend a full lookback window with every message. All buffers live in two
+``(max_symbols, max_depth)`` float64 slabs allocated up front, so memory use
+is fixed by configuration. A symbol that has not been updated recently is
+evicted (least recently used first) once every slot is taken.
+"""
+
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable, Mapping, Sequence
+
+import numpy as np
+
+import app.config_shared as config
+from app.utils.metrics import history_evictions_total, record_history_metrics
+from app.utils.setup_logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class PriceHistoryStore:
+    """Per-symbol ring buffers of prices and volumes with LRU eviction.
+
+    Each tracked symbol owns one row (slot) of the price and volume slabs.
+    A row is written circularly, so appending a bar is O(1) and reading a
+    history returns at most `max_depth` bars in chronological order. The
+    store is safe to share between threads.
+    """
+
+    def __init__(self, max_depth: int | None = None, max_symbols: int | None = None) -> None:
+        """Preallocate buffers for `max_symbols` histories of `max_depth` bars.
+
+        Args:
+            max_depth (int | None): Bars kept per symbol (default: HISTORY_MAX_DEPTH).
+            max_symbols (int | None): Symbols kept before eviction (default: HISTORY_MAX_SYMBOLS).
+
+        Raises:
+            ValueError: If either limit is smaller than 1.
+
+        """
+        self.max_depth = config.get_history_max_depth() if max_depth is None else max_depth
+        self.max_symbols = config.get_history_max_symbols() if max_symbols is None else max_symbols
+        if self.max_depth < 1 or self.max_symbols < 1:
+            raise ValueError("max_depth and max_symbols must be positive integers.")
+
+        self._prices = np.empty((self.max_symbols, self.max_depth))
+        self._volumes = np.empty((self.max_symbols, self.max_depth))
+        self._heads = np.zeros(self.max_symbols, dtype=np.intp)
+        self._counts = np.zeros(self.max_symbols, dtype=np.intp)
+        self._slots: OrderedDict[str, int] = OrderedDict()
+        self._free = list(range(self.max_symbols - 1, -1, -1))
+        self._lock = threading.Lock()
+        self.evictions = 0
+        self._record_metrics()
+
+    def __len__(self) -> int:
+        """Return the number of tracked symbols."""
+        return len(self._slots)
+
+    def __contains__(self, symbol: object) -> bool:
+        """Return whether a symbol currently has history."""
+        return symbol in self._slots
+
+    @property
+    def allocated_bytes(self) -> int:
+        """Bytes reserved by the price and volume slabs."""
+        return self._prices.nbytes + self._volumes.nbytes
+
+    @property
+    def used_bytes(self) -> int:
+        """Bytes of the slabs occupied by tracked symbols."""
+        return len(self._slots) * self.max_depth * 2 * self._prices.itemsize
+
+    def memory_usage(self) -> dict[str, int]:
+        """Return a snapshot of the store's size and memory use."""
+        return {
+            "symbols": len(self._slots),
+            "max_symbols": self.max_symbols,
+            "max_depth": self.max_depth,
+            "allocated_bytes": self.allocated_bytes,
+            "used_bytes": self.used_bytes,
+            "evictions": self.evictions,
+        }
+
+    def append(self, symbol: str, price: float, volume: float = np.nan) -> int:
+        """Append one bar to a symbol's history.
+
+        Args:
+            symbol (str): Symbol the bar belongs to.
+            price (float): Bar price.
+            volume (float): Bar volume (NaN if unknown).
+
+        Returns:
+            int: Number of bars now held for the symbol.
+
+        """
+        with self._lock:
+            return self._append(symbol, price, volume)
+
+    def append_history(
+        self, symbol: str, price: float, volume: float = np.nan
+    ) -> tuple[int, np.ndarray, np.ndarray]:
+        """Append one bar and return the symbol's history in one step.
+
+        The append and the read happen under one lock, so the history ends
+        with exactly this bar even when other threads append to the same
+        symbol concurrently.
+
+        Args:
+            symbol (str): Symbol the bar belongs to.
+            price (float): Bar price.
+            volume (float): Bar volume (NaN if unknown).
+
+        Returns:
+            tuple[int, np.ndarray, np.ndarray]: Number of bars now held for the
+            symbol, and its prices and volumes as returned by `history`.
+
+        """
+        with self._lock:
+            count = self._append(symbol, price, volume)
+            slot = self._slots[symbol]
+            return count, self._read(self._prices, slot), self._read(self._volumes, slot)
+
+    def extend(
+        self, symbol: str, prices: Sequence[float], volumes: Sequence[float] | None = None
+    ) -> int:
+        """Append several bars to a symbol's history, oldest first.
+
+        Only the newest `max_depth` bars are kept.
+
+        Args:
+            symbol (str): Symbol the bars belong to.
+            prices (Sequence[float]): Bar prices.
+            volumes (Sequence[float] | None): Bar volumes (NaN if omitted).
+
+        Returns:
+            int: Number of bars now held for the symbol.
+
+        Raises:
+            ValueError: If `volumes` and `prices` differ in length.
+
+        """
+        prices, volumes = self._prepare(prices, volumes)
+        with self._lock:
+            return self._extend(symbol, prices, volumes)
+
+    def extend_panel(
+        self, bars: Mapping[str, tuple[Sequence[float], Sequence[float] | None]]
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Append bars for several symbols and return their panel in one step.
+
+        The appends and the read happen under one lock, so each column ends
+        with exactly the bars passed here even when other threads append to
+        the same symbols concurrently.
+
+        Args:
+            bars (Mapping[str, tuple[Sequence[float], Sequence[float] | None]]):
+                Prices and volumes (or None) per symbol, oldest first.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Prices and volumes of shape
+            ``(max_depth, len(bars))``, as returned by `panel`.
+
+        Raises:
+            ValueError: If a symbol's volumes and prices differ in length.
+
+        """
+        prepared = {symbol: self._prepare(*values) for symbol, values in bars.items()}
+        with self._lock:
+            for symbol, (prices, volumes) in prepared.items():
+                self._extend(symbol, prices, volumes)
+            return self._panel(list(prepared))
+
+    def history(self, symbol: str) -> tuple[np.ndarray, np.ndarray]:
+        """Return copies of a symbol's prices and volumes in chronological order.
+
+        Reading does not count as activity for eviction purposes.
+
+        Args:
+            symbol (str): Symbol to read.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Prices and volumes (empty if unknown).
+
+        """
+        with self._lock:
+            slot = self._slots.get(symbol)
+            if slot is None:
+                return np.empty(0), np.empty(0)
+            return self._read(self._prices, slot), self._read(self._volumes, slot)
+
+    def panel(self, symbols: Iterable[str]) -> tuple[np.ndarray, np.ndarray]:
+        """Return the histories of several symbols as right-aligned ``(time, symbol)`` arrays.
+
+        Shorter histories are NaN-padded at the top, which is the layout the
+        panel moving averages in `app.moving_avg_array` expect.
+
+        Args:
+            symbols (Iterable[str]): Symbols to include, one column each.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Prices and volumes of shape
+            ``(max_depth, len(symbols))``.
+
+        """
+        symbols = list(symbols)
+        with self._lock:
+            return self._panel(symbols)
+
+    def discard(self, symbol: str) -> None:
+        """Forget a symbol's history and free its slot, if present."""
+        with self._lock:
+            slot = self._slots.pop(symbol, None)
+            if slot is not None:
+                self._release(slot)
+                self._record_metrics()
+
+    def _slot(self, symbol: str) -> int:
+        """Return the symbol's slot, assigning one (evicting if needed). Caller holds the lock."""
+        slot = self._slots.get(symbol)
+        if slot is not None:
+            self._slots.move_to_end(symbol)
+            return slot
+
+        if not self._free:
+            evicted, evicted_slot = self._slots.popitem(last=False)
+            self._release(evicted_slot)
+            self.evictions += 1
+            history_evictions_total.inc()
+            logger.debug("Evicted price history for least recently updated symbol %s", evicted)
+
+        slot = self._slots[symbol] = self._free.pop()
+        self._record_metrics()
+        return slot
+
+    def _release(self, slot: int) -> None:
+        """Reset a slot and return it to the free list. Caller holds the lock."""
+        self._heads[slot] = 0
+        self._counts[slot] = 0
+        self._free.append(slot)
+
+    def _prepare(
+        self, prices: Sequence[float], volumes: Sequence[float] | None
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Return float arrays of the newest `max_depth` prices and volumes."""
+        prices = np.asarray(prices, dtype=np.float64)
+        if volumes is None:
+            volumes = np.full(prices.shape, np.nan)
+        volumes = np.asarray(volumes, dtype=np.float64)
+        if volumes.shape != prices.shape:
+            raise ValueError("volumes must have the same length as prices.")
+        return prices[-self.max_depth :], volumes[-self.max_depth :]
+
+    def _append(self, symbol: str, price: float, volume: float) -> int:
+        """Write one bar into a symbol's ring buffer. Caller holds the lock."""
+        slot = self._slot(symbol)
+        head = self._heads[slot]
+        self._prices[slot, head] = price
+        self._volumes[slot, head] = volume
+        self._heads[slot] = (head + 1) % self.max_depth
+        count = self._counts[slot] = min(self._counts[slot] + 1, self.max_depth)
+        return int(count)
+
+    def _extend(self, symbol: str, prices: np.ndarray, volumes: np.ndarray) -> int:
+        """Write prepared bars into a symbol's ring buffer. Caller holds the lock."""
+        slot = self._slot(symbol)
+        head = self._heads[slot]
+        size = len(prices)
+        first = min(size, self.max_depth - head)
+        self._prices[slot, head : head + first] = prices[:first]
+        self._volumes[slot, head : head + first] = volumes[:first]
+        self._prices[slot, : size - first] = prices[first:]
+        self._volumes[slot, : size - first] = volumes[first:]
+        self._heads[slot] = (head + size) % self.max_depth
+        count = self._counts[slot] = min(self._counts[slot] + size, self.max_depth)
+        return int(count)
+
+    def _panel(self, symbols: list[str]) -> tuple[np.ndarray, np.ndarray]:
+        """Build the right-aligned panel of `symbols`. Caller holds the lock."""
+        prices = np.full((self.max_depth, len(symbols)), np.nan, order="F")
+        volumes = np.full((self.max_depth, len(symbols)), np.nan, order="F")
+        for column, symbol in enumerate(symbols):
+            slot = self._slots.get(symbol)
+            if slot is None:
+                continue
+            start = self.max_depth - self._counts[slot]
+            prices[start:, column] = self._read(self._prices, slot)
+            volumes[start:, column] = self._read(self._volumes, slot)
+        return prices, volumes
+
+    def _read(self, slab: np.ndarray, slot: int) -> np.ndarray:
+        """Return a chronological copy of one slot's ring buffer. Caller holds the lock."""
+        count = self._counts[slot]
+        if count < self.max_depth:
+            return slab[slot, :count].copy()
+        head = self._heads[slot]
+        return np.concatenate((slab[slot, head:], slab[slot, :head]))
+
+    def _record_metrics(self) -> None:
+        """Publish the store's size and memory gauges."""
+        record_history_metrics(len(self._slots), self.allocated_bytes, self.used_bytes)
+
+
+_default_store: PriceHistoryStore | None = None
+_default_store_lock = threading.Lock()
+
+
+def get_history_store() -> PriceHistoryStore:
+    """Return the process-wide history store, creating it from configuration on first use."""
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = PriceHistoryStore()
+            logger.info(
+                "Allocated price history store: %d symbols x %d bars (%d bytes)",
+                _default_store.max_symbols,
+                _default_store.max_depth,
+                _default_store.allocated_bytes,
+            )
+        return _default_store
@@ -10,9 +10,11 @@ import traceback
 
 from app import config_shared
 from app.output_handler import output_handler
+from app.processor import create_batch_handler
 from app.queue_handler import consume_messages
 from app.utils.metrics_server import start_metrics_server
 from app.utils.setup_logger import setup_logger
+from app.utils.vault_client import get_vault_client
 
 # Add 'src/' to Python's module search path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
@@ -67,17 +69,26 @@ def main() -> None:
     """Start the data processing service.
 
     This function performs startup tasks and begins consuming messages
-    from the configured queue using the output handler.
+    from the configured queue. Each message batch is processed in bulk and
+    the results are sent to the output handler as one batch. With
+    ``RUNTIME=async`` the asyncio pipeline in `app.async_runtime` is used instead.
     """
     logger.info("🚀 Starting processing service...")
 
     start_metrics_server()
     validate_output_config()
+    get_vault_client().start_refresher()
 
     logger.info(
         "✅ Ready. Listening for messages on queue type: %s", config_shared.get_queue_type()
     )
-    consume_messages(output_handler.send)
+    if config_shared.get_runtime() == "async":
+        from app.async_runtime import run
+
+        run()
+        return
+
+    consume_messages(create_batch_handler(output_handler.send))
 
 
 if __name__ == "__main__":
@@ -1,16 +1,39 @@
 """Module for calculating various types of moving averages."""
 
-from typing import Literal
+from collections.abc import Iterable
 
 import numpy as np
 import pandas as pd
 from pandas import Series
 
+from app.moving_avg_array import (
+    MovingAverageMethod,
+    MovingAverageSpec,
+    moving_average,
+    moving_averages,
+)
+from app.utils.hot_path_logging import HotPathLogger
 from app.utils.setup_logger import setup_logger
 
 logger = setup_logger(__name__)
+hot_path_logger = HotPathLogger(logger)
 
-MovingAverageMethod = Literal["sma", "ema", "wma", "hma", "vwap", "dema", "tema", "kama", "tma"]
+__all__ = [
+    "MovingAverageMethod",
+    "MovingAverageSpec",
+    "calculate_moving_average",
+    "calculate_moving_averages",
+    "calculate_panel_moving_average",
+]
+
+
+def _volume_array(data: Series, volume: Series | None) -> np.ndarray | None:
+    """Return volume as float64 values aligned with `data`'s index."""
+    if volume is None:
+        return None
+    if not volume.index.equals(data.index):
+        volume = volume.reindex(data.index)
+    return volume.to_numpy(dtype=np.float64)
 
 
 def calculate_moving_average(
@@ -78,94 +101,142 @@ def calculate_moving_average(
     :param volume: Series | None:  (Default value = None)
 
     """
-    logger.info(f"Calculating {method.upper()} with window={window}")
-
-    if method == "sma":
-        result = data.rolling(window=window).mean()
-        return pd.Series(result, index=data.index)
-
-    if method == "ema":
-        result = data.ewm(span=window, adjust=False).mean()
-        return pd.Series(result, index=data.index)
-
-    if method == "wma":
-        weights = np.arange(1, window + 1)
-
-        def weighted_avg(x: np.ndarray) -> float:
-            """Args:
-            ----
-              x: np.ndarray:
-              x: np.ndarray:
-              x: np.ndarray:
-
-            :param x: np.ndarray:
-            :param x: np.ndarray:
-            :param x: np.ndarray:
-            :param x: type x: np.ndarray :
-            :param x: type x: np.ndarray :
-            :param x: np.ndarray:
-            :param x: np.ndarray:
-            :param x: np.ndarray:
-            :param x: np.ndarray:
-
-            """
-            return float(np.dot(x, weights) / weights.sum())
-
-        result = data.rolling(window).apply(weighted_avg, raw=True)
-        return pd.Series(result, index=data.index)
-
-    if method == "hma":
-        half_length = max(1, int(window / 2))
-        sqrt_length = max(1, int(np.sqrt(window)))
-        wma_half = calculate_moving_average(data, half_length, "wma")
-        wma_full = calculate_moving_average(data, window, "wma")
-        diff = 2 * wma_half - wma_full
-        return calculate_moving_average(diff, sqrt_length, "wma")
-
-    if method == "vwap":
-        if volume is None:
-            raise ValueError("VWAP requires volume data.")
-        cum_pv = (data * volume).cumsum()
-        cum_vol = volume.cumsum().replace(0, np.nan)
-        return pd.Series(cum_pv / cum_vol, index=data.index)
-
-    if method == "dema":
-        ema = calculate_moving_average(data, window, "ema")
-        ema2 = calculate_moving_average(ema, window, "ema")
-        return 2 * ema - ema2
-
-    if method == "tema":
-        ema1 = calculate_moving_average(data, window, "ema")
-        ema2 = calculate_moving_average(ema1, window, "ema")
-        ema3 = calculate_moving_average(ema2, window, "ema")
-        return 3 * (ema1 - ema2) + ema3
-
-    if method == "kama":
-        change = (data - data.shift(window)).abs()
-        volatility = data.diff().abs().rolling(window=window).sum()
-
-        # Ensure both are Series to allow `.replace()`
-        change = pd.Series(change, index=data.index)
-        volatility = pd.Series(volatility, index=data.index).replace(0, np.nan)
-
-        er = change / volatility
-        fast = 2 / (2 + 1)
-        slow = 2 / (30 + 1)
-        sc = (er * (fast - slow) + slow) ** 2
-
-        kama = data.copy().astype("float64")
-        kama.iloc[:window] = data.iloc[:window]
-
-        for i in range(window, len(data)):
-            kama.iloc[i] = kama.iloc[i - 1] + sc.iloc[i] * (data.iloc[i] - kama.iloc[i - 1])
-
-        return pd.Series(kama, index=data.index)
-
-    elif method == "tma":
-        sma1 = data.rolling(window=window).mean()
-        sma1 = pd.Series(sma1, index=data.index)  # Ensure it's a Series
-        return pd.Series(sma1.rolling(window=window).mean(), index=data.index)
-
-    raise ValueError(
-        "Invalid method. Choose from 'sma', 'ema', 'wma', 'hma', 'vwap', 'dema', 'tema', 'kama', 'tma'."
+    hot_path_logger.computation("Calculating %s with window=%d", method.upper(), window)
+    result = moving_average(
+        data.to_numpy(dtype=np.float64), window, method, volume=_volume_array(data, volume)
+    )
+    return pd.Series(result, index=data.index, name=data.name)
+
+
+def calculate_moving_averages(
+    data: Series,
+    specs: Iterable[MovingAverageSpec],
+    volume: Series | None = None,
+) -> pd.DataFrame:
+    """Compute several moving averages in one pass, sharing intermediates.
+
+    Thin pandas wrapper over `app.moving_avg_array.moving_averages`: every
+    EMA, EMA-of-EMA, WMA and rolling mean needed by the requested specs is
+    computed once, and the results are wrapped in a single DataFrame without
+    copying.
+
+    Args:
+        data (Series): Price series.
+        specs (Iterable[MovingAverageSpec]): ``(method, window)`` pairs to compute.
+        volume (Series | None): Volume series, required if any spec is VWAP.
+
+    Returns:
+        pd.DataFrame: One column per spec named ``"{METHOD}_{window}"``,
+        indexed like `data`. Duplicate specs yield a single column.
+
+    Raises:
+        ValueError: If a method or window is invalid, or VWAP is requested without volume.
+
+    """
+    specs = list(dict.fromkeys(specs))
+    values = moving_averages(
+        data.to_numpy(dtype=np.float64), specs, volume=_volume_array(data, volume)
+    )
+    hot_path_logger.computation("Calculated %d moving averages over %d rows", len(specs), len(data))
+    return pd.DataFrame(
+        values,
+        index=data.index,
+        columns=[f"{method.upper()}_{window}" for method, window in specs],
+        copy=False,
+    )
+
+
+def _panel_cells(symbols: Series) -> tuple[np.ndarray, np.ndarray, tuple[int, int]]:
+    """Map long-format rows to cells of a right-aligned ``(time, symbol)`` panel.
+
+    Each symbol's rows keep their relative order and end on the last panel row,
+    so shorter histories are NaN-padded at the top.
+
+    Returns:
+        tuple: Row indices, column indices and the panel shape.
+
+    Raises:
+        ValueError: If a symbol is missing.
+
+    """
+    codes, uniques = pd.factorize(symbols)
+    if (codes < 0).any():
+        raise ValueError("symbol column contains missing values.")
+    counts = np.bincount(codes, minlength=len(uniques))
+    order = np.argsort(codes, kind="stable")
+    rank = np.empty(len(codes), dtype=np.intp)
+    rank[order] = np.arange(len(codes)) - np.repeat(np.cumsum(counts) - counts, counts)
+    depth = int(counts.max())
+    return depth - counts[codes] + rank, codes, (depth, len(uniques))
+
+
+def calculate_panel_moving_average(
+    data: pd.DataFrame,
+    window: int,
+    method: MovingAverageMethod = "sma",
+    volume: pd.DataFrame | None = None,
+    symbol_column: str = "symbol",
+    price_column: str = "Close",
+    volume_column: str = "Volume",
+) -> pd.DataFrame | Series:
+    """Compute one moving average for many symbols in a single vectorized pass.
+
+    Two layouts are accepted:
+
+    * Wide: a time x symbol price matrix with one column per symbol. Symbols
+      with shorter histories are NaN-padded at the top. `volume` is a matching
+      matrix, required for VWAP.
+    * Long: a frame with a `symbol_column` and one row per bar, each symbol's
+      rows in chronological order. Histories are right-aligned into a
+      NaN-padded panel internally, so symbols need not share timestamps.
+
+    Args:
+        data (pd.DataFrame): Wide price matrix or long frame.
+        window (int): Moving average window.
+        method (MovingAverageMethod): Moving average type.
+        volume (pd.DataFrame | None): Wide volume matrix (wide layout only).
+        symbol_column (str): Symbol column that selects the long layout.
+        price_column (str): Price column in the long layout.
+        volume_column (str): Volume column in the long layout, used for VWAP.
+
+    Returns:
+        pd.DataFrame | Series: For a wide input, a matrix shaped like `data`;
+        for a long input, a Series named ``"{METHOD}_{window}"`` aligned with
+        the input rows.
+
+    Raises:
+        ValueError: If the method or window is invalid, or VWAP lacks volume data.
+
+    """
+    if symbol_column not in data.columns:
+        logger.info(
+            "Calculating panel %s with window=%d for %d symbols",
+            method.upper(),
+            window,
+            data.shape[1],
+        )
+        volumes = None
+        if volume is not None:
+            if not (volume.index.equals(data.index) and volume.columns.equals(data.columns)):
+                volume = volume.reindex(index=data.index, columns=data.columns)
+            volumes = volume.to_numpy(dtype=np.float64)
+        result = moving_average(data.to_numpy(dtype=np.float64), window, method, volume=volumes)
+        return pd.DataFrame(result, index=data.index, columns=data.columns, copy=False)
+
+    name = f"{method.upper()}_{window}"
+    if data.empty:
+        return pd.Series(index=data.index, name=name, dtype=np.float64)
+
+    rows, columns, shape = _panel_cells(data[symbol_column])
+    logger.info(
+        "Calculating panel %s with window=%d for %d symbols", method.upper(), window, shape[1]
     )
+    prices = np.full(shape, np.nan, order="F")
+    prices[rows, columns] = data[price_column].to_numpy(dtype=np.float64)
+    volumes = None
+    if method == "vwap" and volume_column in data.columns:
+        volumes = np.full(shape, np.nan, order="F")
+        volumes[rows, columns] = data[volume_column].to_numpy(dtype=np.float64)
+
+    result = moving_average(prices, window, method, volume=volumes)
+    return pd.Series(result[rows, columns], index=data.index, name=name)
@@ -0,0 +1,515 @@
+"""NumPy moving average kernels operating directly on float64 arrays.
+
+This is the ndarray-in/ndarray-out layer underneath `app.moving_avg`. Inputs
+are converted to float64 once, no index is built or aligned, and both entry
+points accept a preallocated ``out`` buffer so tight loops over many symbols
+can reuse memory. Two-dimensional ``(time, symbol)`` inputs are processed
+column-wise in a single call. The EMA and KAMA recurrences are compiled with
+numba when it is installed.
+"""
+
+import math
+from collections.abc import Sequence
+from typing import Literal, get_args
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+try:
+    from numba import njit
+except ImportError:  # numba is an optional accelerator
+    njit = None
+
+MovingAverageMethod = Literal["sma", "ema", "wma", "hma", "vwap", "dema", "tema", "kama", "tma"]
+MovingAverageSpec = tuple[MovingAverageMethod, int]
+
+_METHODS = frozenset(get_args(MovingAverageMethod))
+
+# Minimum number of windows per prefix-sum block in `_rolling_mean`.
+_MIN_BLOCK = 64
+
+KAMA_FAST = 2 / (2 + 1)
+KAMA_SLOW = 2 / (30 + 1)
+
+
+def _output(out: np.ndarray | None, shape: tuple[int, ...]) -> np.ndarray:
+    """Return `out` after validating it, or a new uninitialised buffer.
+
+    Raises:
+        ValueError: If `out` is not a float64 array of the expected shape.
+
+    """
+    if out is None:
+        # Column-major so each series along axis 0 is contiguous for the recurrence kernels
+        return np.empty(shape, order="F")
+    if out.shape != shape or out.dtype != np.float64:
+        raise ValueError(f"out must be a float64 array of shape {shape}.")
+    return out
+
+
+def _check_window(window: int) -> None:
+    """Raise ValueError unless window is a positive integer."""
+    if window < 1:
+        raise ValueError("window must be a positive integer.")
+
+
+def _rolling_mean(
+    x: np.ndarray, window: int, out: np.ndarray | None = None, weighted: bool = False
+) -> np.ndarray:
+    """Compute a simple or linearly weighted rolling mean with O(n) array operations.
+
+    Window sums are derived from prefix sums of ``x`` (and ``k * x`` for the
+    weighted mean). To keep float64 cancellation error far below 1e-9, prefix
+    sums are taken over short overlapping blocks rather than over the whole
+    series, and for the weighted mean each block is re-centred on its first
+    finite value. Windows containing NaN yield NaN, like pandas rolling aggregations
+    with ``min_periods=window``.
+
+    Args:
+        x (np.ndarray): Float64 input values along axis 0.
+        window (int): Number of observations per window.
+        out (np.ndarray | None): Optional output buffer.
+        weighted (bool): Use weights 1..window (newest heaviest) instead of equal weights.
+
+    Returns:
+        np.ndarray: Rolling means, NaN-padded for the warm-up period.
+
+    """
+    result = _output(out, x.shape)
+    n = x.shape[0]
+    result[: window - 1] = np.nan
+    if n < window:
+        return result
+
+    nan_mask = np.isnan(x)
+    has_nan = bool(nan_mask.any())
+
+    block = max(4 * window, _MIN_BLOCK)
+    span = block + window - 1
+    n_out = n - window + 1
+    n_blocks = -(-n_out // block)
+    pad = n_blocks * block + window - 1 - n
+    if pad:
+        x = np.concatenate([x, np.zeros((pad,) + x.shape[1:])])
+
+    # (n_blocks, ..., span): overlapping segments, one per block of windows
+    segments = sliding_window_view(x, span, axis=0)[::block]
+    if weighted and has_nan:
+        # Re-centre on the first finite value; NaNs are filled with it and add nothing
+        finite = ~np.isnan(segments)
+        ref = np.take_along_axis(segments, finite.argmax(axis=-1)[..., None], axis=-1)
+        ref = np.nan_to_num(ref)
+        segments = np.where(finite, segments - ref, 0.0)
+    elif weighted:
+        ref = segments[..., :1]
+        segments = segments - ref
+    elif has_nan:
+        segments = np.where(np.isnan(segments), 0.0, segments)
+
+    zeros = np.zeros(segments.shape[:-1] + (1,))
+    sum_x = np.concatenate([zeros, np.cumsum(segments, axis=-1)], axis=-1)
+    means = sum_x[..., window : window + block] - sum_x[..., :block]
+
+    if weighted:
+        # Window starting at local offset j has weights (k - j + 1) for k in [j, j + window)
+        k = np.arange(span, dtype=np.float64)
+        sum_kx = np.concatenate([zeros, np.cumsum(segments * k, axis=-1)], axis=-1)
+        j = np.arange(block, dtype=np.float64)
+        means = (sum_kx[..., window : window + block] - sum_kx[..., :block]) - (j - 1) * means
+        means = means / (window * (window + 1) / 2) + ref
+    else:
+        means /= window
+
+    means = np.moveaxis(means, -1, 1).reshape((n_blocks * block,) + x.shape[1:])
+    result[window - 1 :] = means[:n_out]
+
+    if has_nan:
+        nan_count = np.concatenate([np.zeros((1,) + x.shape[1:]), np.cumsum(nan_mask, axis=0)])
+        result[window - 1 :][(nan_count[window:] - nan_count[:-window]) > 0] = np.nan
+    return result
+
+
+def _ema_kernel(values: np.ndarray, com: float, out: np.ndarray) -> None:
+    """Run the ``ewm(adjust=False)`` recurrence over float64 buffers, writing into `out`.
+
+    Mirrors the pandas implementation step for step, including NaN inputs
+    holding the previous value while the old weight keeps decaying, so the
+    compiled kernel is bit-identical to ``Series.ewm(...).mean()``.
+
+    Args:
+        values (np.ndarray): Input values.
+        com (float): Center of mass, ``(span - 1) / 2``.
+        out (np.ndarray): Output buffer of the same length.
+
+    """
+    n = len(values)
+    if n == 0:
+        return
+    alpha = 1.0 / (1.0 + com)
+    old_wt_factor = 1.0 - alpha
+    old_wt = 1.0
+    weighted = values[0]
+    out[0] = weighted
+    for i in range(1, n):
+        cur = values[i]
+        is_observation = cur == cur
+        if weighted == weighted:
+            old_wt *= old_wt_factor
+            if is_observation:
+                if weighted != cur:
+                    weighted = old_wt * weighted + alpha * cur
+                    weighted /= old_wt + alpha
+                old_wt = 1.0
+        elif is_observation:
+            weighted = cur
+        out[i] = weighted
+
+
+def _ema_columns(values: np.ndarray, com: float, out: np.ndarray) -> None:
+    """Run the compiled `_ema_kernel` over each column of a ``(time, symbol)`` array."""
+    for c in range(values.shape[1]):
+        _ema_kernel_jit(values[:, c], com, out[:, c])
+
+
+def _ema_kernel_pd(values: np.ndarray, com: float, out: np.ndarray) -> None:
+    """Fallback for `_ema_columns` using pandas' compiled EWM on an index-free DataFrame."""
+    out[:] = pd.DataFrame(values, copy=False).ewm(com=com, adjust=False).mean().to_numpy()
+
+
+def _kama_kernel(values: np.ndarray, window: int, out: np.ndarray) -> None:
+    """Run the full KAMA computation over float64 buffers in one pass, writing into `out`.
+
+    The efficiency ratio's volatility term is a rolling sum of absolute price
+    changes, maintained with the same compensated add/remove scheme as
+    pandas' rolling sum so results are bit-identical to the vectorized pandas
+    formulation. The first `window` outputs are seeded with the input values.
+    Written as a plain loop so it can be compiled by numba.
+
+    Args:
+        values (np.ndarray): Input prices (array or list).
+        window (int): Efficiency ratio lookback, also the seed length.
+        out (np.ndarray): Output buffer of the same length (array or list).
+
+    """
+    n = len(values)
+    sum_x = 0.0
+    compensation_add = 0.0
+    compensation_remove = 0.0
+    nobs = 0
+    num_same = 0
+    prev_diff = np.nan
+    for i in range(n):
+        # Drop the absolute change that left the window
+        j = i - window
+        if j >= 1:
+            val = abs(values[j] - values[j - 1])
+            if val == val:
+                nobs -= 1
+                y = -val - compensation_remove
+                t = sum_x + y
+                compensation_remove = t - sum_x - y
+                sum_x = t
+
+        # Add the newest absolute change
+        if i >= 1:
+            val = abs(values[i] - values[i - 1])
+            if val == val:
+                nobs += 1
+                y = val - compensation_add
+                t = sum_x + y
+                compensation_add = t - sum_x - y
+                sum_x = t
+                if val == prev_diff:
+                    num_same += 1
+                else:
+                    num_same = 1
+                prev_diff = val
+
+        if i < window:
+            out[i] = values[i]
+            continue
+
+        if nobs < window:
+            volatility = np.nan
+        elif num_same >= nobs:
+            volatility = prev_diff * nobs
+        else:
+            volatility = sum_x
+        if volatility == 0:
+            volatility = np.nan
+
+        er = abs(values[i] - values[j]) / volatility
+        sc = er * (KAMA_FAST - KAMA_SLOW) + KAMA_SLOW
+        out[i] = out[i - 1] + sc * sc * (values[i] - out[i - 1])
+
+
+def _kama_columns(values: np.ndarray, window: int, out: np.ndarray, skip_padding: bool) -> None:
+    """Run the compiled `_kama_kernel` over each column of a ``(time, symbol)`` array.
+
+    With `skip_padding`, each column starts at its first observation, so a
+    symbol whose history is NaN-padded at the top gets the same result as its
+    unpadded series. Otherwise leading NaNs seed the recurrence, as in the
+    single-series formulation, and the result stays NaN.
+    """
+    n = values.shape[0]
+    for c in range(values.shape[1]):
+        start = 0
+        while skip_padding and start < n and values[start, c] != values[start, c]:
+            start += 1
+        out[:start, c] = np.nan
+        _kama_kernel_jit(values[start:, c], window, out[start:, c])
+
+
+def _kama_kernel_py(values: np.ndarray, window: int, out: np.ndarray, skip_padding: bool) -> None:
+    """Pure-Python fallback for `_kama_columns` that iterates over plain floats.
+
+    Converting each column to a list once avoids per-element NumPy scalar
+    boxing, which dominates when the loop is interpreted.
+    """
+    if len(values) == 0:
+        return
+    observed = ~np.isnan(values)
+    starts = np.where(observed.any(axis=0), observed.argmax(axis=0), len(values))
+    if not skip_padding:
+        starts[:] = 0
+    for c, start in enumerate(starts.tolist()):
+        out[:start, c] = np.nan
+        result = [0.0] * (len(values) - start)
+        _kama_kernel(values[start:, c].tolist(), window, result)
+        out[start:, c] = result
+
+
+if njit is not None:
+    _ema_kernel_jit = njit(cache=True, nogil=True)(_ema_kernel)
+    _kama_kernel_jit = njit(cache=True, nogil=True)(_kama_kernel)
+    _ema_kernel_impl = njit(cache=True, nogil=True)(_ema_columns)
+    _kama_kernel_impl = njit(cache=True, nogil=True)(_kama_columns)
+else:
+    _ema_kernel_impl = _ema_kernel_pd
+    _kama_kernel_impl = _kama_kernel_py
+
+
+def _columns(x: np.ndarray) -> np.ndarray:
+    """View `x` as a ``(time, symbol)`` array (a 1-D series becomes one column)."""
+    return x[:, np.newaxis] if x.ndim == 1 else x
+
+
+def _ema(x: np.ndarray, window: int, out: np.ndarray | None = None) -> np.ndarray:
+    """Compute ``ewm(span=window, adjust=False).mean()`` of `x` along axis 0."""
+    result = _output(out, x.shape)
+    _ema_kernel_impl(np.asfortranarray(_columns(x)), (window - 1) / 2.0, _columns(result))
+    return result
+
+
+def _kama(x: np.ndarray, window: int, out: np.ndarray | None = None) -> np.ndarray:
+    """Compute the Kaufman adaptive moving average of `x` along axis 0.
+
+    Leading NaNs are skipped only for 2-D panels, where they pad shorter
+    histories; a single series keeps its original all-NaN result.
+    """
+    result = _output(out, x.shape)
+    _kama_kernel_impl(np.asfortranarray(_columns(x)), window, _columns(result), x.ndim == 2)
+    return result
+
+
+def _nancumsum(x: np.ndarray) -> np.ndarray:
+    """Cumulative sum skipping NaN, leaving NaN at NaN positions (like pandas ``cumsum``)."""
+    result = np.nancumsum(x, axis=0)
+    result[np.isnan(x)] = np.nan
+    return result
+
+
+def _vwap(x: np.ndarray, volume: np.ndarray, out: np.ndarray | None = None) -> np.ndarray:
+    """Compute the cumulative volume-weighted average price."""
+    result = _output(out, x.shape)
+    cum_pv = _nancumsum(x * volume)
+    cum_vol = _nancumsum(volume)
+    cum_vol[cum_vol == 0] = np.nan
+    return np.divide(cum_pv, cum_vol, out=result)
+
+
+class _MovingAverageGraph:
+    """Memoized computation graph of moving-average intermediates for one array.
+
+    Nodes are keyed by ``(kind, window)`` and computed at most once, so
+    methods that are built from other moving averages (DEMA, TEMA, HMA, TMA)
+    reuse any intermediate already produced for the same input.
+    """
+
+    def __init__(self, values: np.ndarray, volume: np.ndarray | None = None) -> None:
+        """Initialize an empty graph over price (and optional volume) values.
+
+        Args:
+            values (np.ndarray): Float64 prices.
+            volume (np.ndarray | None): Float64 volumes for VWAP.
+
+        """
+        self.values = values
+        self.volume = volume
+        self._cache: dict[tuple[str, int], np.ndarray] = {}
+
+    @property
+    def node_count(self) -> int:
+        """Number of distinct nodes computed so far."""
+        return len(self._cache)
+
+    def get(self, method: str, window: int, out: np.ndarray | None = None) -> np.ndarray:
+        """Return the moving average for a method and window.
+
+        Args:
+            method (str): One of the `MovingAverageMethod` values.
+            window (int): Moving average window.
+            out (np.ndarray | None): Optional buffer to write the result into.
+
+        Returns:
+            np.ndarray: The moving average (`out` if given).
+
+        Raises:
+            ValueError: If the method or window is invalid, or VWAP lacks volume data.
+
+        """
+        if method not in _METHODS:
+            raise ValueError(
+                "Invalid method. Choose from 'sma', 'ema', 'wma', 'hma', 'vwap', 'dema', 'tema', "
+                "'kama', 'tma'."
+            )
+        _check_window(window)
+        if method == "vwap":
+            # VWAP is cumulative, so every window shares the same node
+            window = 0
+        return self._node(method, window, out)
+
+    def _node(self, kind: str, window: int, out: np.ndarray | None = None) -> np.ndarray:
+        """Return a cached node, computing it (and its inputs) on first use."""
+        key = (kind, window)
+        node = self._cache.get(key)
+        if node is None:
+            node = self._cache[key] = self._compute(kind, window, out)
+        elif out is not None:
+            out[...] = node
+            node = out
+        return node
+
+    def _compute(self, kind: str, window: int, out: np.ndarray | None) -> np.ndarray:
+        """Compute a single node from the input values and other nodes."""
+        x = self.values
+
+        if kind == "sma":
+            return _rolling_mean(x, window, out)
+
+        if kind == "ema":
+            return _ema(x, window, out)
+
+        if kind in ("ema2", "ema3"):
+            return _ema(self._node("ema" if kind == "ema2" else "ema2", window), window, out)
+
+        if kind == "wma":
+            return _rolling_mean(x, window, out, weighted=True)
+
+        if kind == "hma_diff":
+            half_length = max(1, int(window / 2))
+            wma_half = self._node("wma", half_length)
+            return np.subtract(2 * wma_half, self._node("wma", window), out=_output(out, x.shape))
+
+        if kind == "hma":
+            sqrt_length = max(1, int(math.sqrt(window)))
+            return _rolling_mean(self._node("hma_diff", window), sqrt_length, out, weighted=True)
+
+        if kind == "vwap":
+            if self.volume is None:
+                raise ValueError("VWAP requires volume data.")
+            return _vwap(x, self.volume, out)
+
+        if kind == "dema":
+            ema1 = self._node("ema", window)
+            return np.subtract(2 * ema1, self._node("ema2", window), out=_output(out, x.shape))
+
+        if kind == "tema":
+            spread = 3 * (self._node("ema", window) - self._node("ema2", window))
+            return np.add(spread, self._node("ema3", window), out=_output(out, x.shape))
+
+        if kind == "kama":
+            return _kama(x, window, out)
+
+        if kind == "tma":
+            return _rolling_mean(self._node("sma", window), window, out)
+
+        raise ValueError(f"Unknown moving average node: {kind}")
+
+
+def _prepare(values: np.ndarray, volume: np.ndarray | None) -> tuple[np.ndarray, np.ndarray | None]:
+    """Convert inputs to float64 arrays and validate their shapes."""
+    x = np.asarray(values, dtype=np.float64)
+    if x.ndim not in (1, 2):
+        raise ValueError("values must be a 1-D series or a 2-D (time, symbol) array.")
+    if volume is not None:
+        volume = np.asarray(volume, dtype=np.float64)
+        if volume.shape != x.shape:
+            raise ValueError("volume must have the same shape as values.")
+    return x, volume
+
+
+def moving_average(
+    values: np.ndarray,
+    window: int,
+    method: MovingAverageMethod = "sma",
+    volume: np.ndarray | None = None,
+    out: np.ndarray | None = None,
+) -> np.ndarray:
+    """Compute a moving average of the specified type over a NumPy array.
+
+    A 2-D ``(time, symbol)`` array is processed column-wise in one call.
+    Columns may be NaN-padded at the top for symbols with shorter histories;
+    each column's result matches computing it on its unpadded series.
+
+    Args:
+        values (np.ndarray): Prices, 1-D or ``(time, symbol)`` (converted to float64 if needed).
+        window (int): Moving average window.
+        method (MovingAverageMethod): Moving average type.
+        volume (np.ndarray | None): Volumes aligned with `values`, required for VWAP.
+        out (np.ndarray | None): Optional float64 buffer of the same shape to write into.
+
+    Returns:
+        np.ndarray: The moving average (`out` if given), NaN during warm-up.
+
+    Raises:
+        ValueError: If the method, window, shapes or `out` are invalid, or VWAP lacks volume.
+
+    """
+    x, volume = _prepare(values, volume)
+    return _MovingAverageGraph(x, volume).get(method, window, out)
+
+
+def moving_averages(
+    values: np.ndarray,
+    specs: Sequence[MovingAverageSpec],
+    volume: np.ndarray | None = None,
+    out: np.ndarray | None = None,
+) -> np.ndarray:
+    """Compute several moving averages of one array, sharing intermediates.
+
+    Every EMA, EMA-of-EMA, WMA and rolling mean needed by the requested specs
+    is computed once. For example SMA/EMA/DEMA/TEMA at the same window share a
+    single EMA chain, TMA reuses the SMA at its window, and HMA reuses WMAs
+    requested directly or by other HMA windows.
+
+    Args:
+        values (np.ndarray): Prices, 1-D or ``(time, symbol)`` (converted to float64 if needed).
+        specs (Sequence[MovingAverageSpec]): ``(method, window)`` pairs, one per column.
+        volume (np.ndarray | None): Volumes aligned with `values`, required for VWAP.
+        out (np.ndarray | None): Optional float64 buffer of shape ``values.shape + (len(specs),)``.
+
+    Returns:
+        np.ndarray: One result per spec along the last axis (`out` if given).
+
+    Raises:
+        ValueError: If a method, window, shape or `out` is invalid, or VWAP lacks volume.
+
+    """
+    x, volume = _prepare(values, volume)
+    result = _output(out, x.shape + (len(specs),))
+    graph = _MovingAverageGraph(x, volume)
+    for column, (method, window) in enumerate(specs):
+        graph.get(method, window, out=result[..., column])
+    return result
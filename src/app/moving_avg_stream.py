@@ -0,0 +1,456 @@
+"""Incremental (streaming) moving averages with O(1) updates per bar.
+
+Each supported method in `MovingAverageMethod` has a stateful counterpart whose
+`update(price, volume)` consumes one new bar and returns the latest value. The
+values track `calculate_moving_average` over the same history: window-based
+methods use ring buffers, EMA-derived methods and KAMA carry recursive state,
+and VWAP keeps cumulative sums.
+"""
+
+import math
+from abc import ABC, abstractmethod
+
+from app.moving_avg import MovingAverageMethod
+
+NAN = float("nan")
+
+
+class _RollingWindow:
+    """Fixed-size ring buffer with running sum and linearly weighted sum.
+
+    NaN inputs are stored as 0.0 in the running sums and counted separately,
+    so a window containing NaN can be reported as NaN, like pandas rolling
+    aggregations with ``min_periods=window``. The running sums are rebuilt
+    exactly once per full pass over the buffer to stop floating-point drift,
+    which keeps updates amortised O(1).
+    """
+
+    def __init__(self, window: int) -> None:
+        """Initialize an empty window of the given size.
+
+        Args:
+            window (int): Number of observations kept.
+
+        Raises:
+            ValueError: If window is smaller than 1.
+
+        """
+        if window < 1:
+            raise ValueError("window must be a positive integer.")
+        self.window = window
+        self._buffer = [0.0] * window
+        self._head = 0
+        self._count = 0
+        self._nan_count = 0
+        self._sum = 0.0
+        self._weighted_sum = 0.0
+
+    @property
+    def full(self) -> bool:
+        """Whether the window holds `window` observations."""
+        return self._count >= self.window
+
+    @property
+    def has_nan(self) -> bool:
+        """Whether any observation currently in the window is NaN."""
+        return self._nan_count > 0
+
+    def oldest(self) -> float:
+        """Return the observation that the next push will evict (NaN if not full)."""
+        if not self.full:
+            return NAN
+        return self._buffer[self._head]
+
+    def push(self, value: float) -> None:
+        """Add an observation, evicting the oldest one once the window is full.
+
+        Args:
+            value (float): New observation (may be NaN).
+
+        """
+        is_nan = math.isnan(value)
+        stored = 0.0 if is_nan else value
+        w = self.window
+
+        if self.full:
+            evicted = self._buffer[self._head]
+            if math.isnan(evicted):
+                self._nan_count -= 1
+                evicted = 0.0
+            # Shift every weight down by one, drop the oldest, add the newest at weight w
+            self._weighted_sum += w * stored - self._sum
+            self._sum += stored - evicted
+        else:
+            self._sum += stored
+            self._weighted_sum += (self._count + 1) * stored
+
+        self._buffer[self._head] = value
+        self._nan_count += is_nan
+        self._head = (self._head + 1) % w
+        self._count += 1
+
+        if self._head == 0 and self.full:
+            self._resync()
+
+    def _resync(self) -> None:
+        """Recompute the running sums exactly from the buffer contents."""
+        ordered = self._buffer[self._head :] + self._buffer[: self._head]
+        clean = [0.0 if math.isnan(v) else v for v in ordered]
+        self._sum = math.fsum(clean)
+        self._weighted_sum = math.fsum(i * v for i, v in enumerate(clean, start=1))
+
+    def mean(self) -> float:
+        """Return the simple mean of the window, or NaN if incomplete or NaN-tainted."""
+        if not self.full or self.has_nan:
+            return NAN
+        return self._sum / self.window
+
+    def sum(self) -> float:
+        """Return the sum of the window, or NaN if incomplete or NaN-tainted."""
+        if not self.full or self.has_nan:
+            return NAN
+        return self._sum
+
+    def weighted_mean(self) -> float:
+        """Return the linearly weighted mean (newest weight = window), or NaN."""
+        if not self.full or self.has_nan:
+            return NAN
+        return self._weighted_sum / (self.window * (self.window + 1) / 2)
+
+
+class StreamingMovingAverage(ABC):
+    """Base class for incremental moving averages."""
+
+    method: MovingAverageMethod
+
+    def __init__(self, window: int) -> None:
+        """Initialize the average for the given window.
+
+        Args:
+            window (int): Moving average window.
+
+        Raises:
+            ValueError: If window is smaller than 1.
+
+        """
+        if window < 1:
+            raise ValueError("window must be a positive integer.")
+        self.window = window
+        self.value = NAN
+
+    @abstractmethod
+    def _next(self, price: float, volume: float | None) -> float:
+        """Consume one bar and return the new value."""
+
+    def update(self, price: float, volume: float | None = None) -> float:
+        """Consume one bar and return the latest moving average value.
+
+        Args:
+            price (float): Closing price of the new bar.
+            volume (float | None): Volume of the new bar (required for VWAP).
+
+        Returns:
+            float: The moving average after this bar (NaN during warm-up).
+
+        """
+        self.value = self._next(float(price), volume)
+        return self.value
+
+
+class StreamingSMA(StreamingMovingAverage):
+    """Simple moving average over a ring buffer."""
+
+    method = "sma"
+
+    def __init__(self, window: int) -> None:
+        """Initialize the SMA state."""
+        super().__init__(window)
+        self._window = _RollingWindow(window)
+
+    def _next(self, price: float, volume: float | None) -> float:
+        self._window.push(price)
+        return self._window.mean()
+
+
+class StreamingWMA(StreamingMovingAverage):
+    """Linearly weighted moving average over a ring buffer."""
+
+    method = "wma"
+
+    def __init__(self, window: int) -> None:
+        """Initialize the WMA state."""
+        super().__init__(window)
+        self._window = _RollingWindow(window)
+
+    def _next(self, price: float, volume: float | None) -> float:
+        self._window.push(price)
+        return self._window.weighted_mean()
+
+
+class StreamingTMA(StreamingMovingAverage):
+    """Triangular moving average: an SMA of the SMA, both over ring buffers."""
+
+    method = "tma"
+
+    def __init__(self, window: int) -> None:
+        """Initialize the TMA state."""
+        super().__init__(window)
+        self._inner = _RollingWindow(window)
+        self._outer = _RollingWindow(window)
+
+    def _next(self, price: float, volume: float | None) -> float:
+        self._inner.push(price)
+        self._outer.push(self._inner.mean())
+        return self._outer.mean()
+
+
+class StreamingEMA(StreamingMovingAverage):
+    """Exponential moving average matching ``Series.ewm(span=window, adjust=False)``.
+
+    Mirrors the pandas recurrence, including how NaN inputs hold the previous
+    value while the old weight keeps decaying.
+    """
+
+    method = "ema"
+
+    def __init__(self, window: int) -> None:
+        """Initialize the EMA state."""
+        super().__init__(window)
+        self.alpha = 2 / (window + 1)
+        self._old_wt = 1.0
+
+    def _next(self, price: float, volume: float | None) -> float:
+        weighted = self.value
+        if math.isnan(weighted):
+            return price
+        self._old_wt *= 1 - self.alpha
+        if not math.isnan(price):
+            if weighted != price:
+                weighted = (self._old_wt * weighted + self.alpha * price) / (
+                    self._old_wt + self.alpha
+                )
+            self._old_wt = 1.0
+        return weighted
+
+
+class StreamingDEMA(StreamingMovingAverage):
+    """Double exponential moving average: ``2 * EMA - EMA(EMA)``."""
+
+    method = "dema"
+
+    def __init__(self, window: int) -> None:
+        """Initialize the chained EMA state."""
+        super().__init__(window)
+        self._ema1 = StreamingEMA(window)
+        self._ema2 = StreamingEMA(window)
+
+    def _next(self, price: float, volume: float | None) -> float:
+        ema1 = self._ema1.update(price)
+        ema2 = self._ema2.update(ema1)
+        return 2 * ema1 - ema2
+
+
+class StreamingTEMA(StreamingMovingAverage):
+    """Triple exponential moving average: ``3 * (EMA1 - EMA2) + EMA3``."""
+
+    method = "tema"
+
+    def __init__(self, window: int) -> None:
+        """Initialize the chained EMA state."""
+        super().__init__(window)
+        self._ema1 = StreamingEMA(window)
+        self._ema2 = StreamingEMA(window)
+        self._ema3 = StreamingEMA(window)
+
+    def _next(self, price: float, volume: float | None) -> float:
+        ema1 = self._ema1.update(price)
+        ema2 = self._ema2.update(ema1)
+        ema3 = self._ema3.update(ema2)
+        return 3 * (ema1 - ema2) + ema3
+
+
+class StreamingHMA(StreamingMovingAverage):
+    """Hull moving average built from three streaming WMAs."""
+
+    method = "hma"
+
+    def __init__(self, window: int) -> None:
+        """Initialize the WMA state for the half, full and smoothing windows."""
+        super().__init__(window)
+        self._half = _RollingWindow(max(1, int(window / 2)))
+        self._full = _RollingWindow(window)
+        self._smooth = _RollingWindow(max(1, int(math.sqrt(window))))
+
+    def _next(self, price: float, volume: float | None) -> float:
+        self._half.push(price)
+        self._full.push(price)
+        self._smooth.push(2 * self._half.weighted_mean() - self._full.weighted_mean())
+        return self._smooth.weighted_mean()
+
+
+class StreamingVWAP(StreamingMovingAverage):
+    """Cumulative volume-weighted average price.
+
+    Like the batch implementation, NaN bars are skipped by the cumulative sums
+    and report NaN for that bar only.
+    """
+
+    method = "vwap"
+
+    def __init__(self, window: int) -> None:
+        """Initialize the cumulative sums (window is kept for keying only)."""
+        super().__init__(window)
+        self._cum_pv = 0.0
+        self._cum_vol = 0.0
+
+    def _next(self, price: float, volume: float | None) -> float:
+        if volume is None:
+            raise ValueError("VWAP requires volume data.")
+        volume = float(volume)
+        pv = price * volume
+        if not math.isnan(pv):
+            self._cum_pv += pv
+        if not math.isnan(volume):
+            self._cum_vol += volume
+        if math.isnan(pv) or math.isnan(volume) or self._cum_vol == 0:
+            return NAN
+        return self._cum_pv / self._cum_vol
+
+
+class StreamingKAMA(StreamingMovingAverage):
+    """Kaufman adaptive moving average with O(1) efficiency-ratio updates.
+
+    The first `window` bars are passed through unchanged, matching the seed of
+    the batch implementation.
+    """
+
+    method = "kama"
+
+    FAST = 2 / (2 + 1)
+    SLOW = 2 / (30 + 1)
+
+    def __init__(self, window: int) -> None:
+        """Initialize the price and volatility ring buffers."""
+        super().__init__(window)
+        self._prices = _RollingWindow(window)
+        self._volatility = _RollingWindow(window)
+        self._last_price = NAN
+        self._count = 0
+
+    def _next(self, price: float, volume: float | None) -> float:
+        price_window_ago = self._prices.oldest()
+        self._volatility.push(abs(price - self._last_price))
+        self._prices.push(price)
+        self._last_price = price
+        self._count += 1
+
+        if self._count <= self.window:
+            return price
+
+        volatility = self._volatility.sum()
+        er = abs(price - price_window_ago) / volatility if volatility != 0 else NAN
+        sc = (er * (self.FAST - self.SLOW) + self.SLOW) ** 2
+        return self.value + sc * (price - self.value)
+
+
+_STREAMING_CLASSES: dict[str, type[StreamingMovingAverage]] = {
+    cls.method: cls
+    for cls in (
+        StreamingSMA,
+        StreamingEMA,
+        StreamingWMA,
+        StreamingHMA,
+        StreamingVWAP,
+        StreamingDEMA,
+        StreamingTEMA,
+        StreamingKAMA,
+        StreamingTMA,
+    )
+}
+
+
+def create_streaming_average(method: MovingAverageMethod, window: int) -> StreamingMovingAverage:
+    """Create an incremental moving average for the given method and window.
+
+    Args:
+        method (MovingAverageMethod): Moving average type.
+        window (int): Moving average window.
+
+    Returns:
+        StreamingMovingAverage: A fresh state object.
+
+    Raises:
+        ValueError: If the method is not supported.
+
+    """
+    try:
+        cls = _STREAMING_CLASSES[method]
+    except KeyError:
+        raise ValueError(
+            "Invalid method. Choose from 'sma', 'ema', 'wma', 'hma', 'vwap', 'dema', 'tema', "
+            "'kama', 'tma'."
+        ) from None
+    return cls(window)
+
+
+class StreamingAverageRegistry:
+    """Holds one streaming state object per (symbol, method, window)."""
+
+    def __init__(self) -> None:
+        """Initialize an empty registry."""
+        self._states: dict[tuple[str, str, int], StreamingMovingAverage] = {}
+
+    def __len__(self) -> int:
+        """Return the number of tracked state objects."""
+        return len(self._states)
+
+    def get(self, symbol: str, method: MovingAverageMethod, window: int) -> StreamingMovingAverage:
+        """Return the state for a key, creating it on first use.
+
+        Args:
+            symbol (str): Ticker symbol.
+            method (MovingAverageMethod): Moving average type.
+            window (int): Moving average window.
+
+        Returns:
+            StreamingMovingAverage: The state object for this key.
+
+        """
+        key = (symbol, method, window)
+        state = self._states.get(key)
+        if state is None:
+            state = self._states[key] = create_streaming_average(method, window)
+        return state
+
+    def update(
+        self,
+        symbol: str,
+        method: MovingAverageMethod,
+        window: int,
+        price: float,
+        volume: float | None = None,
+    ) -> float:
+        """Feed one bar to the state for a key and return the latest value.
+
+        Args:
+            symbol (str): Ticker symbol.
+            method (MovingAverageMethod): Moving average type.
+            window (int): Moving average window.
+            price (float): Closing price of the new bar.
+            volume (float | None): Volume of the new bar (required for VWAP).
+
+        Returns:
+            float: The moving average after this bar.
+
+        """
+        return self.get(symbol, method, window).update(price, volume)
+
+    def discard(self, symbol: str) -> None:
+        """Drop every state object tracked for a symbol.
+
+        Args:
+            symbol (str): Ticker symbol.
+
+        """
+        for key in [key for key in self._states if key[0] == symbol]:
+            del self._states[key]
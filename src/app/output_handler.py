@@ -1,16 +1,29 @@
 """Module to handle output of analysis results to the configured target.
 
-Supports logging, stdout, queue publishing, REST, S3, and database sinks.
+Supports logging, stdout, queue publishing, REST, S3, database and local file
+sinks. Whole result tables can be sent in columnar form with `send_table`.
+Sink backends (the S3 sink, pyarrow, SQLAlchemy) are imported on first use.
 Includes retry logic, validation, and optional metrics integration.
 """
 
+import atexit
+import csv
+import gzip
+import io
 import json
+import socket
+import threading
 import time
-import uuid
 from collections.abc import Callable
-from typing import Any
+from concurrent.futures import ThreadPoolExecutor, wait
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any
 
+import requests
+from requests.adapters import HTTPAdapter
 from tenacity import retry, stop_after_attempt, wait_exponential
+from urllib3.connection import HTTPConnection
+from urllib3.util.retry import Retry
 
 from app import config_shared
 from app.queue_sender import publish_to_queue
@@ -22,9 +35,223 @@ from app.utils.metrics import (
 from app.utils.redactor import redact_dict
 from app.utils.setup_logger import setup_logger
 from app.utils.types import OutputMode, validate_list_of_dicts
+from app.utils.vault_client import on_config_change
+
+if TYPE_CHECKING:
+    from app.columnar_output import LocalFileSink
+    from app.s3_sink import BufferedS3Sink
 
 logger = setup_logger(__name__)
 
+# Metric names used by `record_sink_metrics` for the network sinks
+_SINK_METRIC_NAMES = {OutputMode.REST: "rest", OutputMode.S3: "s3", OutputMode.DATABASE: "db"}
+
+# Local-file output is specific to this service. OutputMode is synced from
+# repo-utils-shared, so this mode is resolved here as a plain string.
+FILE_OUTPUT_MODE = "file"
+
+SinkMode = OutputMode | str
+
+
+def _mode_name(mode: SinkMode) -> str:
+    """Return the configured name of an output mode."""
+    return mode.value if isinstance(mode, OutputMode) else mode
+
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+# Slots limiting how many dispatches of each sink may be in the pool at once
+_sink_slots: dict[str, threading.BoundedSemaphore] = {}
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Return the thread pool shared by all output fan-outs, creating it on first use."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=config_shared.get_output_max_workers(),
+                thread_name_prefix="output",
+            )
+        return _executor
+
+
+def _sink_slot(mode: SinkMode) -> threading.BoundedSemaphore:
+    """Return the in-flight slots of a sink, creating them on first use."""
+    with _executor_lock:
+        name = _mode_name(mode)
+        if name not in _sink_slots:
+            _sink_slots[name] = threading.BoundedSemaphore(
+                config_shared.get_output_sink_max_in_flight()
+            )
+        return _sink_slots[name]
+
+
+def _run_in_slot(
+    slot: threading.BoundedSemaphore, method: Callable[[Any], None], data: Any
+) -> None:
+    """Run a sink on the pool and free its in-flight slot once it finishes."""
+    try:
+        method(data)
+    finally:
+        slot.release()
+
+
+def _keepalive_socket_options(idle_seconds: int) -> list[tuple[int, int, int]]:
+    """Return socket options enabling TCP keep-alive probes after `idle_seconds`."""
+    options = [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+    # Probe tuning is platform specific; fall back to the OS defaults where missing
+    for name, value in (("TCP_KEEPIDLE", idle_seconds), ("TCP_KEEPINTVL", 10), ("TCP_KEEPCNT", 3)):
+        if hasattr(socket, name):
+            options.append((socket.IPPROTO_TCP, getattr(socket, name), value))
+    return options
+
+
+class _KeepAliveAdapter(HTTPAdapter):
+    """HTTP adapter whose pooled connections use TCP keep-alive probes."""
+
+    def __init__(
+        self, *args: Any, socket_options: list[tuple[int, int, int]], **kwargs: Any
+    ) -> None:
+        """Create the adapter with extra socket options for new connections."""
+        self._socket_options = socket_options
+        super().__init__(*args, **kwargs)
+
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        """Create the pool manager with the keep-alive socket options."""
+        kwargs["socket_options"] = HTTPConnection.default_socket_options + self._socket_options
+        super().init_poolmanager(*args, **kwargs)
+
+
+def create_rest_session() -> requests.Session:
+    """Create a pooled HTTP session for the REST output sink.
+
+    Connections are reused across batches (REST_OUTPUT_POOL_SIZE per host)
+    and, unless REST_OUTPUT_KEEPALIVE_IDLE is 0, kept alive with TCP probes
+    so idle connections are not silently dropped by load balancers. 429 and
+    5xx responses are retried REST_OUTPUT_RETRIES times with exponential
+    backoff, honouring ``Retry-After``.
+
+    Returns:
+        requests.Session: Configured session.
+
+    """
+    retries = Retry(
+        total=config_shared.get_rest_output_retries(),
+        backoff_factor=config_shared.get_rest_output_backoff(),
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset({"POST"}),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    pool_size = config_shared.get_rest_output_pool_size()
+    idle = config_shared.get_rest_output_keepalive_idle()
+    if idle > 0:
+        adapter: HTTPAdapter = _KeepAliveAdapter(
+            pool_connections=1,
+            pool_maxsize=pool_size,
+            max_retries=retries,
+            socket_options=_keepalive_socket_options(idle),
+        )
+    else:
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retries)
+
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({"Content-Type": "application/json"})
+    return session
+
+
+# URLs of the engines cached by `_get_database_engine`
+_engine_urls: set[str] = set()
+
+# Settings an engine is built from; engines are rebuilt only when one of these changes in Vault
+DATABASE_CONNECTION_KEYS = (
+    "DATABASE_OUTPUT_URL",
+    "DATABASE_POOL_SIZE",
+    "DATABASE_MAX_OVERFLOW",
+    "DATABASE_POOL_RECYCLE",
+)
+
+
+@lru_cache(maxsize=None)
+def _get_database_engine(url: str) -> Any:
+    """Return a pooled SQLAlchemy engine for a database URL, created once and reused.
+
+    Args:
+        url (str): SQLAlchemy connection URL.
+
+    Returns:
+        sqlalchemy.engine.Engine: Cached engine.
+
+    """
+    import sqlalchemy
+
+    _engine_urls.add(url)
+    options: dict[str, Any] = {"pool_pre_ping": True}
+    if not url.startswith("sqlite"):
+        options.update(
+            pool_size=config_shared.get_database_pool_size(),
+            max_overflow=config_shared.get_database_max_overflow(),
+            pool_recycle=config_shared.get_database_pool_recycle(),
+        )
+    return sqlalchemy.create_engine(url, **options)
+
+
+def _reset_database_engines(changed: frozenset[str]) -> None:
+    """Dispose of cached engines so the next write connects with the new settings."""
+    for url in list(_engine_urls):
+        _get_database_engine(url).dispose()
+    _engine_urls.clear()
+    _get_database_engine.cache_clear()
+
+
+on_config_change(DATABASE_CONNECTION_KEYS, _reset_database_engines)
+
+
+def _copy_value(value: Any) -> Any:
+    """Convert a record value for COPY: nested structures become JSON text."""
+    if isinstance(value, dict | list):
+        return json.dumps(value)
+    return value
+
+
+def _copy_rows(conn: Any, table: str, columns: list[str], rows: list[dict[str, Any]]) -> None:
+    """Load rows into a PostgreSQL table with COPY ... FROM STDIN.
+
+    Works with both psycopg2 (`copy_expert`) and psycopg 3 (`cursor.copy`).
+
+    Args:
+        conn (sqlalchemy.engine.Connection): Connection inside an open transaction.
+        table (str): Target table, optionally schema-qualified.
+        columns (list[str]): Columns to fill, read from the same keys of each row.
+        rows (list[dict[str, Any]]): Records to load.
+
+    """
+    quote = conn.dialect.identifier_preparer.quote
+    target = ".".join(quote(part) for part in table.split("."))
+    statement = (
+        f"COPY {target} ({', '.join(quote(c) for c in columns)}) FROM STDIN WITH (FORMAT csv)"
+    )
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(
+        [_copy_value(row.get(column)) for column in columns] for row in rows
+    )
+    buffer.seek(0)
+
+    cursor = conn.connection.driver_connection.cursor()
+    try:
+        if hasattr(cursor, "copy_expert"):
+            cursor.copy_expert(statement, buffer)
+        else:
+            # Raw CSV data; write_row would send TEXT-format rows
+            with cursor.copy(statement) as copy:
+                copy.write(buffer.getvalue())
+    finally:
+        cursor.close()
+
 
 class OutputDispatcher:
     """Handles routing analysis output to different destinations (e.g., queue, REST, S3, DB)."""
@@ -32,10 +259,49 @@ class OutputDispatcher:
     def __init__(self) -> None:
         """Initialize dispatcher with configured output modes."""
         self.output_modes = config_shared.get_output_modes()
+        self._rest_session: requests.Session | None = None
+        self._rest_session_lock = threading.Lock()
+        self._s3_sink: BufferedS3Sink | None = None
+        self._s3_sink_lock = threading.Lock()
+        self._file_sink: LocalFileSink | None = None
+        self._file_sink_lock = threading.Lock()
+
+    @property
+    def rest_session(self) -> requests.Session:
+        """Pooled HTTP session for the REST sink, created on first use."""
+        with self._rest_session_lock:
+            if self._rest_session is None:
+                self._rest_session = create_rest_session()
+            return self._rest_session
+
+    @property
+    def s3_sink(self) -> "BufferedS3Sink":
+        """Buffered S3 sink, created on first use and flushed at interpreter exit."""
+        from app.s3_sink import BufferedS3Sink
+
+        with self._s3_sink_lock:
+            if self._s3_sink is None:
+                self._s3_sink = BufferedS3Sink()
+                atexit.register(self._s3_sink.close)
+            return self._s3_sink
+
+    @property
+    def file_sink(self) -> "LocalFileSink":
+        """Local Parquet/Arrow file sink, created on first use."""
+        from app.columnar_output import LocalFileSink
+
+        with self._file_sink_lock:
+            if self._file_sink is None:
+                self._file_sink = LocalFileSink()
+            return self._file_sink
 
     def send(self, data: list[dict[str, Any]]) -> None:
         """Dispatch processed analysis output to one or more configured destinations.
 
+        With several output modes, the sinks run concurrently on a shared thread
+        pool and each is given OUTPUT_SINK_TIMEOUT seconds, so one slow or
+        failing sink does not hold up the others.
+
         Args:
             data (list[dict[str, Any]]): List of data payloads to send.
 
@@ -47,8 +313,8 @@ class OutputDispatcher:
                 paper_mode = config_shared.get_paper_trade_mode()
                 logger.debug("📄 Paper trading enabled — dispatching to %s mode", paper_mode)
                 try:
-                    dispatch_method = self._get_dispatch_method(OutputMode[paper_mode])
-                except KeyError:
+                    dispatch_method = self._get_dispatch_method(OutputMode(paper_mode))
+                except ValueError:
                     logger.warning("⚠️ Invalid paper trading output mode: %s", paper_mode)
                     return
                 if dispatch_method:
@@ -57,20 +323,135 @@ class OutputDispatcher:
                     logger.warning("⚠️ Invalid paper trading output mode: %s", paper_mode)
                 return
 
-            for mode in self.output_modes:
-                try:
-                    dispatch_method = self._get_dispatch_method(OutputMode[mode])
-                except KeyError:
-                    logger.warning("⚠️ Invalid output mode: %s", mode)
-                    continue
-                if dispatch_method:
-                    dispatch_method(data)
-                else:
-                    logger.warning("⚠️ Unhandled output mode: %s", mode)
+            dispatches = self._resolve_dispatches()
+            if len(dispatches) == 1:
+                dispatches[0][1](data)
+            elif dispatches:
+                self._dispatch_concurrently(dispatches, data)
 
         except Exception as e:
             logger.error("❌ Failed to send output: %s", e)
 
+    def send_table(self, table: Any) -> None:
+        """Dispatch a whole result table to the configured destinations.
+
+        The S3 and file sinks write the table in columnar form (Parquet or
+        Arrow) without building a dict per row. Other modes receive the rows
+        as records, converted once.
+
+        Args:
+            table (pyarrow.Table | pd.DataFrame): Computed results.
+
+        """
+        try:
+            if not hasattr(table, "to_pylist"):
+                from app.columnar_output import frame_to_table
+
+                table = frame_to_table(table)
+
+            if config_shared.get_paper_trading_enabled():
+                self.send(table.to_pylist())
+                return
+
+            resolved = self._resolve_dispatches()
+            columnar: dict[SinkMode, Callable[[Any], None]] = {
+                FILE_OUTPUT_MODE: self._output_table_to_file
+            }
+            if any(mode == OutputMode.S3 for mode, _ in resolved):
+                if self.s3_sink.output_format != "ndjson":
+                    columnar[OutputMode.S3] = self.s3_sink.add_table
+
+            records = None
+            if any(mode not in columnar for mode, _ in resolved):
+                records = table.to_pylist()
+            dispatches: list[tuple[SinkMode, Callable[[Any], None]]] = [
+                (mode, columnar.get(mode) or (lambda _table, method=method: method(records)))
+                for mode, method in resolved
+            ]
+
+            if len(dispatches) == 1:
+                dispatches[0][1](table)
+            elif dispatches:
+                self._dispatch_concurrently(dispatches, table)
+
+        except Exception as e:
+            logger.error("❌ Failed to send output table: %s", e)
+
+    def _resolve_dispatches(
+        self,
+    ) -> list[tuple[SinkMode, Callable[[list[dict[str, Any]]], None]]]:
+        """Return the dispatch method of each valid configured output mode."""
+        dispatches: list[tuple[SinkMode, Callable[[list[dict[str, Any]]], None]]] = []
+        for mode in self.output_modes:
+            try:
+                output_mode = FILE_OUTPUT_MODE if mode == FILE_OUTPUT_MODE else OutputMode(mode)
+            except ValueError:
+                logger.warning("⚠️ Invalid output mode: %s", mode)
+                continue
+            dispatch_method = self._get_dispatch_method(output_mode)
+            if dispatch_method:
+                dispatches.append((output_mode, dispatch_method))
+            else:
+                logger.warning("⚠️ Unhandled output mode: %s", mode)
+        return dispatches
+
+    def _dispatch_concurrently(
+        self,
+        dispatches: list[tuple[SinkMode, Callable[[Any], None]]],
+        data: Any,
+    ) -> None:
+        """Run several sinks on the shared pool and wait for each up to the sink timeout.
+
+        Failures and timeouts are logged and recorded per sink. A sink that
+        times out keeps running in the background, since threads cannot be
+        cancelled, but the batch no longer waits for it. A sink that already
+        has OUTPUT_SINK_MAX_IN_FLIGHT dispatches running is skipped and
+        recorded as busy, so a hung sink cannot fill the pool and stall the
+        others.
+
+        Args:
+            dispatches (list[tuple[SinkMode, Callable]]): Sinks to send to.
+            data (Any): Data to send, records or a table.
+
+        """
+        timeout = config_shared.get_output_sink_timeout()
+        executor = _get_executor()
+        futures = {}
+        for mode, method in dispatches:
+            slot = _sink_slot(mode)
+            if not slot.acquire(blocking=False):
+                logger.warning(
+                    "🚧 Output to %s skipped: still busy with earlier batches", _mode_name(mode)
+                )
+                self._record_sink_failure(mode, "busy", 0)
+                continue
+            try:
+                futures[executor.submit(_run_in_slot, slot, method, data)] = mode
+            except Exception:
+                slot.release()
+                raise
+        done, not_done = wait(futures, timeout=timeout)
+
+        for future in done:
+            error = future.exception()
+            if error is not None:
+                mode = futures[future]
+                logger.error("❌ Output to %s failed: %s", _mode_name(mode), error)
+                self._record_sink_failure(mode, "exception", 0)
+        for future in not_done:
+            mode = futures[future]
+            logger.error("⏱️ Output to %s timed out after %.1fs", _mode_name(mode), timeout)
+            self._record_sink_failure(mode, "timeout", timeout)
+
+    @staticmethod
+    def _record_sink_failure(mode: SinkMode, status: str, duration_sec: float) -> None:
+        """Record a failed or timed-out dispatch under the sink's metrics."""
+        sink = _SINK_METRIC_NAMES.get(mode)
+        if sink is not None:
+            record_sink_metrics(sink, status, duration_sec, failed=True)
+        else:
+            record_output_metrics(_mode_name(mode), success=False, duration_sec=duration_sec)
+
     def send_trade_simulation(self, data: dict[str, Any]) -> None:
         """Send simulated trade data to the appropriate paper trade destination.
 
@@ -87,13 +468,11 @@ class OutputDispatcher:
             logger.error("❌ Failed to send paper trade: %s", e)
             record_paper_trade_metrics("queue", success=False, duration_sec=0)
 
-    def _get_dispatch_method(
-        self, mode: OutputMode
-    ) -> Callable[[list[dict[str, Any]]], None] | None:
+    def _get_dispatch_method(self, mode: SinkMode) -> Callable[[list[dict[str, Any]]], None] | None:
         """Resolve the output dispatch method based on the mode.
 
         Args:
-            mode (OutputMode): Output mode enum value.
+            mode (SinkMode): Output mode enum value, or FILE_OUTPUT_MODE.
 
         Returns:
             Callable or None: Method to handle the output.
@@ -106,6 +485,7 @@ class OutputDispatcher:
             OutputMode.REST: self._output_to_rest,
             OutputMode.S3: self._output_to_s3,
             OutputMode.DATABASE: self._output_to_database,
+            FILE_OUTPUT_MODE: self._output_to_file,
         }.get(mode)
 
     def _output_to_log(self, data: list[dict[str, Any]]) -> None:
@@ -143,19 +523,21 @@ class OutputDispatcher:
         record_output_metrics("queue", success=True, duration_sec=0)
 
     def _output_to_rest(self, data: list[dict[str, Any]]) -> None:
-        """Send the data to the configured REST endpoint.
+        """Send the data to the configured REST endpoint over the pooled session.
 
         Args:
             data (list[dict[str, Any]]): Data to post to REST API.
 
         """
-        import requests
-
         url = config_shared.get_rest_output_url()
-        headers = {"Content-Type": "application/json"}
+        body = json.dumps(data).encode("utf-8")
+        headers = {}
+        if config_shared.get_rest_output_gzip():
+            body = gzip.compress(body, compresslevel=5)
+            headers["Content-Encoding"] = "gzip"
         start = time.perf_counter()
         try:
-            response = requests.post(url, json=data, headers=headers, timeout=10)
+            response = self.rest_session.post(url, data=body, headers=headers, timeout=10)
             duration = time.perf_counter() - start
             record_sink_metrics("rest", str(response.status_code), duration, failed=not response.ok)
 
@@ -168,29 +550,46 @@ class OutputDispatcher:
             record_sink_metrics("rest", "exception", 0, failed=True)
 
     def _output_to_s3(self, data: list[dict[str, Any]]) -> None:
-        """Upload the data as a JSON file to an S3 bucket.
+        """Buffer the data for the write-behind S3 sink.
+
+        Records are uploaded in large partitioned objects once the sink's size
+        or time threshold is reached; see `app.s3_sink`.
 
         Args:
             data (list[dict[str, Any]]): Data to upload.
 
         """
-        import boto3
+        self.s3_sink.add(data)
+        logger.debug("🪣 Buffered %d record(s) for S3 output", len(data))
 
-        s3 = boto3.client("s3")
-        bucket = config_shared.get_s3_output_bucket()
-        key = f"outputs/{uuid.uuid4()}.json"
+    def _output_to_file(self, data: list[dict[str, Any]]) -> None:
+        """Write the data to partitioned Parquet or Arrow files in FILE_OUTPUT_DIR.
+
+        Args:
+            data (list[dict[str, Any]]): Data records to write.
+
+        """
+        self._output_table_to_file(data)
+
+    def _output_table_to_file(self, data: Any) -> None:
+        """Write records or an Arrow table with the local file sink."""
         start = time.perf_counter()
         try:
-            s3.put_object(Bucket=bucket, Key=key, Body=json.dumps(data).encode("utf-8"))
-            duration = time.perf_counter() - start
-            record_sink_metrics("s3", "200", duration, failed=False)
-            logger.info("🚚 Uploaded output to S3: %s/%s", bucket, key)
+            if isinstance(data, list):
+                self.file_sink.write_records(data)
+            else:
+                self.file_sink.write(data)
+            record_output_metrics("file", success=True, duration_sec=time.perf_counter() - start)
         except Exception as e:
-            logger.error("❌ S3 upload failed: %s", e)
-            record_sink_metrics("s3", "exception", 0, failed=True)
+            logger.error("❌ File output failed: %s", e)
+            record_output_metrics("file", success=False, duration_sec=0)
 
     def _output_to_database(self, data: list[dict[str, Any]]) -> None:
-        """Write the data to the configured database using raw SQL inserts.
+        """Write the data to the configured database in one bulk statement.
+
+        Records are sent as a single executemany of DATABASE_INSERT_SQL over
+        a cached, pooled engine. On PostgreSQL with DATABASE_COPY_TABLE set,
+        they are streamed with COPY instead.
 
         Args:
             data (list[dict[str, Any]]): Data records to insert.
@@ -198,18 +597,28 @@ class OutputDispatcher:
         """
         import sqlalchemy
 
-        engine = sqlalchemy.create_engine(config_shared.get_database_output_url())
+        rows = []
+        for item in data:
+            if not isinstance(item, dict):
+                logger.warning("⚠️ Invalid item in database batch: %s", item)
+                continue
+            rows.append(item)
+        if not rows:
+            return
+
         start = time.perf_counter()
         try:
+            engine = _get_database_engine(config_shared.get_database_output_url())
+            copy_table = config_shared.get_database_copy_table()
             with engine.begin() as conn:
-                for item in data:
-                    if not isinstance(item, dict):
-                        logger.warning("⚠️ Invalid item in database batch: %s", item)
-                        continue
-                    conn.execute(sqlalchemy.text(config_shared.get_database_insert_sql()), **item)
+                if copy_table and conn.dialect.name == "postgresql":
+                    columns = config_shared.get_database_copy_columns() or list(rows[0])
+                    _copy_rows(conn, copy_table, columns, rows)
+                else:
+                    conn.execute(sqlalchemy.text(config_shared.get_database_insert_sql()), rows)
             duration = time.perf_counter() - start
             record_sink_metrics("db", "success", duration, failed=False)
-            logger.info("📊 Wrote %d records to database", len(data))
+            logger.info("📊 Wrote %d records to database", len(rows))
         except Exception as e:
             logger.error("❌ Database output failed: %s", e)
             record_sink_metrics("db", "exception", 0, failed=True)
@@ -252,4 +661,14 @@ def send_to_output(data: list[dict[str, Any]]) -> None:
     output_handler.send(data)
 
 
-__all__ = ["send_to_output", "output_handler"]
+def send_table_to_output(table: Any) -> None:
+    """Send a whole result table using the default output handler instance.
+
+    Args:
+        table (pyarrow.Table | pd.DataFrame): Computed results.
+
+    """
+    output_handler.send_table(table)
+
+
+__all__ = ["send_to_output", "send_table_to_output", "output_handler"]
@@ -1,15 +1,24 @@
 """Module to process stock data by applying moving averages."""
 
+import time
+from collections.abc import Callable
 from typing import Literal, cast
 
+import numpy as np
 import pandas as pd
 
+from app import config_shared
+from app.history_store import PriceHistoryStore, get_history_store
 from app.moving_avg import calculate_moving_average
-from app.output_handler import send_to_output
+from app.moving_avg_array import MovingAverageSpec, moving_average, moving_averages
+from app.output_handler import send_table_to_output, send_to_output
+from app.utils.hot_path_logging import HotPathLogger
+from app.utils.metrics import record_processing_metrics
 from app.utils.setup_logger import setup_logger
 
 # Initialize logger
 logger = setup_logger(__name__)
+hot_path_logger = HotPathLogger(logger)
 
 # Supported moving average methods
 VALID_METHODS = {"sma", "ema", "wma", "hma", "vwap", "dema", "tema", "kama", "tma"}
@@ -75,7 +84,7 @@ def process_stock_data(
             return pd.DataFrame()
 
         if ma_method not in VALID_METHODS:
-            logger.error(f"Invalid moving average method: {ma_method}")
+            logger.error("Invalid moving average method: %s", ma_method)
             return pd.DataFrame()
 
         if "Close" not in stock_data.columns:
@@ -107,22 +116,234 @@ def process_stock_data(
         stock_data[column_name] = ma_series
 
         symbol = stock_data["symbol"].iloc[0] if "symbol" in stock_data.columns else "N/A"
-        logger.info(f"Calculated {column_name} for symbol: {symbol}")
-
-        send_to_output(
-            [
-                {
-                    "symbol": symbol,
-                    "analysis_type": "movavg",
-                    "method": ma_method,
-                    "window": window_size,
-                    "result": stock_data.tail(1).to_dict(orient="records")[0],
-                }
-            ]
+        hot_path_logger.symbol_result(
+            symbol, column_name, "Calculated %s for symbol: %s", column_name, symbol
         )
 
+        if config_shared.get_output_columnar():
+            from app.columnar_output import frame_to_table
+
+            send_table_to_output(
+                frame_to_table(
+                    stock_data,
+                    {
+                        "symbol": symbol,
+                        "analysis_type": "movavg",
+                        "method": ma_method,
+                        "window": window_size,
+                    },
+                )
+            )
+        else:
+            send_to_output(
+                [
+                    {
+                        "symbol": symbol,
+                        "analysis_type": "movavg",
+                        "method": ma_method,
+                        "window": window_size,
+                        "result": stock_data.tail(1).to_dict(orient="records")[0],
+                    }
+                ]
+            )
+
         return stock_data
 
     except Exception:
         logger.exception("Unhandled error while processing stock data")
         return pd.DataFrame()
+
+
+def process_bar(
+    bar: dict,
+    window_size: int,
+    ma_method: MovingAvgMethod = "sma",
+    store: PriceHistoryStore | None = None,
+) -> dict | None:
+    """Append a single bar to its symbol's history and compute the latest moving average.
+
+    Producers only need to send the newest bar; the lookback window comes from
+    the in-memory `PriceHistoryStore`. As in `process_stock_data`, the window
+    is shrunk to the available history while it is still filling up.
+
+    Args:
+        bar (dict): Message with 'symbol', 'Close' and optionally 'Volume'.
+        window_size (int): Window size for the moving average.
+        ma_method (MovingAvgMethod): Type of moving average.
+        store (PriceHistoryStore | None): History store (default: the shared store).
+
+    Returns:
+        dict | None: Output payload for the bar, or None if the bar is invalid.
+
+    """
+    try:
+        if ma_method not in VALID_METHODS:
+            logger.error("Invalid moving average method: %s", ma_method)
+            return None
+
+        symbol = bar.get("symbol")
+        close = bar.get("Close")
+        if symbol is None or close is None:
+            logger.error("Bar is missing 'symbol' or 'Close'.")
+            return None
+
+        if ma_method == "vwap" and "Volume" not in bar:
+            logger.error("VWAP method requires a 'Volume' field.")
+            return None
+
+        store = get_history_store() if store is None else store
+        length, prices, volumes = store.append_history(
+            symbol, float(close), float(bar.get("Volume", np.nan))
+        )
+        window_size = min(window_size, length)
+
+        value = moving_average(
+            prices, window_size, ma_method, volume=volumes if ma_method == "vwap" else None
+        )[-1]
+        column_name = f"{ma_method.upper()}_{window_size}"
+
+        return {
+            "symbol": symbol,
+            "analysis_type": "movavg",
+            "method": ma_method,
+            "window": window_size,
+            "result": {**bar, column_name: float(value)},
+        }
+
+    except Exception:
+        logger.exception("Unhandled error while processing bar")
+        return None
+
+
+def process_message_batch(
+    messages: list[dict],
+    specs: list[MovingAverageSpec] | None = None,
+    store: PriceHistoryStore | None = None,
+) -> list[dict]:
+    """Compute the configured moving averages for a whole batch of bar messages at once.
+
+    The batch is turned into one columnar frame and grouped by symbol. Each
+    symbol's bars are appended to the history store in arrival order, and every
+    indicator is computed in a single panel pass over the touched symbols.
+    Windows are fixed, so an indicator is None until a symbol has enough
+    history.
+
+    Args:
+        messages (list[dict]): Bars with 'symbol', 'Close' and optionally 'Volume'.
+        specs (list[MovingAverageSpec] | None): ``(method, window)`` pairs
+            (default: MOVING_AVERAGES).
+        store (PriceHistoryStore | None): History store (default: the shared store).
+
+    Returns:
+        list[dict]: One output payload per valid bar, in input order.
+
+    """
+    specs = list(dict.fromkeys(specs or config_shared.get_moving_average_specs()))
+    store = get_history_store() if store is None else store
+
+    frame = pd.DataFrame.from_records(messages) if messages else pd.DataFrame()
+    if frame.empty or "symbol" not in frame.columns or "Close" not in frame.columns:
+        if messages:
+            logger.warning("Dropped batch of %d messages without 'symbol'/'Close'", len(messages))
+        return []
+
+    close = pd.to_numeric(frame["Close"], errors="coerce")
+    valid = frame["symbol"].notna() & close.notna()
+    if not valid.all():
+        logger.warning("Dropped %d invalid messages from batch", int((~valid).sum()))
+    frame = frame[valid]
+    if frame.empty:
+        return []
+    close = close[valid].to_numpy(dtype=np.float64)
+    volume = (
+        pd.to_numeric(frame["Volume"], errors="coerce").to_numpy(dtype=np.float64)
+        if "Volume" in frame.columns
+        else np.full(len(frame), np.nan)
+    )
+
+    groups = frame.groupby("symbol", sort=False).indices
+    # Appended and read under one lock, so concurrent batches cannot interleave bars
+    prices, volumes = store.extend_panel(
+        {symbol: (close[rows], volume[rows]) for symbol, rows in groups.items()}
+    )
+    symbols = list(groups)
+    values = moving_averages(prices, specs, volume=volumes)
+
+    # Bars sit at the bottom of their symbol's column, newest last
+    by_symbol = frame.groupby("symbol", sort=False)
+    columns = pd.Index(symbols).get_indexer(frame["symbol"])
+    rows = store.max_depth - by_symbol["symbol"].transform("size").to_numpy()
+    rows = rows + by_symbol.cumcount().to_numpy()
+    bar_values = np.where((rows >= 0)[:, None], values[rows.clip(min=0), columns], np.nan)
+
+    names = [f"{method.upper()}_{window}" for method, window in specs]
+    records = [message for message, ok in zip(messages, valid.tolist(), strict=True) if ok]
+    return [
+        {
+            "symbol": record["symbol"],
+            "analysis_type": "movavg",
+            "indicators": names,
+            "result": {
+                **record,
+                **{
+                    name: None if value != value else value
+                    for name, value in zip(names, row, strict=True)
+                },
+            },
+        }
+        for record, row in zip(records, bar_values.tolist(), strict=True)
+    ]
+
+
+def process_batch_with_metrics(
+    messages: list[dict],
+    specs: list[MovingAverageSpec] | None = None,
+    store: PriceHistoryStore | None = None,
+) -> list[dict]:
+    """Run `process_message_batch` and record its processing metrics.
+
+    Args:
+        messages (list[dict]): Decoded queue messages.
+        specs (list[MovingAverageSpec] | None): ``(method, window)`` pairs
+            (default: MOVING_AVERAGES).
+        store (PriceHistoryStore | None): History store (default: the shared store).
+
+    Returns:
+        list[dict]: One output payload per valid bar.
+
+    """
+    start = time.perf_counter()
+    try:
+        outputs = process_message_batch(messages, specs, store)
+    except Exception:
+        record_processing_metrics("movavg", False, time.perf_counter() - start)
+        raise
+    record_processing_metrics("movavg", True, time.perf_counter() - start)
+    logger.debug("Processed %d messages into %d outputs", len(messages), len(outputs))
+    return outputs
+
+
+def create_batch_handler(
+    send: Callable[[list[dict]], None],
+    specs: list[MovingAverageSpec] | None = None,
+    store: PriceHistoryStore | None = None,
+) -> Callable[[list[dict]], None]:
+    """Build the consumer callback that processes a message batch and emits one output batch.
+
+    Args:
+        send (Callable[[list[dict]], None]): Output sink, e.g. `OutputDispatcher.send`.
+        specs (list[MovingAverageSpec] | None): ``(method, window)`` pairs
+            (default: MOVING_AVERAGES).
+        store (PriceHistoryStore | None): History store (default: the shared store).
+
+    Returns:
+        Callable[[list[dict]], None]: Callback for `consume_messages`.
+
+    """
+
+    def handle_batch(messages: list[dict]) -> None:
+        outputs = process_batch_with_metrics(messages, specs, store)
+        if outputs:
+            send(outputs)
+
+    return handle_batch
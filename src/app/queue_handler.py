@@ -2,24 +2,26 @@
 
 This module supports consuming messages from either RabbitMQ or Amazon SQS.
 It provides batching, retry logic, graceful shutdown handling, and clean logging
-with optional redaction of sensitive values.
+with optional redaction of sensitive values. pika and boto3 are imported by
+the listener that uses them, so only the configured backend is loaded.
 """
 
 import json
+import queue
 import signal
 import threading
 import time
 from collections.abc import Callable
+from typing import TYPE_CHECKING
 
-import boto3
-import pika
-from botocore.exceptions import BotoCoreError, NoCredentialsError
-from pika.adapters.blocking_connection import BlockingChannel
 from tenacity import retry, stop_after_attempt, wait_exponential
 
 import app.config_shared as config
 from app.utils.setup_logger import setup_logger
 
+if TYPE_CHECKING:
+    from pika.adapters.blocking_connection import BlockingChannel
+
 logger = setup_logger(__name__)
 shutdown_event = threading.Event()
 
@@ -86,6 +88,8 @@ def _start_rabbitmq_listener(callback: Callable[[list[dict]], None]) -> None:
         callback (Callable[[list[dict]], None]): Handler function for batches of messages.
 
     """
+    import pika
+
     connection = pika.BlockingConnection(
         pika.ConnectionParameters(
             host=config.get_rabbitmq_host(),
@@ -100,9 +104,33 @@ def _start_rabbitmq_listener(callback: Callable[[list[dict]], None]) -> None:
     queue_name = config.get_rabbitmq_queue()
     channel.queue_declare(queue=queue_name, durable=True)
 
-    def on_message(ch: BlockingChannel, method, properties, body: bytes) -> None:
+    batch_size = config.get_batch_size()
+    linger = config.get_batch_linger_ms() / 1000
+    requeue = config.get_rabbitmq_requeue_on_failure()
+    pending: list[dict] = []
+    last_delivery_tag = 0
+    batch_started = 0.0
+
+    def flush() -> None:
+        """Process the pending batch and settle all of its deliveries at once."""
+        if not pending:
+            return
+        messages = pending.copy()
+        pending.clear()
+        try:
+            callback(messages)
+            channel.basic_ack(delivery_tag=last_delivery_tag, multiple=True)
+            logger.debug("✅ RabbitMQ: Processed and acknowledged %d message(s)", len(messages))
+        except Exception:
+            logger.error("❌ RabbitMQ batch processing failed (details redacted)")
+            channel.basic_nack(delivery_tag=last_delivery_tag, multiple=True, requeue=requeue)
+
+    def on_message(ch: "BlockingChannel", method, properties, body: bytes) -> None:
         """Callback invoked for each incoming RabbitMQ message.
 
+        Deliveries are collected into a batch that is processed once it
+        reaches `BATCH_SIZE` messages or has waited `BATCH_LINGER_MS`.
+
         Args:
             ch (BlockingChannel): The channel object.
             method: Delivery method.
@@ -110,44 +138,252 @@ def _start_rabbitmq_listener(callback: Callable[[list[dict]], None]) -> None:
             body (bytes): Raw message body.
 
         """
-        if shutdown_event.is_set():
-            ch.stop_consuming()
-            return
-
+        nonlocal last_delivery_tag, batch_started
         try:
             message = json.loads(body)
-            callback([message])
-            ch.basic_ack(delivery_tag=method.delivery_tag)
-            logger.debug("✅ RabbitMQ message processed and acknowledged.")
         except Exception:
-            logger.error("❌ RabbitMQ message processing failed (details redacted)")
+            logger.warning("⚠️ Failed to parse RabbitMQ message body (redacted)")
             ch.basic_nack(delivery_tag=method.delivery_tag, requeue=False)
+            return
+
+        if not pending:
+            batch_started = time.monotonic()
+        pending.append(message)
+        last_delivery_tag = method.delivery_tag
+        if len(pending) >= batch_size:
+            flush()
 
     logger.info(safe_log("🚀 Consuming RabbitMQ messages from queue"))
 
     try:
-        channel.basic_qos(prefetch_count=config.get_batch_size())
+        channel.basic_qos(prefetch_count=batch_size)
         channel.basic_consume(queue=queue_name, on_message_callback=on_message, auto_ack=False)
 
         while not shutdown_event.is_set():
-            connection.process_data_events(time_limit=1)
+            wait = linger - (time.monotonic() - batch_started) if pending else 1
+            connection.process_data_events(time_limit=max(wait, 0))
+            if pending and time.monotonic() - batch_started >= linger:
+                flush()
+
+        # Deliveries already received are processed rather than left for redelivery
+        flush()
     finally:
         connection.close()
         logger.info("🛑 RabbitMQ listener stopped.")
 
 
+# SQS accepts at most 10 entries per batch request
+SQS_MAX_BATCH_ENTRIES = 10
+
+
+def _sqs_batch_entries(receipt_handles: list[str], **fields) -> list[list[dict]]:
+    """Split receipt handles into SQS batch request entries of at most 10 each."""
+    entries = [
+        {"Id": str(index), "ReceiptHandle": handle, **fields}
+        for index, handle in enumerate(receipt_handles)
+    ]
+    return [
+        entries[i : i + SQS_MAX_BATCH_ENTRIES]
+        for i in range(0, len(entries), SQS_MAX_BATCH_ENTRIES)
+    ]
+
+
+def _delete_sqs_messages(sqs, queue_url: str, receipt_handles: list[str]) -> None:
+    """Delete processed SQS messages with `delete_message_batch`.
+
+    Entries that fail on the service side are retried once; entries that still
+    fail (or fail due to the request itself) are logged and left to become
+    visible again.
+
+    Args:
+        sqs: boto3 SQS client.
+        queue_url (str): Queue URL.
+        receipt_handles (list[str]): Receipt handles of the processed messages.
+
+    """
+    for entries in _sqs_batch_entries(receipt_handles):
+        response = sqs.delete_message_batch(QueueUrl=queue_url, Entries=entries)
+        failed = response.get("Failed", [])
+        retryable = {f["Id"] for f in failed if not f.get("SenderFault")}
+        if retryable:
+            retry_entries = [entry for entry in entries if entry["Id"] in retryable]
+            response = sqs.delete_message_batch(QueueUrl=queue_url, Entries=retry_entries)
+            failed = [f for f in failed if f["Id"] not in retryable] + response.get("Failed", [])
+        for failure in failed:
+            logger.warning("⚠️ SQS: Failed to delete message (code: %s)", failure.get("Code"))
+
+
+class _VisibilityHeartbeat:
+    """Background thread that keeps a batch of SQS messages invisible while it is processed.
+
+    Every half `timeout` it calls `change_message_visibility_batch` to push the
+    visibility timeout of the batch out by another `timeout` seconds, so slow
+    batches are not redelivered to another consumer mid-processing.
+    """
+
+    def __init__(self, sqs, queue_url: str, receipt_handles: list[str], timeout: int) -> None:
+        """Prepare a heartbeat for the given messages.
+
+        Args:
+            sqs: boto3 SQS client.
+            queue_url (str): Queue URL.
+            receipt_handles (list[str]): Receipt handles of the batch.
+            timeout (int): Visibility timeout in seconds.
+
+        """
+        self.sqs = sqs
+        self.queue_url = queue_url
+        self.receipt_handles = receipt_handles
+        self.timeout = timeout
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="sqs-visibility", daemon=True)
+
+    def __enter__(self) -> "_VisibilityHeartbeat":
+        """Start extending visibility in the background."""
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        """Stop the heartbeat."""
+        self.stop()
+
+    def start(self) -> "_VisibilityHeartbeat":
+        """Start extending visibility in the background."""
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the heartbeat and wait for an in-progress extension to finish."""
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        """Extend visibility every half timeout until stopped."""
+        from botocore.exceptions import BotoCoreError, ClientError, NoCredentialsError
+
+        while not self._stop.wait(self.timeout / 2):
+            try:
+                self._extend()
+            except (BotoCoreError, NoCredentialsError):
+                logger.warning("⚠️ SQS: Visibility heartbeat failed (details redacted)")
+            except ClientError as e:
+                # Expired receipt handles or throttling: the extension is lost for this batch
+                logger.warning(
+                    "⚠️ SQS: Visibility heartbeat stopped (code: %s)",
+                    e.response.get("Error", {}).get("Code"),
+                )
+                return
+
+    def _extend(self) -> None:
+        """Push the visibility timeout of every message in the batch out by `timeout`."""
+        for entries in _sqs_batch_entries(self.receipt_handles, VisibilityTimeout=self.timeout):
+            response = self.sqs.change_message_visibility_batch(
+                QueueUrl=self.queue_url, Entries=entries
+            )
+            for failure in response.get("Failed", []):
+                logger.warning(
+                    "⚠️ SQS: Failed to extend message visibility (code: %s)", failure.get("Code")
+                )
+        logger.debug("⏳ SQS: Extended visibility of %d message(s)", len(self.receipt_handles))
+
+
 @retry(stop=stop_after_attempt(5), wait=wait_exponential(multiplier=1, min=2, max=10))
 def _start_sqs_listener(callback: Callable[[list[dict]], None]) -> None:
-    """Connect to AWS SQS and start polling messages.
+    """Connect to AWS SQS and consume messages with concurrent pollers and workers.
+
+    `SQS_POLLERS` receive loops feed a bounded queue of batches that
+    `WORKER_COUNT` workers drain. When `WORK_QUEUE_SIZE` batches are waiting,
+    pollers block instead of receiving more (backpressure). On shutdown the
+    pollers stop receiving and the workers finish every batch already
+    received before returning. Batches may complete out of order when more
+    than one worker is configured.
 
     Args:
         callback (Callable[[list[dict]], None]): Handler function for a batch of messages.
 
     """
+    import boto3
+
     sqs = boto3.client("sqs", region_name=config.get_sqs_region())
     queue_url = config.get_sqs_queue_url()
+    work: queue.Queue = queue.Queue(maxsize=config.get_work_queue_size())
+
+    workers = [
+        threading.Thread(
+            target=_process_sqs_batches,
+            args=(sqs, queue_url, work, callback),
+            name=f"sqs-worker-{i}",
+        )
+        for i in range(config.get_worker_count())
+    ]
+    pollers = [
+        threading.Thread(
+            target=_poll_sqs, args=(sqs, queue_url, work, workers), name=f"sqs-poller-{i}"
+        )
+        for i in range(config.get_sqs_poller_count())
+    ]
+
+    logger.info(
+        safe_log(f"🚀 Polling SQS queue with {len(pollers)} poller(s), {len(workers)} worker(s)")
+    )
+    for thread in pollers + workers:
+        thread.start()
 
-    logger.info(safe_log("🚀 Polling SQS queue"))
+    _join_all(pollers)
+    # Pollers are done, so every received batch is queued ahead of the stop sentinels
+    for _ in workers:
+        _put_work(work, None, workers)
+    _join_all(workers)
+
+    logger.info("🛑 SQS polling stopped.")
+
+
+def _join_all(threads: list[threading.Thread]) -> None:
+    """Wait for threads in short slices so the main thread keeps handling signals."""
+    for thread in threads:
+        while thread.is_alive():
+            thread.join(timeout=1)
+
+
+def _put_work(work: queue.Queue, item, workers: list[threading.Thread]) -> bool:
+    """Put an item on the work queue, waiting while it is full.
+
+    The wait is given up once shutdown has been requested and no worker is
+    left to drain the queue, so a poller never blocks forever.
+
+    Args:
+        work (queue.Queue): Bounded work queue.
+        item: Batch or stop sentinel to queue.
+        workers (list[threading.Thread]): Worker threads draining the queue.
+
+    Returns:
+        bool: True if the item was queued.
+
+    """
+    while True:
+        try:
+            work.put(item, timeout=1)
+            return True
+        except queue.Full:
+            if shutdown_event.is_set() and not any(worker.is_alive() for worker in workers):
+                return False
+
+
+def _poll_sqs(sqs, queue_url: str, work: queue.Queue, workers: list[threading.Thread]) -> None:
+    """Receive SQS batches and queue them for the workers until shutdown.
+
+    Each received batch gets a visibility heartbeat right away, so messages
+    waiting in the work queue are not redelivered either.
+
+    Args:
+        sqs: boto3 SQS client.
+        queue_url (str): Queue URL.
+        work (queue.Queue): Bounded queue of ``(payloads, receipt_handles, heartbeat)``.
+        workers (list[threading.Thread]): Worker threads draining `work`.
+
+    """
+    from botocore.exceptions import BotoCoreError, ClientError, NoCredentialsError
+
+    visibility_timeout = config.get_sqs_visibility_timeout()
 
     while not shutdown_event.is_set():
         try:
@@ -155,30 +391,60 @@ def _start_sqs_listener(callback: Callable[[list[dict]], None]) -> None:
                 QueueUrl=queue_url,
                 MaxNumberOfMessages=config.get_batch_size(),
                 WaitTimeSeconds=10,
+                VisibilityTimeout=visibility_timeout,
             )
-            messages = response.get("Messages", [])
-            if not messages:
-                continue
-
-            payloads = []
-            receipt_handles = []
-
-            for msg in messages:
-                try:
-                    payload = json.loads(msg["Body"])
-                    payloads.append(payload)
-                    receipt_handles.append(msg["ReceiptHandle"])
-                except Exception:
-                    logger.warning("⚠️ Failed to parse SQS message body (redacted)")
-
-            if payloads:
-                callback(payloads)
-                for handle in receipt_handles:
-                    sqs.delete_message(QueueUrl=queue_url, ReceiptHandle=handle)
-                logger.debug("✅ SQS: Processed and deleted %d message(s)", len(payloads))
-
-        except (BotoCoreError, NoCredentialsError):
+        except (BotoCoreError, ClientError, NoCredentialsError):
             logger.error("❌ SQS error encountered (details redacted)")
-            time.sleep(5)
+            shutdown_event.wait(5)
+            continue
 
-    logger.info("🛑 SQS polling stopped.")
+        payloads = []
+        receipt_handles = []
+
+        for msg in response.get("Messages", []):
+            try:
+                payload = json.loads(msg["Body"])
+                payloads.append(payload)
+                receipt_handles.append(msg["ReceiptHandle"])
+            except Exception:
+                logger.warning("⚠️ Failed to parse SQS message body (redacted)")
+
+        if payloads:
+            heartbeat = _VisibilityHeartbeat(sqs, queue_url, receipt_handles, visibility_timeout)
+            # Blocks while the work queue is full, which pauses receiving
+            if not _put_work(work, (payloads, receipt_handles, heartbeat.start()), workers):
+                heartbeat.stop()
+                logger.warning("⚠️ SQS: %d message(s) left for redelivery", len(payloads))
+
+
+def _process_sqs_batches(
+    sqs, queue_url: str, work: queue.Queue, callback: Callable[[list[dict]], None]
+) -> None:
+    """Process queued SQS batches and delete them until a stop sentinel arrives.
+
+    A batch whose callback fails is not deleted; its messages become visible
+    again once the visibility timeout lapses.
+
+    Args:
+        sqs: boto3 SQS client.
+        queue_url (str): Queue URL.
+        work (queue.Queue): Queue of received batches, terminated by None.
+        callback (Callable[[list[dict]], None]): Handler function for a batch of messages.
+
+    """
+    while (item := work.get()) is not None:
+        payloads, receipt_handles, heartbeat = item
+        try:
+            callback(payloads)
+        except Exception:
+            logger.error("❌ SQS batch processing failed (details redacted)")
+            continue
+        finally:
+            heartbeat.stop()
+
+        try:
+            _delete_sqs_messages(sqs, queue_url, receipt_handles)
+            logger.debug("✅ SQS: Processed and deleted %d message(s)", len(payloads))
+        except Exception:
+            # Includes botocore ClientError; the messages become visible again
+            logger.error("❌ SQS delete failed (details redacted)")
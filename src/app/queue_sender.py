@@ -2,29 +2,50 @@
 
 Handles publishing of processed data to the appropriate messaging queue,
 with retry logic, structured logging, redaction, and Prometheus metrics.
+pika and boto3 are imported by the code paths that use them, so only the
+configured backend is loaded.
 """
 
 import json
+import threading
 import time
-from typing import Any
+from collections import OrderedDict, deque
+from collections.abc import Iterator
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any
 
-import boto3
-import pika
-from botocore.exceptions import BotoCoreError, NoCredentialsError
-from pika.exceptions import AMQPConnectionError
-from tenacity import retry, stop_after_attempt, wait_exponential
+from tenacity import Retrying, retry_if_exception_type, stop_after_attempt, wait_exponential
 
 from app import config_shared
-from app.utils.metrics import queue_publish_counter, queue_publish_latency
+from app.utils.metrics import (
+    queue_publish_batch_size,
+    queue_publish_confirm_latency,
+    queue_publish_counter,
+    queue_publish_latency,
+)
 from app.utils.safe_logger import safe_error, safe_info
+from app.utils.vault_client import on_config_change
+
+if TYPE_CHECKING:
+    import pika
+    from pika.adapters.blocking_connection import BlockingChannel
+
+# Publishes of a message that RabbitMQ may nack before the batch fails
+RABBITMQ_PUBLISH_ATTEMPTS = 3
 
 REDACT_SENSITIVE_LOGS: bool = (
     config_shared.get_config_value_cached("REDACT_SENSITIVE_LOGS", "true").lower() == "true"
 )
 
 
+class RabbitMQPublishError(Exception):
+    """Raised when RabbitMQ does not confirm every message in confirm mode."""
+
+    pass
+
+
 class SQSMessageSendError(Exception):
-    """Raised when SQS returns a non-200 HTTP status."""
+    """Raised when SQS returns a non-200 HTTP status or does not accept every message."""
 
     pass
 
@@ -61,28 +82,310 @@ def publish_to_queue(
 
     queue_type: str = config_shared.get_queue_type().lower()
 
-    for message in payload:
-        if queue_type == "rabbitmq":
-            _send_to_rabbitmq(message, queue, exchange)
-        elif queue_type == "sqs":
-            _send_to_sqs(message, queue)
-        else:
-            safe_error(
-                "Invalid QUEUE_TYPE",
-                {"queue_type": "[REDACTED]" if REDACT_SENSITIVE_LOGS else queue_type},
+    if queue_type == "rabbitmq":
+        _send_to_rabbitmq(payload, queue, exchange)
+        return
+
+    if queue_type == "sqs":
+        _send_to_sqs(payload, queue)
+        return
+
+    safe_error(
+        "Invalid QUEUE_TYPE",
+        {"queue_type": "[REDACTED]" if REDACT_SENSITIVE_LOGS else queue_type},
+    )
+
+
+class RabbitMQPublisher:
+    """Long-lived RabbitMQ publisher that reuses one connection and channel.
+
+    The connection is opened on first use and kept for later publishes. A
+    lost connection or closed channel is reopened, and publishing resumes with
+    the first message that was not sent. Access is serialized with a lock,
+    because pika's `BlockingConnection` is not thread-safe.
+
+    With a positive `confirm_window`, the channel is put in publisher-confirm
+    mode. Up to `confirm_window` publishes are kept in flight, keyed by
+    delivery tag, while the broker's acks arrive. Nacked messages are
+    published again, and `publish` returns once every message is confirmed.
+    """
+
+    def __init__(
+        self, confirm_window: int | None = None, confirm_timeout: float | None = None
+    ) -> None:
+        """Initialize a publisher without connecting.
+
+        Args:
+            confirm_window (int | None): Unconfirmed publishes allowed in flight;
+                0 disables confirms (default: RABBITMQ_CONFIRM_WINDOW).
+            confirm_timeout (float | None): Seconds to wait for a confirm before
+                failing (default: RABBITMQ_CONFIRM_TIMEOUT).
+
+        """
+        self._connection: pika.BlockingConnection | None = None
+        self._channel: BlockingChannel | None = None
+        self._lock = threading.Lock()
+        self._confirm_window = confirm_window
+        self._confirm_timeout = confirm_timeout
+        # Publisher-confirm state of the current channel
+        self._delivery_tag = 0
+        self._in_flight: OrderedDict[int, tuple[int, float]] = OrderedDict()
+        self._nacked: list[int] = []
+
+    @property
+    def confirm_window(self) -> int:
+        """Maximum number of publishes awaiting a confirm (0 when confirms are off)."""
+        if self._confirm_window is None:
+            self._confirm_window = config_shared.get_rabbitmq_confirm_window()
+        return self._confirm_window
+
+    def publish(self, messages: list[dict[str, Any]], exchange: str, routing_key: str) -> None:
+        """Publish a batch of messages over the shared channel.
+
+        Connection and channel failures trigger a reconnect, retried up to three
+        times with exponential backoff. Messages already published are not
+        sent again, except unconfirmed ones in confirm mode.
+
+        Args:
+            messages (list[dict[str, Any]]): Message payloads.
+            exchange (str): Exchange to publish to.
+            routing_key (str): Routing key for every message.
+
+        Raises:
+            AMQPConnectionError: If the broker stays unreachable.
+            AMQPChannelError: If the channel keeps failing.
+            RabbitMQPublishError: If messages are still nacked or unconfirmed
+                after retrying (confirm mode only).
+
+        """
+        from pika.exceptions import AMQPChannelError, AMQPConnectionError
+
+        bodies = [json.dumps(message, ensure_ascii=False) for message in messages]
+        pending = deque(range(len(bodies)))
+        with self._lock:
+            for attempt in Retrying(
+                stop=stop_after_attempt(3),
+                wait=wait_exponential(min=2, max=10),
+                retry=retry_if_exception_type((AMQPConnectionError, AMQPChannelError)),
+                reraise=True,
+            ):
+                with attempt:
+                    try:
+                        channel = self._get_channel()
+                        if self.confirm_window > 0:
+                            self._publish_confirmed(channel, bodies, pending, exchange, routing_key)
+                        while pending:
+                            channel.basic_publish(
+                                exchange=exchange, routing_key=routing_key, body=bodies[pending[0]]
+                            )
+                            pending.popleft()
+                    except (AMQPConnectionError, AMQPChannelError) as e:
+                        safe_error("RabbitMQ publisher connection lost", {"error": str(e)})
+                        # Unconfirmed publishes may have been lost with the channel
+                        pending.extendleft(reversed(self._unconfirmed()))
+                        self._reset()
+                        raise
+                    except RabbitMQPublishError:
+                        # Late confirms must not be matched against the next batch
+                        self._reset()
+                        raise
+
+    def close(self) -> None:
+        """Close the connection if it is open."""
+        with self._lock:
+            self._reset()
+
+    def _publish_confirmed(
+        self,
+        channel: "BlockingChannel",
+        bodies: list[str],
+        pending: deque[int],
+        exchange: str,
+        routing_key: str,
+    ) -> None:
+        """Publish with a window of in-flight confirms. Caller holds the lock.
+
+        Publishing goes through the channel's asynchronous implementation (see
+        `_channel_impl`), since `BlockingChannel` only supports one synchronous
+        confirm per publish.
+
+        Args:
+            channel (BlockingChannel): Channel in confirm mode.
+            bodies (list[str]): Serialized message bodies.
+            pending (deque[int]): Indexes of the bodies still to publish.
+            exchange (str): Exchange to publish to.
+            routing_key (str): Routing key for every message.
+
+        Raises:
+            RabbitMQPublishError: If a message is nacked three times or no confirm
+                arrives within the confirm timeout.
+
+        """
+        if self._confirm_timeout is None:
+            self._confirm_timeout = config_shared.get_rabbitmq_confirm_timeout()
+        nacks: dict[int, int] = {}
+        last_progress = time.perf_counter()
+
+        while pending or self._in_flight:
+            while pending and len(self._in_flight) < self.confirm_window:
+                index = pending[0]
+                _channel_impl(channel).basic_publish(exchange, routing_key, bodies[index])
+                pending.popleft()
+                self._delivery_tag += 1
+                self._in_flight[self._delivery_tag] = (index, time.perf_counter())
+
+            outstanding = len(self._in_flight)
+            self._connection.process_data_events(time_limit=0.1)
+            if len(self._in_flight) < outstanding:
+                last_progress = time.perf_counter()
+            elif time.perf_counter() - last_progress > self._confirm_timeout:
+                raise RabbitMQPublishError(
+                    f"No publisher confirm within {self._confirm_timeout}s "
+                    f"for {len(self._in_flight)} message(s)"
+                )
+
+            for index in self._nacked:
+                nacks[index] = nacks.get(index, 0) + 1
+                if nacks[index] >= RABBITMQ_PUBLISH_ATTEMPTS:
+                    raise RabbitMQPublishError(
+                        f"RabbitMQ nacked a message {RABBITMQ_PUBLISH_ATTEMPTS} times"
+                    )
+                pending.append(index)
+            self._nacked.clear()
+
+    def _unconfirmed(self) -> list[int]:
+        """Return the indexes of nacked or in-flight bodies, in order. Caller holds the lock."""
+        return sorted(self._nacked + [index for index, _ in self._in_flight.values()])
+
+    def _on_confirm(self, frame: "pika.frame.Method") -> None:
+        """Settle the delivery tags covered by a Basic.Ack or Basic.Nack frame."""
+        import pika
+
+        method = frame.method
+        acked = isinstance(method, pika.spec.Basic.Ack)
+        status = "confirmed" if acked else "nacked"
+        now = time.perf_counter()
+        tags = [method.delivery_tag] if method.delivery_tag in self._in_flight else []
+        if method.multiple:
+            tags = [tag for tag in self._in_flight if tag <= method.delivery_tag]
+        for tag in tags:
+            index, sent_at = self._in_flight.pop(tag)
+            queue_publish_confirm_latency.labels(queue_type="rabbitmq", status=status).observe(
+                now - sent_at
+            )
+            if not acked:
+                self._nacked.append(index)
+
+    def _get_channel(self) -> "BlockingChannel":
+        """Return the open channel, connecting first if needed. Caller holds the lock."""
+        import pika
+
+        if self._channel is not None and self._channel.is_open:
+            # BlockingConnection only answers heartbeats while processing events; this
+            # also surfaces a connection the broker dropped while the publisher was idle
+            self._connection.process_data_events(time_limit=0)
+            return self._channel
+
+        if self._connection is None or not self._connection.is_open:
+            credentials = pika.PlainCredentials(
+                config_shared.get_rabbitmq_user(),
+                config_shared.get_rabbitmq_password(),
             )
+            parameters = pika.ConnectionParameters(
+                host=config_shared.get_rabbitmq_host(),
+                port=config_shared.get_rabbitmq_port(),
+                virtual_host=config_shared.get_rabbitmq_vhost(),
+                credentials=credentials,
+                blocked_connection_timeout=30,
+            )
+            self._connection = pika.BlockingConnection(parameters)
+            safe_info("Opened RabbitMQ publisher connection")
+
+        self._channel = self._connection.channel()
+        self._delivery_tag = 0
+        self._in_flight.clear()
+        self._nacked.clear()
+        if self.confirm_window > 0:
+            self._select_confirms(self._channel)
+        return self._channel
+
+    def _select_confirms(self, channel: "BlockingChannel") -> None:
+        """Put a new channel in publisher-confirm mode. Caller holds the lock.
+
+        Raises:
+            RabbitMQPublishError: If the broker does not answer within the confirm timeout.
+
+        """
+        if self._confirm_timeout is None:
+            self._confirm_timeout = config_shared.get_rabbitmq_confirm_timeout()
+        selected: list[pika.frame.Method] = []
+        _channel_impl(channel).confirm_delivery(self._on_confirm, callback=selected.append)
+        deadline = time.perf_counter() + self._confirm_timeout
+        while not selected:
+            if time.perf_counter() > deadline:
+                raise RabbitMQPublishError(
+                    f"No Confirm.SelectOk from RabbitMQ within {self._confirm_timeout}s"
+                )
+            self._connection.process_data_events(time_limit=0.1)
+
+    def _reset(self) -> None:
+        """Drop the connection and channel, closing them if possible. Caller holds the lock."""
+        connection, self._connection, self._channel = self._connection, None, None
+        self._in_flight.clear()
+        self._nacked.clear()
+        if connection is not None and connection.is_open:
+            try:
+                connection.close()
+            except Exception:
+                pass
+
+
+def _channel_impl(channel: "BlockingChannel") -> "pika.channel.Channel":
+    """Return the asynchronous channel wrapped by a `BlockingChannel`.
+
+    pika has no public API for windowed publisher confirms on a blocking
+    connection, so confirm mode uses the wrapped channel directly.
+
+    Raises:
+        RabbitMQPublishError: If the installed pika no longer exposes it.
+
+    """
+    impl = getattr(channel, "_impl", None)
+    if impl is None:
+        raise RabbitMQPublishError("Publisher confirms are not supported by this pika version")
+    return impl
+
+
+rabbitmq_publisher = RabbitMQPublisher()
+
+# Connection settings; the publisher reconnects only when one of these changes in Vault
+RABBITMQ_CONNECTION_KEYS = (
+    "RABBITMQ_HOST",
+    "RABBITMQ_PORT",
+    "RABBITMQ_VHOST",
+    "RABBITMQ_USER",
+    "RABBITMQ_PASS",
+)
+
+
+def _reconnect_rabbitmq(changed: frozenset[str]) -> None:
+    """Close the publisher connection so the next publish uses the new credentials."""
+    safe_info("🔄 RabbitMQ connection settings changed; reconnecting on next publish.")
+    rabbitmq_publisher.close()
+
+
+on_config_change(RABBITMQ_CONNECTION_KEYS, _reconnect_rabbitmq)
 
 
-@retry(stop=stop_after_attempt(3), wait=wait_exponential(min=2, max=10))
 def _send_to_rabbitmq(
-    data: dict[str, Any],
+    messages: list[dict[str, Any]],
     routing_key: str | None = None,
     exchange: str | None = None,
 ) -> None:
-    """Send a single message to RabbitMQ.
+    """Send a batch of messages to RabbitMQ over the shared publisher.
 
     Args:
-        data (dict[str, Any]): The message payload.
+        messages (list[dict[str, Any]]): Message payloads.
         routing_key (Optional[str]): Optional routing key override.
         exchange (Optional[str]): Optional exchange override.
 
@@ -91,52 +394,37 @@ def _send_to_rabbitmq(
         Exception: On publish failure.
 
     """
+    from pika.exceptions import AMQPConnectionError
+
     start: float = time.perf_counter()
     try:
-        credentials = pika.PlainCredentials(
-            config_shared.get_rabbitmq_user(),
-            config_shared.get_rabbitmq_password(),
-        )
-        parameters = pika.ConnectionParameters(
-            host=config_shared.get_rabbitmq_host(),
-            port=config_shared.get_rabbitmq_port(),
-            virtual_host=config_shared.get_rabbitmq_vhost(),
-            credentials=credentials,
-            blocked_connection_timeout=30,
-        )
-
-        with pika.BlockingConnection(parameters) as connection:
-            channel = connection.channel()
-            resolved_exchange: str = exchange or config_shared.get_rabbitmq_exchange()
-            resolved_routing_key: str = routing_key or config_shared.get_rabbitmq_routing_key()
-            channel.basic_publish(
-                exchange=resolved_exchange,
-                routing_key=resolved_routing_key,
-                body=json.dumps(data, ensure_ascii=False),
-            )
+        resolved_exchange: str = exchange or config_shared.get_rabbitmq_exchange()
+        resolved_routing_key: str = routing_key or config_shared.get_rabbitmq_routing_key()
+        rabbitmq_publisher.publish(messages, resolved_exchange, resolved_routing_key)
 
         duration: float = time.perf_counter() - start
-        queue_publish_counter.labels(queue_type="rabbitmq", status="success").inc()
+        queue_publish_counter.labels(queue_type="rabbitmq", status="success").inc(len(messages))
         queue_publish_latency.labels(queue_type="rabbitmq", status="success").observe(duration)
+        queue_publish_batch_size.labels(queue_type="rabbitmq").observe(len(messages))
         safe_info(
-            "Published message to RabbitMQ",
+            "Published messages to RabbitMQ",
             {
                 "exchange": resolved_exchange,
                 "routing_key": resolved_routing_key,
                 "duration": duration,
-                "message": data,
+                "count": len(messages),
             },
         )
 
     except AMQPConnectionError as e:
         duration = time.perf_counter() - start
-        queue_publish_counter.labels(queue_type="rabbitmq", status="failure").inc()
+        queue_publish_counter.labels(queue_type="rabbitmq", status="failure").inc(len(messages))
         queue_publish_latency.labels(queue_type="rabbitmq", status="failure").observe(duration)
         safe_error("RabbitMQ publish connection error", {"error": str(e), "duration": duration})
         raise
     except Exception as e:
         duration = time.perf_counter() - start
-        queue_publish_counter.labels(queue_type="rabbitmq", status="exception").inc()
+        queue_publish_counter.labels(queue_type="rabbitmq", status="exception").inc(len(messages))
         queue_publish_latency.labels(queue_type="rabbitmq", status="exception").observe(duration)
         safe_error(
             "Unhandled error during RabbitMQ publish", {"error": str(e), "duration": duration}
@@ -144,71 +432,211 @@ def _send_to_rabbitmq(
         raise
 
 
-@retry(stop=stop_after_attempt(3), wait=wait_exponential(min=2, max=10))
+# SQS limits for one send_message_batch request
+SQS_MAX_BATCH_ENTRIES = 10
+SQS_MAX_BATCH_BYTES = 256 * 1024
+SQS_SEND_ATTEMPTS = 3
+
+
+@lru_cache(maxsize=None)
+def _get_sqs_client(region: str):
+    """Return a boto3 SQS client for a region, created once and reused.
+
+    boto3 clients are thread-safe, so one client per region is shared by
+    every publishing thread.
+
+    Args:
+        region (str): AWS region name.
+
+    Returns:
+        botocore.client.SQS: Cached SQS client.
+
+    """
+    import boto3
+
+    return boto3.client("sqs", region_name=region)
+
+
+def _sqs_batches(bodies: list[str]) -> Iterator[list[dict[str, str]]]:
+    """Split message bodies into send_message_batch entries within the SQS limits.
+
+    Each batch holds at most 10 entries and 256 KB of message bodies. Entry
+    ids are the positions of the bodies in `bodies`.
+
+    Args:
+        bodies (list[str]): Serialized message bodies.
+
+    Yields:
+        list[dict[str, str]]: Entries for one send_message_batch request.
+
+    """
+    batch: list[dict[str, str]] = []
+    batch_bytes = 0
+    for index, body in enumerate(bodies):
+        size = len(body.encode("utf-8"))
+        if batch and (
+            len(batch) == SQS_MAX_BATCH_ENTRIES or batch_bytes + size > SQS_MAX_BATCH_BYTES
+        ):
+            yield batch
+            batch, batch_bytes = [], 0
+        batch.append({"Id": str(index), "MessageBody": body})
+        batch_bytes += size
+    if batch:
+        yield batch
+
+
+def _send_sqs_batch(sqs_client, sqs_url: str, entries: list[dict[str, str]]) -> list[dict]:
+    """Send one batch with send_message_batch, retrying only the failed entries.
+
+    Entries rejected because of the sender (for example an oversized body)
+    are not retried. Other failed entries, and the pending entries of a
+    request that failed with a transport or client error, are resent up to
+    `SQS_SEND_ATTEMPTS - 1` times with exponential backoff. Entries SQS
+    already accepted are never resent.
+
+    Args:
+        sqs_client: boto3 SQS client.
+        sqs_url (str): Queue URL.
+        entries (list[dict[str, str]]): Batch request entries.
+
+    Returns:
+        list[dict]: Failure records of the entries SQS did not accept.
+
+    Raises:
+        BotoCoreError: If the last attempt fails with a transport error.
+        ClientError: If the last attempt is rejected by SQS.
+        NoCredentialsError: If AWS credentials are not available.
+        SQSMessageSendError: If SQS returns a non-200 HTTP status.
+
+    """
+    from botocore.exceptions import BotoCoreError, ClientError, NoCredentialsError
+
+    pending = {entry["Id"]: entry for entry in entries}
+    rejected: list[dict] = []
+    failed: list[dict] = []
+    for attempt in range(SQS_SEND_ATTEMPTS):
+        if attempt:
+            time.sleep(min(2**attempt, 10))
+        try:
+            response = sqs_client.send_message_batch(
+                QueueUrl=sqs_url, Entries=list(pending.values())
+            )
+        except NoCredentialsError:
+            raise
+        except (BotoCoreError, ClientError) as e:
+            if attempt == SQS_SEND_ATTEMPTS - 1:
+                raise
+            safe_error(
+                "SQS batch request failed, retrying",
+                {"error": str(e), "pending": len(pending), "queue_url": sqs_url},
+            )
+            continue
+        status_code: int = response["ResponseMetadata"]["HTTPStatusCode"]
+        if status_code != 200:
+            raise SQSMessageSendError(f"SQS returned HTTP status {status_code}")
+
+        failed = []
+        for failure in response.get("Failed", []):
+            if failure.get("SenderFault"):
+                pending.pop(failure["Id"], None)
+                rejected.append(failure)
+            else:
+                failed.append(failure)
+        for sent in response.get("Successful", []):
+            pending.pop(sent["Id"], None)
+        if not pending:
+            break
+    return rejected + failed
+
+
 def _send_to_sqs(
-    data: dict[str, Any],
+    messages: list[dict[str, Any]],
     queue_name: str | None = None,
 ) -> None:
-    """Send a single message to AWS SQS.
+    """Send messages to AWS SQS in send_message_batch requests.
+
+    Metrics are recorded per request (latency and batch size) and per message
+    (published count by status). Messages larger than the SQS size limit are
+    rejected before any request is sent, since SQS would refuse them on every
+    attempt.
 
     Args:
-        data (dict[str, Any]): The message payload.
+        messages (list[dict[str, Any]]): Message payloads.
         queue_name (Optional[str]): Optional override for SQS queue URL.
 
     Raises:
         BotoCoreError: On SQS client error.
+        ClientError: If SQS rejects the request.
         NoCredentialsError: If AWS credentials are not available.
-        SQSMessageSendError: If HTTP response code is not 200.
+        SQSMessageSendError: If a message is too large or SQS does not accept
+            every message.
         Exception: On publish failure.
 
     """
-    sqs_url: str = queue_name or config_shared.get_sqs_queue_url()
-    region: str = config_shared.get_sqs_region()
+    from botocore.exceptions import BotoCoreError, ClientError, NoCredentialsError
 
-    start: float = time.perf_counter()
-    try:
-        sqs_client = boto3.client("sqs", region_name=region)
-        response = sqs_client.send_message(
-            QueueUrl=sqs_url,
-            MessageBody=json.dumps(data, ensure_ascii=False),
+    sqs_url: str = queue_name or config_shared.get_sqs_queue_url()
+    sqs_client = _get_sqs_client(config_shared.get_sqs_region())
+    bodies = [json.dumps(message, ensure_ascii=False) for message in messages]
+
+    oversized = [
+        index
+        for index, body in enumerate(bodies)
+        if len(body.encode("utf-8")) > SQS_MAX_BATCH_BYTES
+    ]
+    if oversized:
+        queue_publish_counter.labels(queue_type="sqs", status="failure").inc(len(oversized))
+        safe_error(
+            "Messages exceed the SQS size limit",
+            {"oversized": oversized, "limit": SQS_MAX_BATCH_BYTES, "queue_url": sqs_url},
+        )
+        raise SQSMessageSendError(
+            f"{len(oversized)} message(s) exceed the SQS limit of {SQS_MAX_BATCH_BYTES} bytes"
         )
 
-        status_code: int = response["ResponseMetadata"]["HTTPStatusCode"]
-        duration: float = time.perf_counter() - start
+    for entries in _sqs_batches(bodies):
+        start: float = time.perf_counter()
+        try:
+            failed = _send_sqs_batch(sqs_client, sqs_url, entries)
+        except (BotoCoreError, ClientError, NoCredentialsError, SQSMessageSendError) as e:
+            _record_sqs_batch(len(entries), "failure", time.perf_counter() - start, len(entries))
+            safe_error("SQS client error", {"error": str(e), "queue_url": sqs_url})
+            raise
+        except Exception as e:
+            _record_sqs_batch(len(entries), "exception", time.perf_counter() - start, len(entries))
+            safe_error("Unhandled error during SQS publish", {"error": str(e)})
+            raise
 
-        if status_code != 200:
-            queue_publish_counter.labels(queue_type="sqs", status="failure").inc()
-            queue_publish_latency.labels(queue_type="sqs", status="failure").observe(duration)
+        duration: float = time.perf_counter() - start
+        status = "failure" if failed else "success"
+        _record_sqs_batch(len(entries), status, duration, len(failed))
+        if failed:
+            codes = sorted({failure.get("Code", "") for failure in failed})
             safe_error(
-                "Failed to publish message to SQS",
-                {
-                    "http_status": status_code,
-                    "duration": duration,
-                    "queue_url": sqs_url,
-                },
+                "Failed to publish messages to SQS",
+                {"failed": len(failed), "codes": codes, "duration": duration, "queue_url": sqs_url},
             )
-            raise SQSMessageSendError(f"SQS returned HTTP status {status_code}")
+            raise SQSMessageSendError(f"SQS did not accept {len(failed)} message(s): {codes}")
 
-        queue_publish_counter.labels(queue_type="sqs", status="success").inc()
-        queue_publish_latency.labels(queue_type="sqs", status="success").observe(duration)
         safe_info(
-            "Published message to SQS",
-            {
-                "queue_url": sqs_url,
-                "duration": duration,
-                "message": data,
-            },
+            "Published message batch to SQS",
+            {"queue_url": sqs_url, "duration": duration, "count": len(entries)},
         )
 
-    except (BotoCoreError, NoCredentialsError) as e:
-        duration = time.perf_counter() - start
-        queue_publish_counter.labels(queue_type="sqs", status="failure").inc()
-        queue_publish_latency.labels(queue_type="sqs", status="failure").observe(duration)
-        safe_error("SQS client error", {"error": str(e), "duration": duration})
-        raise
-    except Exception as e:
-        duration = time.perf_counter() - start
-        queue_publish_counter.labels(queue_type="sqs", status="exception").inc()
-        queue_publish_latency.labels(queue_type="sqs", status="exception").observe(duration)
-        safe_error("Unhandled error during SQS publish", {"error": str(e), "duration": duration})
-        raise
+
+def _record_sqs_batch(size: int, status: str, duration: float, failed: int) -> None:
+    """Record the metrics of one send_message_batch request.
+
+    Args:
+        size (int): Messages in the batch.
+        status (str): Batch outcome ("success", "failure" or "exception").
+        duration (float): Time spent sending the batch, retries included.
+        failed (int): Messages SQS did not accept.
+
+    """
+    queue_publish_latency.labels(queue_type="sqs", status=status).observe(duration)
+    queue_publish_batch_size.labels(queue_type="sqs").observe(size)
+    if size > failed:
+        queue_publish_counter.labels(queue_type="sqs", status="success").inc(size - failed)
+    if failed:
+        queue_publish_counter.labels(queue_type="sqs", status=status).inc(failed)
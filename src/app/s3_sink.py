@@ -0,0 +1,378 @@
+"""Write-behind S3 output sink that batches results into large compressed objects.
+
+Results are buffered in memory per ``(date, symbol)`` partition and written
+by a background thread once the buffer reaches S3_OUTPUT_FLUSH_BYTES or its
+oldest record is S3_OUTPUT_FLUSH_SECONDS old. Each flush writes one object
+per partition under a Hive-style key layout::
+
+    <S3_OUTPUT_KEY_PREFIX>date=2024-05-01/symbol=AAPL/<time>-<id>.ndjson.gz
+
+so that query engines such as Athena can prune partitions. Objects are
+NDJSON compressed with gzip or zstd, Parquet or Arrow IPC, and large objects
+are sent with multipart upload. Computed tables can be buffered directly with
+`BufferedS3Sink.add_table` in the columnar formats.
+"""
+
+import gzip
+import io
+import json
+import threading
+import time
+import uuid
+from collections import defaultdict
+from datetime import date, datetime, timezone
+from functools import lru_cache
+from typing import Any
+
+import app.config_shared as config
+from app.columnar_output import (
+    COLUMNAR_FORMATS,
+    FILE_EXTENSIONS,
+    partition_path,
+    partition_table,
+    records_to_table,
+    safe_symbol,
+    write_table,
+)
+from app.utils.metrics import record_sink_metrics
+from app.utils.setup_logger import setup_logger
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None  # zstd compression unavailable
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None  # columnar output unavailable
+
+logger = setup_logger(__name__)
+
+FORMATS = ("ndjson", *COLUMNAR_FORMATS)
+COMPRESSIONS = ("gzip", "zstd", "none")
+_EXTENSIONS = {"gzip": ".gz", "zstd": ".zst", "none": ""}
+
+# Buffered data beyond this multiple of the flush size is dropped while uploads fail
+_MAX_BUFFER_FACTOR = 4
+
+
+@lru_cache(maxsize=None)
+def _get_s3_client(region: str) -> Any:
+    """Return a boto3 S3 client for a region (empty for the default), created once."""
+    import boto3
+
+    return boto3.client("s3", region_name=region or None)
+
+
+def _partition_date(record: dict[str, Any]) -> date:
+    """Return the UTC date of a record's timestamp, or today if it has none.
+
+    The timestamp is read from the record or its ``result`` and may be epoch
+    seconds, epoch milliseconds or an ISO 8601 string.
+    """
+    result = record.get("result")
+    value = record.get("timestamp")
+    if value is None and isinstance(result, dict):
+        value = result.get("timestamp")
+    try:
+        if isinstance(value, int | float):
+            seconds = value / 1000 if value > 1e11 else value
+            return datetime.fromtimestamp(seconds, tz=timezone.utc).date()
+        if isinstance(value, str):
+            parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+            if parsed.tzinfo is not None:
+                parsed = parsed.astimezone(timezone.utc)
+            return parsed.date()
+    except (ValueError, OverflowError, OSError):
+        pass
+    return datetime.now(timezone.utc).date()
+
+
+def _partition_symbol(record: dict[str, Any]) -> str:
+    """Return the record's symbol made safe for use as an S3 key segment."""
+    return safe_symbol(record.get("symbol"))
+
+
+class _Partition:
+    """Records buffered for one ``(date, symbol)`` partition."""
+
+    def __init__(self) -> None:
+        """Create an empty partition buffer."""
+        self.lines: list[bytes] = []
+        self.records: list[dict[str, Any]] = []
+        self.tables: list[Any] = []
+        self.size = 0
+
+
+class BufferedS3Sink:
+    """Buffers output records and writes them to S3 as large partitioned objects.
+
+    `add` only appends to the in-memory buffer; uploads happen on a
+    background thread, or synchronously in `flush` and `close`. The sink is
+    safe to share between threads.
+    """
+
+    def __init__(
+        self,
+        bucket: str | None = None,
+        prefix: str | None = None,
+        output_format: str | None = None,
+        compression: str | None = None,
+        flush_bytes: int | None = None,
+        flush_seconds: float | None = None,
+        multipart_bytes: int | None = None,
+        client: Any = None,
+    ) -> None:
+        """Configure the sink; unset arguments are read from configuration.
+
+        Args:
+            bucket (str | None): Target bucket (default: S3_OUTPUT_BUCKET).
+            prefix (str | None): Key prefix (default: S3_OUTPUT_KEY_PREFIX).
+            output_format (str | None): "ndjson", "parquet" or "arrow"
+                (default: S3_OUTPUT_FORMAT).
+            compression (str | None): "gzip", "zstd" or "none"
+                (default: S3_OUTPUT_COMPRESSION).
+            flush_bytes (int | None): Buffered bytes that trigger a flush
+                (default: S3_OUTPUT_FLUSH_BYTES).
+            flush_seconds (float | None): Maximum buffering time
+                (default: S3_OUTPUT_FLUSH_SECONDS).
+            multipart_bytes (int | None): Multipart threshold and part size
+                (default: S3_OUTPUT_MULTIPART_BYTES).
+            client (Any): boto3 S3 client (default: cached client for S3_OUTPUT_REGION).
+
+        Raises:
+            ValueError: If the format or compression is unknown.
+            RuntimeError: If the format or compression needs a missing package.
+
+        """
+        self.bucket = bucket or config.get_s3_output_bucket()
+        self.prefix = config.get_s3_output_prefix() if prefix is None else prefix
+        self.output_format = output_format or config.get_s3_output_format()
+        self.compression = compression or config.get_s3_output_compression()
+        self.flush_bytes = flush_bytes or config.get_s3_output_flush_bytes()
+        self.flush_seconds = flush_seconds or config.get_s3_output_flush_seconds()
+        self.multipart_bytes = multipart_bytes or config.get_s3_output_multipart_bytes()
+        self.client = client or _get_s3_client(config.get_s3_output_region())
+
+        if self.output_format not in FORMATS:
+            raise ValueError(f"Unsupported S3 output format: {self.output_format}")
+        if self.compression not in COMPRESSIONS:
+            raise ValueError(f"Unsupported S3 output compression: {self.compression}")
+        if self.output_format in COLUMNAR_FORMATS and pyarrow is None:
+            raise RuntimeError(f"{self.output_format} S3 output requires pyarrow")
+        if self.output_format == "arrow" and self.compression == "gzip":
+            raise ValueError("Arrow S3 output supports zstd or no compression")
+        if self.output_format == "ndjson" and self.compression == "zstd" and zstandard is None:
+            raise RuntimeError("zstd S3 output requires zstandard")
+        if self.prefix and not self.prefix.endswith("/"):
+            self.prefix += "/"
+
+        self._partitions: defaultdict[tuple[date, str], _Partition] = defaultdict(_Partition)
+        self._size = 0
+        self._oldest: float | None = None
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def buffered_bytes(self) -> int:
+        """Uncompressed size of the records waiting to be written."""
+        return self._size
+
+    def add(self, records: list[dict[str, Any]]) -> None:
+        """Buffer records for a later upload.
+
+        Args:
+            records (list[dict[str, Any]]): Output records.
+
+        """
+        entries = [
+            (
+                (_partition_date(record), _partition_symbol(record)),
+                json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n",
+                record,
+            )
+            for record in records
+        ]
+        with self._lock:
+            for key, line, record in entries:
+                partition = self._partitions[key]
+                if self.output_format in COLUMNAR_FORMATS:
+                    partition.records.append(record)
+                else:
+                    partition.lines.append(line)
+                partition.size += len(line)
+                self._size += len(line)
+            self._buffered()
+
+    def add_table(self, table: Any) -> None:
+        """Buffer a computed Arrow table for a later upload.
+
+        In the columnar formats the table is split into partitions and kept
+        as Arrow data until it is written; NDJSON output converts it to
+        records.
+
+        Args:
+            table (pyarrow.Table): Output rows.
+
+        """
+        if self.output_format not in COLUMNAR_FORMATS:
+            self.add(table.to_pylist())
+            return
+        partitions = partition_table(table)
+        with self._lock:
+            for key, rows in partitions.items():
+                partition = self._partitions[key]
+                partition.tables.append(rows)
+                partition.size += rows.nbytes
+                self._size += rows.nbytes
+            self._buffered()
+
+    def _buffered(self) -> None:
+        """Start the writer and wake it when the buffer is full; called with the lock held."""
+        if self._oldest is None and self._size:
+            self._oldest = time.monotonic()
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="s3-sink", daemon=True)
+            self._thread.start()
+        if self._size >= self.flush_bytes:
+            self._wake.set()
+
+    def flush(self) -> None:
+        """Write every buffered partition to S3 now.
+
+        Partitions that fail to upload are put back into the buffer and
+        retried with the next flush.
+        """
+        with self._flush_lock:
+            with self._lock:
+                partitions, self._partitions = self._partitions, defaultdict(_Partition)
+                self._size, self._oldest = 0, None
+
+            failed = {}
+            for key, partition in partitions.items():
+                try:
+                    self._upload(key, partition)
+                except Exception as e:
+                    logger.error("❌ S3 upload failed: %s", e)
+                    record_sink_metrics("s3", "exception", 0, failed=True)
+                    failed[key] = partition
+            if failed:
+                self._restore(failed)
+
+    def close(self) -> None:
+        """Stop the background writer and flush what is still buffered."""
+        self._closed.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        self.flush()
+
+    def _run(self) -> None:
+        """Background loop that flushes on size or age."""
+        while not self._closed.is_set():
+            self._wake.wait(timeout=min(self.flush_seconds, 1.0))
+            self._wake.clear()
+            if self._closed.is_set():
+                break
+            oldest = self._oldest
+            due = oldest is not None and time.monotonic() - oldest >= self.flush_seconds
+            if due or self._size >= self.flush_bytes:
+                self.flush()
+
+    def _restore(self, failed: dict[tuple[date, str], _Partition]) -> None:
+        """Put failed partitions back in front of newer data, dropping data past the cap."""
+        with self._lock:
+            for key, partition in failed.items():
+                if self._size + partition.size > _MAX_BUFFER_FACTOR * self.flush_bytes:
+                    logger.error(
+                        "❌ Dropping %d buffered S3 output bytes for %s/%s after failed upload",
+                        partition.size,
+                        key[0],
+                        key[1],
+                    )
+                    continue
+                newer = self._partitions.pop(key, None)
+                if newer is not None:
+                    partition.lines += newer.lines
+                    partition.records += newer.records
+                    partition.tables += newer.tables
+                    partition.size += newer.size
+                    self._size -= newer.size
+                self._partitions[key] = partition
+                self._size += partition.size
+            if self._size and self._oldest is None:
+                self._oldest = time.monotonic()
+
+    def _upload(self, key: tuple[date, str], partition: _Partition) -> None:
+        """Encode one partition and write it as a single object."""
+        body = self._encode(partition)
+        name = f"{time.strftime('%H%M%S', time.gmtime())}-{uuid.uuid4().hex}"
+        object_key = f"{self.prefix}{partition_path(*key)}/{name}{self._suffix}"
+
+        start = time.perf_counter()
+        if len(body) >= self.multipart_bytes:
+            self._multipart_upload(object_key, body)
+        else:
+            self.client.put_object(Bucket=self.bucket, Key=object_key, Body=body)
+        duration = time.perf_counter() - start
+        record_sink_metrics("s3", "200", duration, failed=False)
+        logger.info("🚚 Uploaded %d bytes of output to S3: %s", len(body), object_key)
+
+    @property
+    def _suffix(self) -> str:
+        """File extension of written objects."""
+        if self.output_format in COLUMNAR_FORMATS:
+            return FILE_EXTENSIONS[self.output_format]
+        return ".ndjson" + _EXTENSIONS[self.compression]
+
+    def _encode(self, partition: _Partition) -> bytes:
+        """Serialize and compress one partition's records and tables."""
+        if self.output_format in COLUMNAR_FORMATS:
+            tables = list(partition.tables)
+            if partition.records:
+                tables.append(records_to_table(partition.records))
+            table = tables[0]
+            if len(tables) > 1:
+                table = pyarrow.concat_tables(tables, promote_options="permissive")
+            buffer = io.BytesIO()
+            write_table(table, buffer, self.output_format, self.compression)
+            return buffer.getvalue()
+
+        body = b"".join(partition.lines)
+        if self.compression == "gzip":
+            return gzip.compress(body, compresslevel=6)
+        if self.compression == "zstd":
+            return zstandard.ZstdCompressor(level=3).compress(body)
+        return body
+
+    def _multipart_upload(self, object_key: str, body: bytes) -> None:
+        """Upload a large object in parts, aborting the upload on failure."""
+        upload = self.client.create_multipart_upload(Bucket=self.bucket, Key=object_key)
+        upload_id = upload["UploadId"]
+        try:
+            parts = []
+            view = memoryview(body)
+            for number, offset in enumerate(range(0, len(body), self.multipart_bytes), start=1):
+                response = self.client.upload_part(
+                    Bucket=self.bucket,
+                    Key=object_key,
+                    UploadId=upload_id,
+                    PartNumber=number,
+                    Body=view[offset : offset + self.multipart_bytes].tobytes(),
+                )
+                parts.append({"ETag": response["ETag"], "PartNumber": number})
+            self.client.complete_multipart_upload(
+                Bucket=self.bucket,
+                Key=object_key,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": parts},
+            )
+        except Exception:
+            self.client.abort_multipart_upload(
+                Bucket=self.bucket, Key=object_key, UploadId=upload_id
+            )
+            raise
@@ -8,15 +8,16 @@ Included Utilities:
 - validate_environment_variables: Ensures required environment variables are set.
 - track_polling_metrics: Logs success/failure of polling operations.
 - track_request_metrics: Logs request-level metrics (rate limits, success, etc.).
+
+Apart from `setup_logger`, the utilities are imported on first access. The
+configuration modules live in this package, and importing the others here
+would set up their loggers before the configuration has loaded.
 """
 
-from .request_with_timeout import request_with_timeout
-from .retry_request import retry_request
+from importlib import import_module
+from typing import Any
+
 from .setup_logger import setup_logger
-from .track_polling_metrics import track_polling_metrics
-from .track_request_metrics import track_request_metrics
-from .validate_data import validate_data
-from .validate_environment_variables import validate_environment_variables
 
 __all__ = [
     "setup_logger",
@@ -28,5 +29,17 @@ __all__ = [
     "track_request_metrics",
 ]
 
-# Initialize package-level logger for utilities
-logger = setup_logger(name="utils")
+# Each lazily exported utility is defined in the submodule of the same name
+_LAZY_EXPORTS = frozenset(__all__) - {"setup_logger"}
+
+
+def __getattr__(name: str) -> Any:
+    """Import lazily exported utilities and the package-level logger on first access."""
+    if name == "logger":
+        value = setup_logger(name="utils")
+    elif name in _LAZY_EXPORTS:
+        value = getattr(import_module(f".{name}", __name__), name)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
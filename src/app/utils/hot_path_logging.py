@@ -0,0 +1,82 @@
+"""Low-overhead logging for per-computation hot paths.
+
+Messages logged through `HotPathLogger` are always formatted lazily, so no
+string is built unless the record is emitted. With HOT_PATH_LOGGING enabled:
+
+- per-computation messages are demoted to DEBUG and only one in every
+  LOG_SAMPLE_EVERY is emitted;
+- per-symbol results are counted in ``symbol_results_total`` and summarized
+  in one INFO line every LOG_SUMMARY_SECONDS instead of one line per symbol.
+"""
+
+import itertools
+import logging
+import threading
+import time
+from collections import Counter
+
+from app import config_shared
+from app.utils.metrics import _sanitize_label, symbol_results_total
+
+
+class HotPathLogger:
+    """Wraps a logger for messages emitted once per computation or per symbol."""
+
+    def __init__(self, logger: logging.Logger) -> None:
+        """Wrap a logger.
+
+        Args:
+            logger (logging.Logger): Logger that receives the emitted records.
+
+        """
+        self.logger = logger
+        self._calls = itertools.count()
+        self._symbols: Counter[str] = Counter()
+        self._lock = threading.Lock()
+        self._summary_at = time.monotonic()
+
+    def computation(self, msg: str, *args: object) -> None:
+        """Log a per-computation message: INFO, or sampled DEBUG in hot-path mode.
+
+        Args:
+            msg (str): %-style message template.
+            *args (object): Template arguments, formatted only if the record is emitted.
+
+        """
+        if not config_shared.get_hot_path_logging():
+            self.logger.info(msg, *args)
+        elif self.logger.isEnabledFor(logging.DEBUG):
+            if next(self._calls) % config_shared.get_log_sample_every() == 0:
+                self.logger.debug(msg, *args)
+
+    def symbol_result(self, symbol: str, analysis: str, msg: str, *args: object) -> None:
+        """Report a result computed for one symbol.
+
+        Logged at INFO by default. In hot-path mode the result is counted, and
+        a summary of results per symbol is logged once per LOG_SUMMARY_SECONDS.
+
+        Args:
+            symbol (str): Symbol the result was computed for.
+            analysis (str): Result name used as the metric label, e.g. ``SMA_20``.
+            msg (str): %-style message template for the per-symbol log line.
+            *args (object): Template arguments.
+
+        """
+        if not config_shared.get_hot_path_logging():
+            self.logger.info(msg, *args)
+            return
+
+        symbol_results_total.labels(analysis=_sanitize_label(analysis)).inc()
+        now = time.monotonic()
+        with self._lock:
+            self._symbols[symbol] += 1
+            elapsed = now - self._summary_at
+            if elapsed < config_shared.get_log_summary_seconds():
+                return
+            symbols, self._symbols, self._summary_at = self._symbols, Counter(), now
+        self.logger.info(
+            "Computed %d result(s) for %d symbol(s) in the last %.0fs",
+            sum(symbols.values()),
+            len(symbols),
+            elapsed,
+        )
@@ -166,6 +166,18 @@ def record_processing_metrics(processor: str, success: bool, duration_sec: float
     process_duration.labels(processor=processor).observe(duration_sec)
 
 
+symbol_results_total = Counter(
+    "symbol_results_total",
+    "Number of per-symbol analysis results computed.",
+    ["analysis"],
+)
+
+log_records_dropped_total = Counter(
+    "log_records_dropped_total",
+    "Number of log records dropped because the log queue was full.",
+)
+
+
 def record_validation_metrics(processor: str, duration_sec: float, failed: bool = False) -> None:
     processor = _sanitize_label(processor)
     if failed:
@@ -324,6 +336,20 @@ queue_publish_latency = Histogram(
     buckets=[0.01, 0.1, 0.5, 1, 2, 5],
 )
 
+queue_publish_confirm_latency = Histogram(
+    "queue_publish_confirm_duration_seconds",
+    "Time from publishing a message until the broker confirmed or nacked it.",
+    ["queue_type", "status"],
+    buckets=[0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5],
+)
+
+queue_publish_batch_size = Histogram(
+    "queue_publish_batch_size",
+    "Number of messages sent per queue publish request.",
+    ["queue_type"],
+    buckets=[1, 2, 5, 10, 50, 100, 500],
+)
+
 
 def record_queue_metrics(queue_type: str, status: str, duration_sec: float) -> None:
     """Record metrics for queue publishing operations.
@@ -338,3 +364,37 @@ def record_queue_metrics(queue_type: str, status: str, duration_sec: float) -> N
     status = _sanitize_label(status)
     queue_publish_counter.labels(queue_type=queue_type, status=status).inc()
     queue_publish_latency.labels(queue_type=queue_type, status=status).observe(duration_sec)
+
+
+# -----------------------------
+# Price History Store Metrics
+# -----------------------------
+history_symbols = Gauge(
+    "price_history_symbols",
+    "Number of symbols currently held in the price history store.",
+)
+
+history_memory_bytes = Gauge(
+    "price_history_memory_bytes",
+    "Memory of the price history store by kind (allocated or used).",
+    ["kind"],
+)
+
+history_evictions_total = Counter(
+    "price_history_evictions_total",
+    "Number of symbols evicted from the price history store.",
+)
+
+
+def record_history_metrics(symbols: int, allocated_bytes: int, used_bytes: int) -> None:
+    """Record the size and memory use of the price history store.
+
+    Args:
+        symbols (int): Number of tracked symbols.
+        allocated_bytes (int): Bytes reserved by the preallocated buffers.
+        used_bytes (int): Bytes of the buffers occupied by tracked symbols.
+
+    """
+    history_symbols.set(symbols)
+    history_memory_bytes.labels(kind="allocated").set(allocated_bytes)
+    history_memory_bytes.labels(kind="used").set(used_bytes)
@@ -0,0 +1,148 @@
+"""Non-blocking log output through a bounded queue and a background writer.
+
+With LOG_QUEUE enabled, `setup_logger` gives each logger a
+`BoundedQueueHandler` instead of its console and file handlers. Logging then
+only puts the record on a shared bounded queue; one listener thread writes it
+to the real handlers, so a slow stdout pipe never blocks the consumer thread.
+
+When the queue is full a record is dropped instead of waiting: the one being
+logged with LOG_QUEUE_DROP=newest, or the longest queued one with
+LOG_QUEUE_DROP=oldest. Drops are counted in ``log_records_dropped_total``.
+Queued records are written out at interpreter exit, or earlier by
+`flush_log_queue`.
+"""
+
+import atexit
+import logging
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener
+
+from app import config_shared
+from app.utils.metrics import log_records_dropped_total
+
+DROP_POLICIES = ("newest", "oldest")
+
+# Queue items pair a record with the handlers that should write it
+QueueItem = tuple[list[logging.Handler], logging.LogRecord]
+
+_queue: "queue.Queue[QueueItem | None] | None" = None
+_listener: "_HandlerListener | None" = None
+_stopped = False
+_lock = threading.Lock()
+
+
+class _HandlerListener(QueueListener):
+    """Writes each queued record to the handlers it was queued for."""
+
+    def handle(self, item: QueueItem) -> None:  # type: ignore[override]
+        """Pass a record to the handlers of the logger that queued it."""
+        handlers, record = item
+        for handler in handlers:
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+    def enqueue_sentinel(self) -> None:
+        """Queue the stop marker, waiting for space so no record is lost."""
+        self.queue.put(self._sentinel)
+
+
+class BoundedQueueHandler(QueueHandler):
+    """Queues records for the listener thread and never blocks the caller.
+
+    Once the listener has been stopped, records are written directly to the
+    target handlers, so messages logged during shutdown are not lost.
+    """
+
+    def __init__(
+        self,
+        log_queue: "queue.Queue[QueueItem | None]",
+        targets: list[logging.Handler],
+        drop_policy: str = "newest",
+    ) -> None:
+        """Create a handler writing to `targets` through `log_queue`.
+
+        Args:
+            log_queue (queue.Queue): Bounded queue read by the listener.
+            targets (list[logging.Handler]): Handlers that write the records.
+            drop_policy (str): "newest" or "oldest"; which record to drop when full.
+
+        Raises:
+            ValueError: If the drop policy is unknown.
+
+        """
+        if drop_policy not in DROP_POLICIES:
+            raise ValueError(f"Unsupported log queue drop policy: {drop_policy}")
+        super().__init__(log_queue)  # type: ignore[arg-type]
+        self.targets = targets
+        self.drop_policy = drop_policy
+        self.dropped = 0
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Queue a record, or write it directly once logging has been flushed."""
+        if _stopped:
+            for handler in self.targets:
+                if record.levelno >= handler.level:
+                    handler.handle(record)
+            return
+        super().emit(record)
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        """Put a prepared record on the queue, dropping one if it is full."""
+        item = (self.targets, record)
+        try:
+            self.queue.put_nowait(item)
+            return
+        except queue.Full:
+            pass
+        if self.drop_policy == "oldest":
+            try:
+                self.queue.get_nowait()
+                self.queue.put_nowait(item)
+            except (queue.Empty, queue.Full):
+                pass
+        self.dropped += 1
+        log_records_dropped_total.inc()
+
+    def flush(self) -> None:
+        """Flush the target handlers."""
+        for handler in self.targets:
+            handler.flush()
+
+
+def queue_handler(targets: list[logging.Handler]) -> BoundedQueueHandler:
+    """Return a handler that writes to `targets` from the background listener.
+
+    The shared queue and listener thread are created on first use.
+
+    Args:
+        targets (list[logging.Handler]): Console and file handlers of a logger.
+
+    Returns:
+        BoundedQueueHandler: Handler to attach to the logger.
+
+    """
+    global _queue, _listener
+    with _lock:
+        if _queue is None:
+            _queue = queue.Queue(maxsize=config_shared.get_log_queue_size())
+        if _listener is None and not _stopped:
+            _listener = _HandlerListener(_queue)
+            _listener.start()
+            atexit.register(flush_log_queue)
+        log_queue = _queue
+    return BoundedQueueHandler(log_queue, targets, config_shared.get_log_queue_drop_policy())
+
+
+def flush_log_queue() -> None:
+    """Write every queued record and stop the listener thread.
+
+    Records logged afterwards are written synchronously by the logging thread.
+    Called at interpreter exit; safe to call more than once.
+    """
+    global _listener, _stopped
+    with _lock:
+        listener, _listener = _listener, None
+        _stopped = True
+    if listener is not None:
+        listener.stop()
@@ -5,6 +5,7 @@ This ensures that sensitive fields are redacted and logs follow consistent forma
 
 import logging
 import os
+from functools import lru_cache
 from typing import Any
 
 from app.utils.redactor import redact_dict
@@ -14,8 +15,20 @@ from app.utils.setup_logger import setup_logger
 SAFE_LOG_FULL: bool = os.getenv("SAFE_LOG_FULL", "false").lower() == "true"
 SAFE_LOG_STRUCTURED: bool = os.getenv("SAFE_LOG_STRUCTURED", "false").lower() == "true"
 
-# Base logger instance
-logger: logging.Logger = setup_logger(__name__, structured=SAFE_LOG_STRUCTURED)
+
+@lru_cache(maxsize=1)
+def _get_logger() -> logging.Logger:
+    """Return the base logger, created on first use.
+
+    Vault lookups log through this module while the configuration is still
+    loading, so the logger is configured from environment variables only.
+    """
+    return setup_logger(
+        __name__,
+        level=getattr(logging, os.getenv("LOG_LEVEL", "INFO").upper(), logging.INFO),
+        structured=SAFE_LOG_STRUCTURED,
+        redact=os.getenv("REDACT_SENSITIVE_LOGS", "true").lower() == "true",
+    )
 
 
 def safe_info(message: str, data: dict[str, Any] | None = None) -> None:
@@ -27,11 +40,11 @@ def safe_info(message: str, data: dict[str, Any] | None = None) -> None:
 
     """
     if data is None:
-        logger.info(message)
+        _get_logger().info(message)
         return
 
     payload_size = len(data) if SAFE_LOG_FULL else len(redact_dict(data))
-    logger.info("%s | payload_size=%d", message, payload_size)
+    _get_logger().info("%s | payload_size=%d", message, payload_size)
 
 
 def safe_warning(message: str, data: dict[str, Any] | None = None) -> None:
@@ -43,11 +56,11 @@ def safe_warning(message: str, data: dict[str, Any] | None = None) -> None:
 
     """
     if data is None:
-        logger.warning(message)
+        _get_logger().warning(message)
         return
 
     payload_size = len(data) if SAFE_LOG_FULL else len(redact_dict(data))
-    logger.warning("%s | payload_size=%d", message, payload_size)
+    _get_logger().warning("%s | payload_size=%d", message, payload_size)
 
 
 def safe_error(message: str, data: dict[str, Any] | None = None) -> None:
@@ -59,11 +72,11 @@ def safe_error(message: str, data: dict[str, Any] | None = None) -> None:
 
     """
     if data is None:
-        logger.error(message)
+        _get_logger().error(message)
         return
 
     payload_size = len(data) if SAFE_LOG_FULL else len(redact_dict(data))
-    logger.error("%s | payload_size=%d", message, payload_size)
+    _get_logger().error("%s | payload_size=%d", message, payload_size)
 
 
 def safe_debug(message: str, data: dict[str, Any] | None = None) -> None:
@@ -75,8 +88,8 @@ def safe_debug(message: str, data: dict[str, Any] | None = None) -> None:
 
     """
     if data is None:
-        logger.debug(message)
+        _get_logger().debug(message)
         return
 
     payload_size = len(data) if SAFE_LOG_FULL else len(redact_dict(data))
-    logger.debug("%s | payload_size=%d", message, payload_size)
+    _get_logger().debug("%s | payload_size=%d", message, payload_size)
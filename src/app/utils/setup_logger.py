@@ -1,5 +1,9 @@
 """Configures and returns a logger with console, optional file, and optional JSON output.
-Supports redaction toggle from config_shared and multi-handler output.
+Supports redaction toggle from config_shared and multi-handler output. With
+LOG_QUEUE enabled, handlers write from a background thread (see `queue_logging`).
+
+config_shared is imported when a logger is set up rather than at import time,
+because the configuration modules themselves log through this module.
 """
 
 import logging
@@ -12,14 +16,14 @@ try:
 except ImportError:
     JsonFormatter = None  # JSON logging fallback
 
-from app import config_shared
-
 
 def setup_logger(
     name: str | None = None,
     level: int | None = None,
     structured: bool | None = None,
     log_file: str | None = None,
+    redact: bool | None = None,
+    queued: bool | None = None,
 ) -> Logger:
     """Configure and return a logger with optional structured and file output.
 
@@ -28,6 +32,10 @@ def setup_logger(
         level (Optional[int]): Logging level (overrides LOG_LEVEL config).
         structured (Optional[bool]): Use structured (JSON) logging (overrides LOG_FORMAT config).
         log_file (Optional[str]): Path to a log file (enables rotation if set).
+        redact (Optional[bool]): Whether redaction is reported as enabled
+            (overrides REDACT_SENSITIVE_LOGS config).
+        queued (Optional[bool]): Write records from a background thread through a
+            bounded queue (overrides LOG_QUEUE config).
 
     Returns:
         Logger: Configured logger instance.
@@ -38,12 +46,16 @@ def setup_logger(
     if logger.hasHandlers():
         return logger
 
+    if redact is None or level is None or structured is None or queued is None:
+        from app import config_shared
+
     # Resolve redaction
-    redact_enabled = config_shared.get_redact_sensitive_logs()
+    redact_enabled = redact if redact is not None else config_shared.get_redact_sensitive_logs()
 
     # Resolve level
-    level_name = config_shared.get_log_level()
-    resolved_level: int = level if level is not None else getattr(logging, level_name, logging.INFO)
+    if level is None:
+        level = getattr(logging, config_shared.get_log_level(), logging.INFO)
+    resolved_level: int = level
 
     # Resolve structured format
     structured = structured if structured is not None else config_shared.get_log_format() == "json"
@@ -59,13 +71,23 @@ def setup_logger(
     # Console handler
     stream_handler = logging.StreamHandler(sys.stdout)
     stream_handler.setFormatter(formatter)
-    logger.addHandler(stream_handler)
+    handlers: list[logging.Handler] = [stream_handler]
 
     # Optional rotating file handler
     if log_file:
         file_handler = RotatingFileHandler(log_file, maxBytes=5 * 1024 * 1024, backupCount=3)
         file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+        handlers.append(file_handler)
+
+    # Optionally hand records to a background writer instead of writing them inline
+    queued = queued if queued is not None else config_shared.get_log_queue_enabled()
+    if queued:
+        from app.utils.queue_logging import queue_handler
+
+        logger.addHandler(queue_handler(handlers))
+    else:
+        for handler in handlers:
+            logger.addHandler(handler)
 
     logger.setLevel(resolved_level)
     logger.propagate = False
@@ -1,11 +1,22 @@
 """Vault client for secure secret retrieval using AppRole authentication.
 
 Supports KV v2 secrets engine and includes environment-aware namespace handling.
+A single shared client logs in once and reads the poller's whole secret in one
+request, so every config getter is served from memory.
+
+The secret is held as an immutable `ConfigSnapshot`. With VAULT_REFRESH_SECONDS
+set (or a lease TTL returned by Vault), a background thread re-reads the secret
+and publishes a new snapshot when it changes. Readers take the current snapshot
+with a single reference read and never lock; components interested in specific
+keys, such as the credentials of a sink, register with `on_config_change`.
 """
 
 import os
+import threading
+from collections.abc import Callable, Iterable, Mapping
 from functools import lru_cache
-from typing import Any
+from types import MappingProxyType
+from typing import Any, NamedTuple
 
 import hvac
 from tenacity import retry, stop_after_attempt, wait_fixed
@@ -17,6 +28,53 @@ VAULT_ROLE_ID: str | None = os.getenv("VAULT_ROLE_ID")
 VAULT_SECRET_ID: str | None = os.getenv("VAULT_SECRET_ID")
 POLLER_NAME: str | None = os.getenv("POLLER_NAME")
 ENVIRONMENT: str = os.getenv("ENVIRONMENT", "dev")
+VAULT_REFRESH_SECONDS: float = float(os.getenv("VAULT_REFRESH_SECONDS", "0"))
+
+# Shortest wait between background refreshes, whatever the lease TTL
+MIN_REFRESH_SECONDS = 1.0
+
+
+class ConfigSnapshot(NamedTuple):
+    """Immutable view of the poller's Vault secret at one point in time."""
+
+    values: Mapping[str, str]
+    version: int
+    lease_seconds: float = 0
+
+
+ConfigListener = Callable[[frozenset[str]], None]
+
+# (keys, callback) pairs; the tuple is replaced, never mutated, so it can be read without a lock
+_listeners: tuple[tuple[frozenset[str] | None, ConfigListener], ...] = ()
+_listeners_lock = threading.Lock()
+
+
+def on_config_change(keys: Iterable[str] | None, callback: ConfigListener) -> None:
+    """Register a callback for changes to Vault config values.
+
+    Callbacks run on the refresher thread, in registration order, after the
+    config caches have been cleared, so they read the new values.
+
+    Args:
+        keys (Iterable[str] | None): Keys of interest, or None for any change.
+        callback (Callable[[frozenset[str]], None]): Called with the changed keys.
+
+    """
+    global _listeners
+    watched = None if keys is None else frozenset(keys)
+    with _listeners_lock:
+        _listeners = (*_listeners, (watched, callback))
+
+
+def _notify(changed: frozenset[str]) -> None:
+    """Call the listeners whose keys changed."""
+    for keys, callback in _listeners:
+        if keys is not None and not keys & changed:
+            continue
+        try:
+            callback(changed)
+        except Exception as e:
+            safe_warning("⚠️ Config change listener failed.", data={"error": str(e)})
 
 
 class VaultClient:
@@ -30,6 +88,11 @@ class VaultClient:
 
         """
         self.client: hvac.Client = hvac.Client(url=VAULT_ADDR)
+        self._snapshot: ConfigSnapshot | None = None
+        self._lock = threading.Lock()
+        self._refresher: threading.Thread | None = None
+        self._stop = threading.Event()
+        self._last_lease = 0.0
         self._authenticate()
 
     @retry(stop=stop_after_attempt(3), wait=wait_fixed(2))
@@ -52,21 +115,39 @@ class VaultClient:
         else:
             safe_warning("⚠️ VAULT_ROLE_ID or VAULT_SECRET_ID not provided. Vault auth skipped.")
 
-    @retry(stop=stop_after_attempt(3), wait=wait_fixed(2))
-    def get(self, key: str, fallback: str | None = None) -> str | None:
-        """Retrieve a value from Vault for the given key.
+    @property
+    def snapshot(self) -> ConfigSnapshot:
+        """Current config snapshot, read from Vault on first access."""
+        snapshot = self._snapshot
+        if snapshot is not None:
+            return snapshot
+        with self._lock:
+            if self._snapshot is None:
+                values, lease = self._read_secret() or ({}, 0.0)
+                self._snapshot = ConfigSnapshot(MappingProxyType(values), 1, lease)
+            return self._snapshot
 
-        Args:
-            key (str): The key to retrieve from Vault.
-            fallback (Optional[str]): Value to return if Vault lookup fails.
+    @property
+    def secrets(self) -> Mapping[str, str]:
+        """All values of this poller's secret in the current snapshot."""
+        return self.snapshot.values
+
+    def read_secrets(self) -> dict[str, str]:
+        """Read every key of the poller's KV v2 secret in a single request.
 
         Returns:
-            Optional[str]: The retrieved value or fallback if not found.
+            dict[str, str]: Secret values by key; empty if POLLER_NAME is not
+            set or the read fails.
 
         """
+        result = self._read_secret()
+        return result[0] if result else {}
+
+    def _read_secret(self) -> tuple[dict[str, str], float] | None:
+        """Read the secret, returning its values and lease duration, or None on failure."""
         if not POLLER_NAME:
-            safe_warning("⚠️ POLLER_NAME not set. Skipping Vault lookup.", data={"key": key})
-            return fallback
+            safe_warning("⚠️ POLLER_NAME not set. Skipping Vault lookup.")
+            return None
 
         secret_path: str = f"secret/data/{POLLER_NAME}/{ENVIRONMENT}"
 
@@ -74,21 +155,155 @@ class VaultClient:
             secret: dict[str, Any] = self.client.secrets.kv.v2.read_secret_version(
                 path=f"{POLLER_NAME}/{ENVIRONMENT}"
             )
-            value: Any | None = secret["data"]["data"].get(key)
-            if value is not None:
-                safe_info("🔑 Vault value retrieved.", data={"key": key})
-                return str(value)
-            safe_warning("⚠️ Vault key not found.", data={"key": key, "path": secret_path})
+            data: dict[str, Any] = secret["data"]["data"] or {}
         except Exception as e:
-            safe_warning("⚠️ Vault read failure.", data={"key": key, "error": str(e)})
+            safe_warning("⚠️ Vault read failure.", data={"path": secret_path, "error": str(e)})
+            return None
+
+        safe_info("🔑 Vault secrets loaded.", data={"path": secret_path, "keys": len(data)})
+        values = {key: str(value) for key, value in data.items() if value is not None}
+        return values, float(secret.get("lease_duration") or 0)
+
+    def get(self, key: str, fallback: str | None = None) -> str | None:
+        """Retrieve a value from Vault for the given key.
+
+        Values are served from the current snapshot without contacting Vault.
+
+        Args:
+            key (str): The key to retrieve from Vault.
+            fallback (Optional[str]): Value to return if the key is not in Vault.
+
+        Returns:
+            Optional[str]: The retrieved value or fallback if not found.
 
-        return fallback
+        """
+        value = self.snapshot.values.get(key)
+        return fallback if value is None else value
+
+    def refresh(self) -> frozenset[str]:
+        """Re-read the secret and publish a new snapshot if any value changed.
+
+        A failed read is retried once after logging in again, in case the
+        token expired. On failure the current snapshot is kept. When values
+        change, the config caches are cleared and listeners are notified.
+
+        Returns:
+            frozenset[str]: Keys whose values changed.
+
+        """
+        current = self.snapshot
+        result = self._read_secret()
+        if result is None and POLLER_NAME:
+            try:
+                self._authenticate()
+            except Exception:
+                return frozenset()
+            result = self._read_secret()
+        if result is None:
+            return frozenset()
+
+        values, lease = result
+        changed = frozenset(
+            key
+            for key in values.keys() | current.values.keys()
+            if values.get(key) != current.values.get(key)
+        )
+        if not changed:
+            if lease != current.lease_seconds:
+                self._snapshot = current._replace(lease_seconds=lease)
+            return changed
+
+        self._snapshot = ConfigSnapshot(MappingProxyType(values), current.version + 1, lease)
+        get_config_value_cached.cache_clear()
+        safe_info(
+            "🔄 Vault config updated.",
+            data={"version": current.version + 1, "changed": len(changed)},
+        )
+        _notify(changed)
+        return changed
+
+    def refresh_interval(self) -> float:
+        """Seconds between refreshes: VAULT_REFRESH_SECONDS, capped by the lease TTL.
+
+        A read that returns no lease keeps the last positive lease, so a
+        refresher started because of a lease TTL never gets an interval of 0.
+        """
+        lease = self.snapshot.lease_seconds
+        if lease > 0:
+            self._last_lease = lease
+        else:
+            lease = self._last_lease
+        if lease and (not VAULT_REFRESH_SECONDS or lease < VAULT_REFRESH_SECONDS):
+            return lease
+        return VAULT_REFRESH_SECONDS
+
+    def start_refresher(self) -> bool:
+        """Start the background refresh thread if an interval or TTL is configured.
+
+        Returns:
+            bool: True if the refresher is running.
+
+        """
+        with self._lock:
+            if self._refresher is not None:
+                return True
+            if not self.refresh_interval():
+                return False
+            self._stop.clear()
+            self._refresher = threading.Thread(
+                target=self._refresh_loop, name="vault-refresher", daemon=True
+            )
+            self._refresher.start()
+        safe_info("🔄 Vault config refresher started.", data={"interval": self.refresh_interval()})
+        return True
+
+    def stop_refresher(self) -> None:
+        """Stop the background refresh thread."""
+        self._stop.set()
+        refresher, self._refresher = self._refresher, None
+        if refresher is not None:
+            refresher.join(timeout=5)
+
+    def _refresh_loop(self) -> None:
+        """Refresh the snapshot until stopped."""
+        while not self._stop.wait(max(self.refresh_interval(), MIN_REFRESH_SECONDS)):
+            try:
+                self.refresh()
+            except Exception as e:
+                safe_warning("⚠️ Vault config refresh failed.", data={"error": str(e)})
+
+
+@lru_cache(maxsize=1)
+def get_vault_client() -> VaultClient:
+    """Return the process-wide Vault client, authenticating on first use.
+
+    Returns:
+        VaultClient: Shared client whose secret map is read once and refreshed
+        in the background when the refresher is started.
+
+    """
+    return VaultClient()
+
+
+def current_config() -> ConfigSnapshot:
+    """Return the current config snapshot.
+
+    Use this to read several related values, such as a user name and
+    password, from the same version of the secret.
+
+    Returns:
+        ConfigSnapshot: Immutable snapshot of the Vault secret.
+
+    """
+    return get_vault_client().snapshot
 
 
 @lru_cache
 def get_config_value_cached(key: str, default: str | None = None) -> str:
     """Retrieve a configuration value from Vault, environment variable, or fallback, with caching.
 
+    The cache is cleared whenever the refresher publishes a changed snapshot.
+
     Args:
         key (str): The config key to look up.
         default (Optional[str]): Fallback if not found.
@@ -100,7 +315,7 @@ def get_config_value_cached(key: str, default: str | None = None) -> str:
         ValueError: If no value is found and no default is provided.
 
     """
-    val = VaultClient().get(key, fallback=os.getenv(key, default))
+    val = get_vault_client().get(key, fallback=os.getenv(key, default))
     if val is None:
         raise ValueError(f"❌ Missing required config value for key: {key}")
     return str(val)
@@ -0,0 +1,301 @@
+import asyncio
+
+from app.async_runtime import ReceivedBatch, run_pipeline
+
+
+def _source(batches, settled, received=None):
+    async def generate():
+        for index, messages in enumerate(batches):
+            if received is not None:
+                received.append(index)
+
+            async def settle(success, index=index):
+                settled.append((index, success))
+
+            yield ReceivedBatch(messages, settle)
+
+    return generate()
+
+
+def test_pipeline_processes_and_settles_in_order():
+    settled, dispatched = [], []
+
+    def compute(messages):
+        if messages == ["bad"]:
+            raise ValueError("boom")
+        return [m * 10 for m in messages]
+
+    async def dispatch(outputs):
+        if outputs == [30]:
+            raise RuntimeError("sink down")
+        await asyncio.sleep(0.001)
+        dispatched.append(outputs)
+
+    batches = [[1, 2], ["bad"], [3], [4]]
+    asyncio.run(run_pipeline(_source(batches, settled), compute, dispatch))
+
+    assert dispatched == [[10, 20], [40]]
+    assert settled == [(0, True), (1, False), (2, False), (3, True)]
+
+
+def test_pipeline_applies_backpressure_to_consumer():
+    settled, received = [], []
+
+    async def dispatch(outputs):
+        # Batches received but not yet settled: two queues, one per stage, and the source
+        assert len(received) - len(settled) <= 2 * 1 + 3
+        await asyncio.sleep(0.005)
+
+    batches = [[i] for i in range(12)]
+    asyncio.run(run_pipeline(_source(batches, settled, received), list, dispatch, queue_size=1))
+
+    assert [index for index, _ in settled] == list(range(12))
+
+
+def test_async_dispatcher_runs_blocking_modes_in_thread(monkeypatch):
+    import threading
+
+    from app import async_runtime
+
+    calls = []
+
+    class _Dispatcher:
+        output_modes = ["log"]
+
+        def send(self, data):
+            calls.append((data, threading.current_thread() is threading.main_thread()))
+
+    monkeypatch.setattr(async_runtime.config, "get_paper_trading_enabled", lambda: False)
+    dispatcher = async_runtime.AsyncOutputDispatcher(_Dispatcher())
+    asyncio.run(dispatcher.send([{"symbol": "A"}]))
+
+    assert calls == [([{"symbol": "A"}], False)]
+    assert not dispatcher.rest
+
+
+def test_rabbitmq_shutdown_settles_queued_batches_before_closing(monkeypatch):
+    import json
+    import signal
+    import time
+    from types import SimpleNamespace
+
+    from app import async_runtime
+
+    class _Connection:
+        closed = False
+        acked = []
+
+        async def channel(self):
+            return _Channel()
+
+        async def close(self):
+            self.closed = True
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc_info):
+            self.closed = True
+
+    connection = _Connection()
+
+    class _Delivery:
+        def __init__(self, n):
+            self.n = n
+            self.body = json.dumps({"n": n}).encode()
+
+        async def ack(self, multiple=False):
+            if connection.closed:
+                raise RuntimeError("channel is closed")
+            connection.acked.append(self.n)
+
+        async def nack(self, multiple=False, requeue=False):
+            raise AssertionError("no batch should fail")
+
+    class _Deliveries:
+        async def consume(self, callback):
+            self.feeder = asyncio.ensure_future(self._feed(callback))
+            return "ctag"
+
+        async def cancel(self, consumer_tag):
+            self.feeder.cancel()
+
+        async def _feed(self, callback):
+            for n in range(1, 100):
+                await callback(_Delivery(n))
+                if n == 4:
+                    # Once the consumer has taken the fourth delivery, shut down
+                    # gracefully while batches are still waiting in the pipeline
+                    while not callback.__self__.empty():
+                        await asyncio.sleep(0.001)
+                    signal.raise_signal(signal.SIGTERM)
+                await asyncio.sleep(0)
+
+    class _Channel:
+        async def set_qos(self, prefetch_count):
+            pass
+
+        async def declare_queue(self, name, durable):
+            return _Deliveries()
+
+    async def connect_robust(**kwargs):
+        return connection
+
+    class _Output:
+        async def send(self, data):
+            pass
+
+        async def close(self):
+            pass
+
+    def slow_compute(messages):
+        time.sleep(0.01)
+        return messages
+
+    monkeypatch.setattr(async_runtime, "aio_pika", SimpleNamespace(connect_robust=connect_robust))
+    monkeypatch.setattr(async_runtime, "AsyncOutputDispatcher", _Output)
+    monkeypatch.setattr(async_runtime, "process_batch_with_metrics", slow_compute)
+    for name, value in {
+        "get_queue_type": "rabbitmq",
+        "get_rabbitmq_host": "localhost",
+        "get_rabbitmq_port": 5672,
+        "get_rabbitmq_vhost": "/",
+        "get_rabbitmq_user": "",
+        "get_rabbitmq_password": "",
+        "get_rabbitmq_queue": "q",
+        "get_rabbitmq_requeue_on_failure": False,
+        "get_batch_size": 1,
+        "get_batch_linger_ms": 0,
+        "get_work_queue_size": 2,
+    }.items():
+        monkeypatch.setattr(async_runtime.config, name, lambda value=value: value)
+
+    asyncio.run(async_runtime._run())
+
+    # Every batch consumed before the shutdown was acknowledged on an open channel
+    assert connection.acked == list(range(1, len(connection.acked) + 1))
+    assert len(connection.acked) >= 4
+    assert connection.closed
+
+
+def test_rabbitmq_consumer_survives_idle_periods(monkeypatch):
+    import json
+    from types import SimpleNamespace
+
+    from app import async_runtime
+
+    class _Delivery:
+        body = json.dumps({"n": 1}).encode()
+
+    class _Queue:
+        cancelled = False
+
+        async def consume(self, callback):
+            async def feed():
+                # Idle for longer than the consumer's one-second wait
+                await asyncio.sleep(1.3)
+                await callback(_Delivery())
+
+            self.feeder = asyncio.ensure_future(feed())
+            return "ctag"
+
+        async def cancel(self, consumer_tag):
+            self.cancelled = True
+
+    amqp_queue = _Queue()
+
+    class _Channel:
+        async def set_qos(self, prefetch_count):
+            pass
+
+        async def declare_queue(self, name, durable):
+            return amqp_queue
+
+    connection = SimpleNamespace(channel=lambda: _async(_Channel()))
+    for name, value in {
+        "get_rabbitmq_queue": "q",
+        "get_rabbitmq_requeue_on_failure": False,
+        "get_batch_size": 1,
+        "get_batch_linger_ms": 0,
+        "get_work_queue_size": 2,
+    }.items():
+        monkeypatch.setattr(async_runtime.config, name, lambda value=value: value)
+
+    async def consume_one():
+        stop = asyncio.Event()
+        batches = async_runtime._rabbitmq_batches(connection, stop)
+        batch = await asyncio.wait_for(batches.__anext__(), 5)
+        stop.set()
+        await batches.aclose()
+        return batch
+
+    batch = asyncio.run(consume_one())
+
+    assert batch.messages == [{"n": 1}]
+    assert amqp_queue.cancelled
+
+
+async def _async(value):
+    return value
+
+
+def test_sqs_source_retries_receive_errors_and_keeps_batches_invisible(monkeypatch):
+    import json
+
+    import boto3
+    from botocore.exceptions import ClientError
+
+    from app import async_runtime
+
+    class _SQS:
+        def __init__(self):
+            self.receives = 0
+            self.extended = []
+            self.deleted = []
+
+        def receive_message(self, **kwargs):
+            self.receives += 1
+            if self.receives == 1:
+                raise ClientError({"Error": {"Code": "ServiceUnavailable"}}, "ReceiveMessage")
+            if self.receives == 2:
+                return {"Messages": [{"Body": json.dumps({"n": 1}), "ReceiptHandle": "h1"}]}
+            return {}
+
+        def change_message_visibility_batch(self, QueueUrl, Entries):
+            self.extended.append([entry["ReceiptHandle"] for entry in Entries])
+            return {}
+
+        def delete_message_batch(self, QueueUrl, Entries):
+            self.deleted.extend(entry["ReceiptHandle"] for entry in Entries)
+            return {}
+
+    sqs = _SQS()
+    monkeypatch.setattr(boto3, "client", lambda *args, **kwargs: sqs)
+    monkeypatch.setattr(async_runtime, "SQS_ERROR_BACKOFF_SECONDS", 0.01)
+    for name, value in {
+        "get_sqs_region": "us-east-1",
+        "get_sqs_queue_url": "url",
+        "get_batch_size": 10,
+        "get_sqs_visibility_timeout": 0.1,
+    }.items():
+        monkeypatch.setattr(async_runtime.config, name, lambda value=value: value)
+
+    async def consume():
+        stop = asyncio.Event()
+        dispatched = []
+
+        async def slow_dispatch(outputs):
+            # A slow sink: the batch outlives its visibility timeout
+            await asyncio.sleep(0.3)
+            dispatched.append(outputs)
+            stop.set()
+
+        await run_pipeline(async_runtime._sqs_batches(stop), list, slow_dispatch)
+        return dispatched
+
+    dispatched = asyncio.run(consume())
+
+    assert dispatched == [[{"n": 1}]]
+    assert sqs.receives >= 2
+    assert sqs.extended and set(map(tuple, sqs.extended)) == {("h1",)}
+    assert sqs.deleted == ["h1"]
@@ -0,0 +1,69 @@
+import pandas as pd
+import pytest
+
+pyarrow = pytest.importorskip("pyarrow")
+import pyarrow.ipc  # noqa: E402
+import pyarrow.parquet  # noqa: E402
+
+from app.columnar_output import LocalFileSink, frame_to_table, partition_table  # noqa: E402
+
+
+def _frame():
+    index = pd.DatetimeIndex(
+        ["2024-05-01 15:00", "2024-05-01 16:00", "2024-05-02 15:00"], name="Date", tz="UTC"
+    )
+    return pd.DataFrame({"Close": [1.0, 2.0, 3.0], "SMA_2": [None, 1.5, 2.5]}, index=index)
+
+
+def test_frame_to_table_keeps_index_and_adds_constants():
+    table = frame_to_table(_frame(), {"symbol": "AAPL", "window": 2})
+
+    assert table.column_names == ["Close", "SMA_2", "Date", "symbol", "window"]
+    assert table.column("symbol").to_pylist() == ["AAPL"] * 3
+    assert table.column("SMA_2").to_pylist() == [None, 1.5, 2.5]
+
+
+def test_partition_table_splits_by_date_and_symbol():
+    table = frame_to_table(_frame(), {"symbol": "BRK/B"})
+
+    partitions = partition_table(table)
+
+    assert {(day.isoformat(), symbol) for day, symbol in partitions} == {
+        ("2024-05-01", "BRK_B"),
+        ("2024-05-02", "BRK_B"),
+    }
+    assert sorted(t.num_rows for t in partitions.values()) == [1, 2]
+
+
+@pytest.mark.parametrize("output_format", ["parquet", "arrow"])
+def test_local_file_sink_writes_partition_files(tmp_path, output_format):
+    sink = LocalFileSink(tmp_path, output_format, "zstd")
+
+    paths = sink.write(frame_to_table(_frame(), {"symbol": "AAPL"}))
+
+    relative = sorted(str(p.parent.relative_to(tmp_path)) for p in paths)
+    assert relative == ["date=2024-05-01/symbol=AAPL", "date=2024-05-02/symbol=AAPL"]
+    assert not list(tmp_path.rglob("*.tmp"))
+    first = min(paths, key=lambda p: str(p))
+    if output_format == "arrow":
+        with pyarrow.memory_map(str(first)) as source:
+            written = pyarrow.ipc.open_file(source).read_all()
+    else:
+        written = pyarrow.parquet.read_table(first)
+    assert written.column("Close").to_pylist() == [1.0, 2.0]
+
+
+def test_dispatcher_sends_table_columnar_and_as_records(tmp_path, monkeypatch):
+    from app import output_handler
+
+    monkeypatch.setattr(output_handler.config_shared, "get_paper_trading_enabled", lambda: False)
+    dispatcher = output_handler.OutputDispatcher()
+    dispatcher.output_modes = ["file", "log"]
+    dispatcher._file_sink = LocalFileSink(tmp_path, "parquet", "none")
+    logged = []
+    monkeypatch.setattr(dispatcher, "_output_to_log", logged.append)
+
+    dispatcher.send_table(_frame().assign(symbol="AAPL"))
+
+    assert len(list(tmp_path.rglob("*.parquet"))) == 2
+    assert [row["Close"] for row in logged[0]] == [1.0, 2.0, 3.0]
@@ -14,3 +14,27 @@ def test_get_polling_interval_default():
 @patch.dict(os.environ, {"POLLING_INTERVAL": "10"})
 def test_get_polling_interval_from_env():
     assert config.get_polling_interval() == 10
+
+
+@pytest.fixture
+def moving_averages(monkeypatch):
+    def set_value(value):
+        monkeypatch.setenv("MOVING_AVERAGES", value)
+        config.get_config_value_cached.cache_clear()
+        config.get_moving_average_specs.cache_clear()
+
+    yield set_value
+    config.get_config_value_cached.cache_clear()
+    config.get_moving_average_specs.cache_clear()
+
+
+@pytest.mark.parametrize("value", ["smaa:20", "sma:0", "sma", "ema:5,wma:-1"])
+def test_get_moving_average_specs_rejects_invalid_entries(moving_averages, value):
+    moving_averages(value)
+    with pytest.raises(ValueError, match="MOVING_AVERAGES"):
+        config.get_moving_average_specs()
+
+
+def test_get_moving_average_specs_parses_pairs(moving_averages):
+    moving_averages("SMA:20, ema:5,")
+    assert config.get_moving_average_specs() == [("sma", 20), ("ema", 5)]
@@ -0,0 +1,109 @@
+import numpy as np
+import pytest
+
+from app.history_store import PriceHistoryStore
+from app.moving_avg_array import moving_average
+
+
+def test_append_wraps_and_keeps_newest_bars():
+    store = PriceHistoryStore(max_depth=4, max_symbols=2)
+    for price in range(1, 7):
+        length = store.append("AAPL", float(price), volume=10.0 * price)
+
+    assert length == 4
+    prices, volumes = store.history("AAPL")
+    np.testing.assert_array_equal(prices, [3.0, 4.0, 5.0, 6.0])
+    np.testing.assert_array_equal(volumes, [30.0, 40.0, 50.0, 60.0])
+
+
+def test_extend_matches_repeated_append():
+    rng = np.random.default_rng(0)
+    bulk = PriceHistoryStore(max_depth=7, max_symbols=1)
+    single = PriceHistoryStore(max_depth=7, max_symbols=1)
+    for size in (3, 1, 9, 5, 7, 2):
+        chunk = rng.normal(size=size)
+        bulk.extend("X", chunk)
+        for price in chunk:
+            single.append("X", price)
+        np.testing.assert_array_equal(bulk.history("X")[0], single.history("X")[0])
+
+    with pytest.raises(ValueError):
+        bulk.extend("X", [1.0, 2.0], volumes=[1.0])
+
+
+def test_lru_eviction_reuses_slots():
+    store = PriceHistoryStore(max_depth=3, max_symbols=2)
+    store.append("A", 1.0)
+    store.append("B", 2.0)
+    store.append("A", 1.5)  # B is now least recently updated
+    store.append("C", 3.0)
+
+    assert "B" not in store and len(store) == 2
+    assert store.evictions == 1
+    np.testing.assert_array_equal(store.history("A")[0], [1.0, 1.5])
+    np.testing.assert_array_equal(store.history("C")[0], [3.0])
+    assert store.history("B")[0].size == 0
+
+    store.discard("A")
+    store.append("D", 4.0)
+    assert store.evictions == 1
+
+
+def test_panel_is_right_aligned():
+    store = PriceHistoryStore(max_depth=3, max_symbols=3)
+    store.extend("A", [1.0, 2.0, 3.0, 4.0])
+    store.append("B", 5.0)
+    prices, _ = store.panel(["A", "B", "missing"])
+
+    np.testing.assert_array_equal(
+        prices, [[2.0, np.nan, np.nan], [3.0, np.nan, np.nan], [4.0, 5.0, np.nan]]
+    )
+    result = moving_average(prices, 2, "sma")
+    np.testing.assert_array_equal(result[-1], [3.5, np.nan, np.nan])
+
+
+def test_extend_panel_appends_and_reads_together():
+    store = PriceHistoryStore(max_depth=3, max_symbols=2)
+    store.append("A", 1.0)
+    prices, volumes = store.extend_panel({"A": ([2.0, 3.0], [5.0, 6.0]), "B": ([4.0], None)})
+
+    np.testing.assert_array_equal(prices, [[1.0, np.nan], [2.0, np.nan], [3.0, 4.0]])
+    np.testing.assert_array_equal(volumes[:, 0], [np.nan, 5.0, 6.0])
+    np.testing.assert_array_equal(store.history("B")[0], [4.0])
+
+
+def test_append_history_appends_and_reads_together():
+    store = PriceHistoryStore(max_depth=2, max_symbols=1)
+    store.append("A", 1.0, volume=10.0)
+    store.append("A", 2.0, volume=20.0)
+
+    length, prices, volumes = store.append_history("A", 3.0)
+
+    assert length == 2
+    np.testing.assert_array_equal(prices, [2.0, 3.0])
+    np.testing.assert_array_equal(volumes, [20.0, np.nan])
+
+
+def test_memory_usage():
+    store = PriceHistoryStore(max_depth=100, max_symbols=10)
+    store.append("A", 1.0)
+    usage = store.memory_usage()
+
+    assert usage["allocated_bytes"] == 2 * 100 * 10 * 8
+    assert usage["used_bytes"] == 2 * 100 * 8
+    assert usage["symbols"] == 1
+
+
+def test_process_bar_computes_from_history():
+    from app.processor import process_bar
+
+    store = PriceHistoryStore(max_depth=50, max_symbols=2)
+    closes = 100 + np.cumsum(np.random.default_rng(1).normal(size=30))
+    for close in closes:
+        payload = process_bar({"symbol": "MSFT", "Close": close}, 10, "ema", store=store)
+
+    assert payload["window"] == 10
+    expected = moving_average(closes, 10, "ema")[-1]
+    assert payload["result"]["EMA_10"] == pytest.approx(expected)
+    assert process_bar({"Close": 1.0}, 10, store=store) is None
+    assert process_bar({"symbol": "MSFT", "Close": 1.0}, 10, "vwap", store=store) is None
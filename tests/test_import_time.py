@@ -0,0 +1,51 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+# Seconds `import app.main` may take; override for slow CI runners
+IMPORT_BUDGET = float(os.getenv("IMPORT_TIME_BUDGET", "3.0"))
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "modules": sorted(sys.modules)}}))
+"""
+
+
+def _import(module: str, **env: str) -> dict:
+    # A fresh interpreter, so modules imported by other tests do not hide what is loaded
+    environment = {**os.environ, "PYTHONPATH": str(SRC), "POLLER_NAME": "", **env}
+    result = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(module=module)],
+        capture_output=True,
+        text=True,
+        env=environment,
+        timeout=60,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_main_import_skips_unused_backends():
+    probe = _import("app.main", QUEUE_TYPE="rabbitmq", OUTPUT_MODES="log")
+
+    loaded = set(probe["modules"])
+    for backend in ("boto3", "botocore", "pika", "sqlalchemy", "aio_pika", "app.s3_sink"):
+        assert backend not in loaded, f"{backend} imported at startup"
+    assert probe["seconds"] < IMPORT_BUDGET
+
+
+@pytest.mark.parametrize(
+    "module",
+    ["app.utils", "app.config_shared", "app.utils.vault_client", "app.utils.setup_logger"],
+)
+def test_modules_import_on_their_own(module):
+    _import(module)
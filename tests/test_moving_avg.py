@@ -0,0 +1,242 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.moving_avg import (
+    calculate_moving_average,
+    calculate_moving_averages,
+    calculate_panel_moving_average,
+)
+from app.moving_avg_array import _MovingAverageGraph
+
+
+def _legacy_wma(data: pd.Series, window: int) -> pd.Series:
+    weights = np.arange(1, window + 1)
+    return data.rolling(window).apply(lambda x: float(np.dot(x, weights) / weights.sum()), raw=True)
+
+
+@pytest.fixture
+def prices() -> pd.Series:
+    rng = np.random.default_rng(42)
+    values = 100 + np.cumsum(rng.normal(size=5_000))
+    return pd.Series(values, index=pd.date_range("2024-01-01", periods=5_000, freq="min"))
+
+
+@pytest.mark.parametrize("window", [1, 2, 3, 14, 50, 200])
+def test_wma_matches_rolling_apply(prices, window):
+    result = calculate_moving_average(prices, window, "wma")
+    expected = _legacy_wma(prices, window)
+    assert result.index.equals(prices.index)
+    np.testing.assert_allclose(result.to_numpy(), expected.to_numpy(), rtol=1e-9, atol=1e-9)
+
+
+def test_wma_propagates_nan_windows(prices):
+    prices = prices.copy()
+    prices.iloc[[0, 1, 2, 1000]] = np.nan
+    result = calculate_moving_average(prices, 10, "wma")
+    expected = _legacy_wma(prices, 10)
+    np.testing.assert_array_equal(result.isna().to_numpy(), expected.isna().to_numpy())
+    np.testing.assert_allclose(result.to_numpy(), expected.to_numpy(), rtol=1e-9, atol=1e-9)
+
+
+def test_wma_window_longer_than_series():
+    result = calculate_moving_average(pd.Series([1.0, 2.0, 3.0]), 5, "wma")
+    assert result.isna().all()
+
+
+def test_hma_matches_rolling_apply(prices):
+    window = 16
+    half = _legacy_wma(prices, window // 2)
+    full = _legacy_wma(prices, window)
+    expected = _legacy_wma(2 * half - full, int(np.sqrt(window)))
+    result = calculate_moving_average(prices, window, "hma")
+    np.testing.assert_allclose(result.to_numpy(), expected.to_numpy(), rtol=1e-9, atol=1e-9)
+
+
+def _legacy_hma(data: pd.Series, window: int) -> pd.Series:
+    half = _legacy_wma(data, window // 2)
+    full = _legacy_wma(data, window)
+    return _legacy_wma(2 * half - full, int(np.sqrt(window)))
+
+
+@pytest.mark.parametrize("scale, atol", [(4e4, 1e-9), (1e6, 2e-9)])
+@pytest.mark.parametrize("window", [16, 100])
+def test_hma_matches_rolling_apply_at_high_prices(scale, atol, window):
+    # The legacy result is itself only accurate to a few ulp (1.2e-10 at 1e6)
+    rng = np.random.default_rng(7)
+    prices = pd.Series(scale + np.cumsum(rng.normal(size=3_000)) * scale / 1e3)
+    result = calculate_moving_average(prices, window, "hma")
+    expected = _legacy_hma(prices, window)
+    np.testing.assert_array_equal(result.isna().to_numpy(), expected.isna().to_numpy())
+    np.testing.assert_allclose(result.to_numpy(), expected.to_numpy(), rtol=0, atol=atol)
+
+
+def test_wma_with_nans_at_block_starts_at_high_prices():
+    rng = np.random.default_rng(8)
+    prices = pd.Series(1e6 + np.cumsum(rng.normal(size=3_000)) * 1e3)
+    # Blocks of windows start every max(4 * window, 64) rows; start some of them on NaN
+    prices.iloc[[0, 1, 2, 200, 800, 1600]] = np.nan
+    for window in (10, 50):
+        result = calculate_moving_average(prices, window, "wma")
+        expected = _legacy_wma(prices, window)
+        np.testing.assert_array_equal(result.isna().to_numpy(), expected.isna().to_numpy())
+        np.testing.assert_allclose(result.to_numpy(), expected.to_numpy(), rtol=0, atol=2e-9)
+
+
+def _legacy_kama(data: pd.Series, window: int) -> pd.Series:
+    change = (data - data.shift(window)).abs()
+    volatility = data.diff().abs().rolling(window=window).sum().replace(0, np.nan)
+    sc = (change / volatility * (2 / 3 - 2 / 31) + 2 / 31) ** 2
+    kama = data.copy().astype("float64")
+    for i in range(window, len(data)):
+        kama.iloc[i] = kama.iloc[i - 1] + sc.iloc[i] * (data.iloc[i] - kama.iloc[i - 1])
+    return kama
+
+
+@pytest.mark.parametrize("kernel", ["default", "python"])
+@pytest.mark.parametrize("window", [1, 10, 30])
+def test_kama_matches_iloc_loop(prices, monkeypatch, kernel, window):
+    from app import moving_avg_array
+
+    if kernel == "python":
+        monkeypatch.setattr(moving_avg_array, "_kama_kernel_impl", moving_avg_array._kama_kernel_py)
+
+    data = prices.iloc[:2_000]
+    result = calculate_moving_average(data, window, "kama")
+    expected = _legacy_kama(data, window)
+    np.testing.assert_array_equal(result.to_numpy(), expected.to_numpy())
+
+
+@pytest.mark.parametrize("kernel", ["default", "python"])
+def test_kama_series_with_leading_nans_matches_iloc_loop(prices, monkeypatch, kernel):
+    from app import moving_avg_array
+
+    if kernel == "python":
+        monkeypatch.setattr(moving_avg_array, "_kama_kernel_impl", moving_avg_array._kama_kernel_py)
+
+    data = prices.iloc[:200].copy()
+    data.iloc[:5] = np.nan
+    result = calculate_moving_average(data, 10, "kama")
+    # Only panel columns skip leading NaN padding; a single series stays NaN after the seed
+    np.testing.assert_array_equal(result.to_numpy(), _legacy_kama(data, 10).to_numpy())
+    assert result.iloc[10:].isna().all()
+
+
+def test_kama_flat_series_matches_iloc_loop():
+    data = pd.Series([1.0, 1.0, 1.0, 1.0, 2.0, 3.0])
+    result = calculate_moving_average(data, 2, "kama")
+    np.testing.assert_array_equal(result.to_numpy(), _legacy_kama(data, 2).to_numpy())
+
+
+def test_batch_matches_individual_calls(prices):
+    volume = pd.Series(np.arange(1, len(prices) + 1, dtype=float), index=prices.index)
+    specs = [
+        (method, window)
+        for method in ("sma", "ema", "wma", "hma", "vwap", "dema", "tema", "kama", "tma")
+        for window in (5, 20)
+    ]
+    result = calculate_moving_averages(prices, specs, volume=volume)
+
+    assert list(result.columns) == [f"{m.upper()}_{w}" for m, w in specs]
+    assert result.index.equals(prices.index)
+    for method, window in specs:
+        expected = calculate_moving_average(prices, window, method, volume=volume)
+        np.testing.assert_array_equal(
+            result[f"{method.upper()}_{window}"].to_numpy(), expected.to_numpy()
+        )
+
+
+def test_batch_shares_intermediates(prices):
+    graph = _MovingAverageGraph(prices.to_numpy())
+    for method in ("sma", "ema", "dema", "tema", "tma"):
+        graph.get(method, 10)
+    # sma, tma, ema, ema2, ema3, dema, tema: each EMA in the chain is computed once
+    assert graph.node_count == 7
+
+    graph.get("hma", 20)
+    graph.get("hma", 10)
+    graph.get("wma", 10)
+    # wma_10 and wma_20 feed hma_20; wma_5 and wma_10 feed hma_10
+    wma_keys = {key for key in graph._cache if key[0] == "wma"}
+    assert wma_keys == {("wma", 5), ("wma", 10), ("wma", 20)}
+
+
+def test_batch_deduplicates_specs_and_validates(prices):
+    result = calculate_moving_averages(prices, [("sma", 5), ("sma", 5)])
+    assert list(result.columns) == ["SMA_5"]
+
+    with pytest.raises(ValueError):
+        calculate_moving_averages(prices, [("vwap", 5)])
+    with pytest.raises(ValueError):
+        calculate_moving_averages(prices, [("foo", 5)])
+
+
+@pytest.fixture
+def ragged_panel() -> tuple[pd.DataFrame, pd.DataFrame]:
+    rng = np.random.default_rng(3)
+    index = pd.date_range("2024-01-01", periods=400, freq="min")
+    prices = pd.DataFrame(
+        100 + np.cumsum(rng.normal(size=(400, 6)), axis=0), index=index, columns=list("ABCDEF")
+    )
+    volume = pd.DataFrame(rng.integers(1, 100, size=(400, 6)).astype(float), index=index)
+    volume.columns = prices.columns
+    # Shorter histories are NaN-padded at the top
+    for column, start in zip("BCF", (50, 399, 400)):
+        prices.iloc[:start, prices.columns.get_loc(column)] = np.nan
+        volume.iloc[:start, volume.columns.get_loc(column)] = np.nan
+    return prices, volume
+
+
+@pytest.mark.parametrize("kernel", ["default", "python"])
+@pytest.mark.parametrize(
+    "method", ["sma", "ema", "wma", "hma", "vwap", "dema", "tema", "kama", "tma"]
+)
+def test_panel_matches_per_symbol(ragged_panel, monkeypatch, kernel, method):
+    from app import moving_avg_array
+
+    if kernel == "python":
+        monkeypatch.setattr(moving_avg_array, "_kama_kernel_impl", moving_avg_array._kama_kernel_py)
+        monkeypatch.setattr(moving_avg_array, "_ema_kernel_impl", moving_avg_array._ema_kernel_pd)
+
+    prices, volume = ragged_panel
+    result = calculate_panel_moving_average(prices, 10, method, volume=volume)
+
+    assert result.index.equals(prices.index) and result.columns.equals(prices.columns)
+    for column in prices.columns:
+        history = prices[column].dropna()
+        expected = calculate_moving_average(history, 10, method, volume=volume[column].dropna())
+        np.testing.assert_allclose(
+            result[column].loc[history.index].to_numpy(), expected.to_numpy(), rtol=1e-12
+        )
+        assert result[column].drop(history.index).isna().all()
+
+
+def test_panel_long_frame_matches_per_symbol(ragged_panel):
+    prices, volume = ragged_panel
+    long = (
+        pd.concat({"Close": prices, "Volume": volume}, axis=1)
+        .stack(future_stack=True)
+        .dropna()
+        .rename_axis(["timestamp", "symbol"])
+        .reset_index()
+    )
+    # Row order across symbols does not matter, only within a symbol
+    long = long.sample(frac=1, random_state=0).sort_values("timestamp", kind="stable")
+
+    for method in ("kama", "vwap"):
+        result = calculate_panel_moving_average(long, 20, method)
+        assert result.name == f"{method.upper()}_20"
+        assert result.index.equals(long.index)
+        for symbol, rows in long.groupby("symbol"):
+            expected = calculate_moving_average(rows["Close"], 20, method, volume=rows["Volume"])
+            np.testing.assert_allclose(result.loc[rows.index], expected, rtol=1e-12)
+
+
+def test_panel_long_frame_validation():
+    empty = pd.DataFrame({"symbol": [], "Close": []})
+    assert calculate_panel_moving_average(empty, 5).empty
+
+    with pytest.raises(ValueError):
+        calculate_panel_moving_average(pd.DataFrame({"symbol": [None], "Close": [1.0]}), 5)
+    with pytest.raises(ValueError):
+        calculate_panel_moving_average(pd.DataFrame({"symbol": ["A"], "Close": [1.0]}), 5, "vwap")
@@ -0,0 +1,105 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app import moving_avg_array
+from app.moving_avg import calculate_moving_average
+from app.moving_avg_array import moving_average, moving_averages
+
+METHODS = ("sma", "ema", "wma", "hma", "vwap", "dema", "tema", "kama", "tma")
+
+
+@pytest.fixture
+def values() -> np.ndarray:
+    rng = np.random.default_rng(7)
+    x = 100 + np.cumsum(rng.normal(size=3_000))
+    x[[50, 51, 900]] = np.nan
+    return x
+
+
+@pytest.fixture
+def volume(values) -> np.ndarray:
+    return np.arange(1, len(values) + 1, dtype=float)
+
+
+@pytest.mark.parametrize("method", METHODS)
+def test_matches_pandas_reference(values, volume, method):
+    data = pd.Series(values)
+    for window in (1, 5, 30):
+        result = moving_average(values, window, method, volume=volume)
+        reference = {
+            "sma": lambda: data.rolling(window).mean(),
+            "ema": lambda: data.ewm(span=window, adjust=False).mean(),
+            "vwap": lambda: (data * volume).cumsum() / pd.Series(volume).cumsum(),
+            "tma": lambda: data.rolling(window).mean().rolling(window).mean(),
+        }.get(method, lambda: calculate_moving_average(data, window, method, pd.Series(volume)))
+        np.testing.assert_allclose(result, reference().to_numpy(), rtol=1e-12, atol=1e-12)
+
+
+def test_ema_kernel_matches_pandas_bitwise(values):
+    data = pd.Series(values)
+    for window in (2, 10, 200):
+        out = np.empty_like(values)
+        moving_avg_array._ema_kernel(values, (window - 1) / 2.0, out)
+        expected = data.ewm(span=window, adjust=False).mean().to_numpy()
+        np.testing.assert_array_equal(out, expected)
+
+
+def test_out_buffer_is_filled_and_returned(values):
+    out = np.full_like(values, 123.0)
+    result = moving_average(values, 10, "hma", out=out)
+
+    assert result is out
+    np.testing.assert_array_equal(out, moving_average(values, 10, "hma"))
+
+
+def test_out_buffer_is_validated(values):
+    with pytest.raises(ValueError):
+        moving_average(values, 10, out=np.empty(len(values) - 1))
+    with pytest.raises(ValueError):
+        moving_average(values, 10, out=np.empty(len(values), dtype=np.float32))
+    with pytest.raises(ValueError):
+        moving_averages(values, [("sma", 5)], out=np.empty((len(values), 2)))
+
+
+def test_batch_writes_columns(values, volume):
+    specs = [(method, 8) for method in METHODS] + [("sma", 8)]
+    out = np.empty((len(values), len(specs)))
+    result = moving_averages(values, specs, volume=volume, out=out)
+
+    assert result is out
+    for column, (method, window) in enumerate(specs):
+        np.testing.assert_array_equal(
+            result[:, column], moving_average(values, window, method, volume=volume)
+        )
+
+
+def test_accepts_integer_input():
+    result = moving_average([1, 2, 3, 4], 2, "sma")
+    np.testing.assert_array_equal(result, [np.nan, 1.5, 2.5, 3.5])
+
+
+def test_invalid_arguments(values):
+    with pytest.raises(ValueError):
+        moving_average(values, 0, "sma")
+    with pytest.raises(ValueError):
+        moving_average(values, 5, "foo")
+    with pytest.raises(ValueError):
+        moving_average(values, 5, "vwap")
+    with pytest.raises(ValueError):
+        moving_average(values, 5, "vwap", volume=np.ones(3))
+
+
+def test_panel_batch_matches_columns(values, volume):
+    panel = np.column_stack([values, values[::-1], values * 2])
+    panel_volume = np.column_stack([volume] * 3)
+    specs = [("ema", 5), ("kama", 10), ("hma", 9), ("vwap", 1)]
+    result = moving_averages(panel, specs, volume=panel_volume)
+
+    assert result.shape == panel.shape + (len(specs),)
+    for column in range(panel.shape[1]):
+        for index, (method, window) in enumerate(specs):
+            expected = moving_average(
+                panel[:, column], window, method, volume=panel_volume[:, column]
+            )
+            np.testing.assert_array_equal(result[:, column, index], expected)
@@ -0,0 +1,70 @@
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.moving_avg import calculate_moving_average
+from app.moving_avg_stream import (
+    StreamingAverageRegistry,
+    StreamingSMA,
+    create_streaming_average,
+)
+
+METHODS = ["sma", "ema", "wma", "hma", "vwap", "dema", "tema", "kama", "tma"]
+
+
+@pytest.fixture
+def bars() -> pd.DataFrame:
+    rng = np.random.default_rng(7)
+    return pd.DataFrame(
+        {
+            "Close": 100 + np.cumsum(rng.normal(size=600)),
+            "Volume": rng.integers(100, 10_000, size=600).astype(float),
+        }
+    )
+
+
+@pytest.mark.parametrize("method", METHODS)
+@pytest.mark.parametrize("window", [1, 4, 20])
+def test_streaming_matches_batch(bars, method, window):
+    expected = calculate_moving_average(bars["Close"], window, method, volume=bars["Volume"])
+    state = create_streaming_average(method, window)
+    streamed = [state.update(p, v) for p, v in zip(bars["Close"], bars["Volume"])]
+    np.testing.assert_allclose(streamed, expected.to_numpy(), rtol=1e-9, atol=1e-9)
+
+
+@pytest.mark.parametrize("method", ["sma", "ema", "wma", "hma", "vwap", "tma"])
+def test_streaming_matches_batch_with_gaps(bars, method):
+    bars = bars.copy()
+    bars.loc[[0, 50, 51, 300], "Close"] = np.nan
+    expected = calculate_moving_average(bars["Close"], 5, method, volume=bars["Volume"])
+    state = create_streaming_average(method, 5)
+    streamed = [state.update(p, v) for p, v in zip(bars["Close"], bars["Volume"])]
+    np.testing.assert_allclose(streamed, expected.to_numpy(), rtol=1e-9, atol=1e-9)
+
+
+def test_vwap_requires_volume():
+    with pytest.raises(ValueError):
+        create_streaming_average("vwap", 5).update(1.0)
+
+
+def test_invalid_method_and_window():
+    with pytest.raises(ValueError):
+        create_streaming_average("foo", 5)
+    with pytest.raises(ValueError):
+        StreamingSMA(0)
+
+
+def test_registry_keeps_one_state_per_key():
+    registry = StreamingAverageRegistry()
+    for price in (1.0, 2.0, 3.0):
+        registry.update("AAPL", "sma", 2, price)
+        registry.update("MSFT", "sma", 2, price * 10)
+    assert registry.get("AAPL", "sma", 2).value == 2.5
+    assert registry.get("MSFT", "sma", 2).value == 25.0
+    assert len(registry) == 2
+
+    registry.discard("AAPL")
+    assert len(registry) == 1
+    assert math.isnan(registry.get("AAPL", "sma", 2).value)
@@ -0,0 +1,167 @@
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from app.history_store import PriceHistoryStore
+from app.moving_avg_array import moving_average
+from app.processor import create_batch_handler, process_message_batch
+
+SPECS = [("sma", 3), ("ema", 5), ("vwap", 1)]
+
+
+def _bars(symbol: str, closes, start: int = 0) -> list[dict]:
+    return [
+        {"symbol": symbol, "timestamp": start + i, "Close": close, "Volume": 10.0 + i}
+        for i, close in enumerate(closes)
+    ]
+
+
+def test_batch_matches_per_symbol_history():
+    rng = np.random.default_rng(5)
+    closes = {symbol: 100 + np.cumsum(rng.normal(size=12)) for symbol in ("AAPL", "MSFT", "TSLA")}
+    store = PriceHistoryStore(max_depth=50, max_symbols=10)
+
+    outputs = []
+    for start in range(0, 12, 4):
+        # Interleave symbols within each batch
+        batch = [
+            bar
+            for bars in zip(*(_bars(s, c[start : start + 4], start) for s, c in closes.items()))
+            for bar in bars
+        ]
+        outputs += process_message_batch(batch, SPECS, store=store)
+
+    assert len(outputs) == 36
+    for symbol, series in closes.items():
+        results = [o["result"] for o in outputs if o["symbol"] == symbol]
+        assert [r["timestamp"] for r in results] == list(range(12))
+        volume = np.array([10.0 + i % 4 for i in range(12)])
+        for method, window in SPECS:
+            expected = moving_average(series, window, method, volume=volume)
+            actual = [r[f"{method.upper()}_{window}"] for r in results]
+            actual = [np.nan if value is None else value for value in actual]
+            np.testing.assert_allclose(actual, expected, rtol=1e-12)
+
+    assert outputs[0]["indicators"] == ["SMA_3", "EMA_5", "VWAP_1"]
+    assert outputs[0]["result"]["SMA_3"] is None
+
+
+def test_batch_drops_invalid_messages():
+    store = PriceHistoryStore(max_depth=10, max_symbols=10)
+    batch = [{"symbol": "A", "Close": 1.0}, {"symbol": "A", "Close": "bad"}, {"Close": 2.0}]
+
+    outputs = process_message_batch(batch, [("sma", 1)], store=store)
+
+    assert [o["result"]["SMA_1"] for o in outputs] == [1.0]
+    assert process_message_batch([{"foo": 1}], [("sma", 1)], store=store) == []
+    assert process_message_batch([], [("sma", 1)], store=store) == []
+
+
+def test_batch_longer_than_history_depth():
+    store = PriceHistoryStore(max_depth=3, max_symbols=1)
+    outputs = process_message_batch(_bars("A", [1.0, 2.0, 3.0, 4.0, 5.0]), [("sma", 2)], store)
+
+    values = [o["result"]["SMA_2"] for o in outputs]
+    # Only the newest three bars are still held when the indicators are computed
+    assert values == [None, None, None, 3.5, 4.5]
+
+
+def test_concurrent_batches_for_one_symbol_keep_their_bars():
+    import threading
+    import time
+
+    class _SlowStore(PriceHistoryStore):
+        def extend(self, *args, **kwargs):
+            # Give the other thread time to append between a separate append and read
+            count = super().extend(*args, **kwargs)
+            time.sleep(0.001)
+            return count
+
+    store = _SlowStore(max_depth=8, max_symbols=1)
+    mismatches = []
+
+    def worker(offset):
+        for batch in range(50):
+            closes = [offset + 10.0 * batch + i for i in range(5)]
+            outputs = process_message_batch(_bars("A", closes), [("sma", 1), ("sma", 2)], store)
+            for i, output in enumerate(outputs):
+                result = output["result"]
+                # Each bar's values come from its own batch, in order
+                if result["SMA_1"] != result["Close"] or (
+                    i and result["SMA_2"] != result["Close"] - 0.5
+                ):
+                    mismatches.append(result)
+
+    threads = [threading.Thread(target=worker, args=(offset,)) for offset in (0.0, 1e6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert mismatches == []
+
+
+def test_concurrent_bars_for_one_symbol_use_their_own_bar():
+    import threading
+    import time
+
+    from app.processor import process_bar
+
+    class _SlowStore(PriceHistoryStore):
+        def append(self, *args, **kwargs):
+            # Give the other thread time to append between a separate append and read
+            count = super().append(*args, **kwargs)
+            time.sleep(0.001)
+            return count
+
+    store = _SlowStore(max_depth=8, max_symbols=1)
+    mismatches = []
+
+    def worker(offset):
+        for i in range(100):
+            payload = process_bar({"symbol": "A", "Close": offset + i}, 1, store=store)
+            if payload["result"]["SMA_1"] != payload["result"]["Close"]:
+                mismatches.append(payload)
+
+    threads = [threading.Thread(target=worker, args=(offset,)) for offset in (0.0, 1e6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert mismatches == []
+
+
+def test_batch_handler_sends_one_output_batch():
+    send = MagicMock()
+    handler = create_batch_handler(send, [("sma", 2)], PriceHistoryStore(10, 10))
+
+    handler(_bars("A", [1.0, 2.0]) + _bars("B", [3.0]))
+
+    send.assert_called_once()
+    (outputs,) = send.call_args.args
+    assert [o["symbol"] for o in outputs] == ["A", "A", "B"]
+
+    send.reset_mock()
+    handler([{"bad": True}])
+    send.assert_not_called()
+
+
+def test_process_stock_data_sends_whole_table_when_columnar(monkeypatch):
+    pytest.importorskip("pyarrow")
+    import pandas as pd
+
+    from app import processor
+
+    sent = []
+    monkeypatch.setattr(processor.config_shared, "get_output_columnar", lambda: True)
+    monkeypatch.setattr(processor, "send_table_to_output", sent.append)
+    frame = pd.DataFrame({"symbol": ["A"] * 4, "Close": [1.0, 2.0, 3.0, 4.0]})
+
+    processor.process_stock_data(frame, 2, "sma")
+
+    (table,) = sent
+    assert table.num_rows == 4
+    assert table.column("SMA_2").to_pylist()[1:] == [1.5, 2.5, 3.5]
+    assert table.column("analysis_type").to_pylist() == ["movavg"] * 4
@@ -1,2 +1,304 @@
 def test_queue_handler_imports():
     import app.queue_handler
+
+
+class _FakeChannel:
+    def __init__(self, connection):
+        self.connection = connection
+        self.acks = []
+        self.nacks = []
+
+    def queue_declare(self, **kwargs):
+        pass
+
+    def basic_qos(self, prefetch_count):
+        self.prefetch_count = prefetch_count
+
+    def basic_consume(self, queue, on_message_callback, auto_ack):
+        self.on_message = on_message_callback
+
+    def basic_ack(self, delivery_tag, multiple=False):
+        self.acks.append((delivery_tag, multiple))
+
+    def basic_nack(self, delivery_tag, multiple=False, requeue=True):
+        self.nacks.append((delivery_tag, multiple, requeue))
+
+
+class _FakeConnection:
+    """Delivers one scripted group of bodies per `process_data_events` call."""
+
+    def __init__(self, deliveries, shutdown_event):
+        self.deliveries = list(deliveries)
+        self.shutdown_event = shutdown_event
+        self.channel_obj = _FakeChannel(self)
+        self.tag = 0
+        self.closed = False
+
+    def channel(self):
+        return self.channel_obj
+
+    def process_data_events(self, time_limit):
+        if not self.deliveries:
+            self.shutdown_event.set()
+            return
+        for body in self.deliveries.pop(0):
+            self.tag += 1
+            method = type("Method", (), {"delivery_tag": self.tag})
+            self.channel_obj.on_message(self.channel_obj, method, None, body)
+
+    def close(self):
+        self.closed = True
+
+
+def _run_rabbitmq(monkeypatch, deliveries, callback, batch_size=3, linger_ms=0):
+    import pika
+
+    from app import queue_handler
+
+    connection = _FakeConnection(deliveries, queue_handler.shutdown_event)
+    monkeypatch.setattr(pika, "BlockingConnection", lambda params: connection)
+    for name in ("host", "port", "vhost", "user", "password", "queue"):
+        monkeypatch.setattr(queue_handler.config, f"get_rabbitmq_{name}", lambda: "test")
+    monkeypatch.setattr(pika, "ConnectionParameters", lambda **kwargs: kwargs)
+    monkeypatch.setattr(queue_handler.config, "get_batch_size", lambda: batch_size)
+    monkeypatch.setattr(queue_handler.config, "get_batch_linger_ms", lambda: linger_ms)
+    monkeypatch.setattr(queue_handler.config, "get_rabbitmq_requeue_on_failure", lambda: True)
+    queue_handler.shutdown_event.clear()
+    try:
+        queue_handler._start_rabbitmq_listener.__wrapped__(callback)
+    finally:
+        queue_handler.shutdown_event.clear()
+    return connection
+
+
+def test_rabbitmq_listener_batches_by_size_and_linger(monkeypatch):
+    batches = []
+    bodies = [b'{"n": %d}' % i for i in range(5)]
+    connection = _run_rabbitmq(monkeypatch, [bodies, [b"not json"]], batches.append)
+
+    # Three by size, the remaining two once the linger time has passed
+    assert [[m["n"] for m in batch] for batch in batches] == [[0, 1, 2], [3, 4]]
+    assert connection.channel_obj.prefetch_count == 3
+    assert connection.channel_obj.acks == [(3, True), (5, True)]
+    assert connection.channel_obj.nacks == [(6, False, False)]
+    assert connection.closed
+
+
+def test_rabbitmq_listener_nacks_failed_batch(monkeypatch):
+    def fail(batch):
+        raise RuntimeError("boom")
+
+    connection = _run_rabbitmq(monkeypatch, [[b"{}", b"{}"]], fail, batch_size=10, linger_ms=60_000)
+
+    # The partial batch is flushed on shutdown, then nacked as a whole
+    assert connection.channel_obj.acks == []
+    assert connection.channel_obj.nacks == [(2, True, True)]
+
+
+class _FakeSQS:
+    def __init__(self, receives=(), fail_ids=(), sender_fault=False):
+        self.receives = list(receives)
+        self.fail_ids = set(fail_ids)
+        self.sender_fault = sender_fault
+        self.delete_calls = []
+        self.visibility_calls = []
+
+    def receive_message(self, **kwargs):
+        from app import queue_handler
+
+        if not self.receives:
+            queue_handler.shutdown_event.set()
+            return {}
+        return {"Messages": self.receives.pop(0)}
+
+    def delete_message_batch(self, QueueUrl, Entries):
+        self.delete_calls.append([entry["ReceiptHandle"] for entry in Entries])
+        failed = [
+            {"Id": entry["Id"], "Code": "InternalError", "SenderFault": self.sender_fault}
+            for entry in Entries
+            if entry["ReceiptHandle"] in self.fail_ids
+        ]
+        self.fail_ids.clear()
+        return {"Failed": failed}
+
+    def change_message_visibility_batch(self, QueueUrl, Entries):
+        self.visibility_calls.append(
+            [(entry["ReceiptHandle"], entry["VisibilityTimeout"]) for entry in Entries]
+        )
+        return {}
+
+
+def test_delete_sqs_messages_batches_and_retries_failures():
+    from app.queue_handler import _delete_sqs_messages
+
+    sqs = _FakeSQS(fail_ids={"h3"})
+    handles = [f"h{i}" for i in range(12)]
+    _delete_sqs_messages(sqs, "url", handles)
+
+    # Two requests of at most 10 entries, plus one retry of the failed entry
+    assert sqs.delete_calls == [handles[:10], ["h3"], handles[10:]]
+
+    sqs = _FakeSQS(fail_ids={"h0"}, sender_fault=True)
+    _delete_sqs_messages(sqs, "url", ["h0"])
+    assert sqs.delete_calls == [["h0"]]
+
+
+def test_visibility_heartbeat_extends_until_stopped():
+    import time
+
+    from app.queue_handler import _VisibilityHeartbeat
+
+    sqs = _FakeSQS()
+    with _VisibilityHeartbeat(sqs, "url", ["a", "b"], timeout=0.04):
+        time.sleep(0.1)
+    calls = len(sqs.visibility_calls)
+
+    assert calls >= 2
+    assert sqs.visibility_calls[0] == [("a", 0.04), ("b", 0.04)]
+    time.sleep(0.05)
+    assert len(sqs.visibility_calls) == calls
+
+
+def test_sqs_listener_deletes_processed_batch(monkeypatch):
+    import boto3
+
+    from app import queue_handler
+
+    messages = [{"Body": '{"n": %d}' % i, "ReceiptHandle": f"h{i}"} for i in range(3)]
+    messages.append({"Body": "not json", "ReceiptHandle": "bad"})
+    sqs = _FakeSQS(receives=[messages])
+    monkeypatch.setattr(boto3, "client", lambda *args, **kwargs: sqs)
+    monkeypatch.setattr(queue_handler.config, "get_sqs_queue_url", lambda: "url")
+    batches = []
+
+    queue_handler.shutdown_event.clear()
+    try:
+        queue_handler._start_sqs_listener.__wrapped__(batches.append)
+    finally:
+        queue_handler.shutdown_event.clear()
+
+    assert batches == [[{"n": 0}, {"n": 1}, {"n": 2}]]
+    assert sqs.delete_calls == [["h0", "h1", "h2"]]
+
+
+def test_sqs_listener_drains_received_batches_with_backpressure(monkeypatch):
+    import threading
+    import time
+
+    import boto3
+
+    from app import queue_handler
+
+    received = []
+    processed = []
+    lock = threading.Lock()
+
+    class _CountingSQS(_FakeSQS):
+        def receive_message(self, **kwargs):
+            with lock:
+                index = len(received)
+                received.append(index)
+            return {"Messages": [{"Body": '{"n": %d}' % index, "ReceiptHandle": f"h{index}"}]}
+
+    def slow_callback(batch):
+        time.sleep(0.01)
+        with lock:
+            processed.append(batch[0]["n"])
+            # Received but unprocessed batches: queued, held by workers or blocked pollers
+            assert len(received) - len(processed) <= 1 + 2 + 3
+            if len(processed) == 10:
+                queue_handler.shutdown_event.set()
+
+    sqs = _CountingSQS()
+    monkeypatch.setattr(boto3, "client", lambda *args, **kwargs: sqs)
+    monkeypatch.setattr(queue_handler.config, "get_sqs_queue_url", lambda: "url")
+    monkeypatch.setattr(queue_handler.config, "get_sqs_poller_count", lambda: 3)
+    monkeypatch.setattr(queue_handler.config, "get_worker_count", lambda: 2)
+    monkeypatch.setattr(queue_handler.config, "get_work_queue_size", lambda: 1)
+
+    queue_handler.shutdown_event.clear()
+    try:
+        queue_handler._start_sqs_listener.__wrapped__(slow_callback)
+    finally:
+        queue_handler.shutdown_event.clear()
+
+    # Every batch received before shutdown was processed and deleted
+    assert sorted(processed) == received
+    assert sorted(call[0] for call in sqs.delete_calls) == sorted(f"h{i}" for i in received)
+
+
+def _client_error(operation):
+    from botocore.exceptions import ClientError
+
+    return ClientError({"Error": {"Code": "ReceiptHandleIsInvalid"}}, operation)
+
+
+def test_sqs_listener_survives_client_errors(monkeypatch):
+    import boto3
+
+    from app import queue_handler
+
+    class _FailingSQS(_FakeSQS):
+        receive_failed = False
+
+        def receive_message(self, **kwargs):
+            if not self.receive_failed:
+                self.receive_failed = True
+                raise _client_error("ReceiveMessage")
+            return super().receive_message(**kwargs)
+
+        def delete_message_batch(self, QueueUrl, Entries):
+            super().delete_message_batch(QueueUrl, Entries)
+            raise _client_error("DeleteMessageBatch")
+
+    batches = [[{"Body": '{"n": %d}' % i, "ReceiptHandle": f"h{i}"}] for i in range(3)]
+    sqs = _FailingSQS(receives=batches)
+    monkeypatch.setattr(boto3, "client", lambda *args, **kwargs: sqs)
+    monkeypatch.setattr(queue_handler.config, "get_sqs_queue_url", lambda: "url")
+    monkeypatch.setattr(queue_handler.config, "get_worker_count", lambda: 1)
+    monkeypatch.setattr(queue_handler.config, "get_work_queue_size", lambda: 1)
+    monkeypatch.setattr(queue_handler.shutdown_event, "wait", lambda timeout=None: False)
+    processed = []
+
+    queue_handler.shutdown_event.clear()
+    try:
+        queue_handler._start_sqs_listener.__wrapped__(processed.append)
+    finally:
+        queue_handler.shutdown_event.clear()
+
+    # A failed receive is retried and failed deletes do not stop the worker
+    assert processed == [[{"n": 0}], [{"n": 1}], [{"n": 2}]]
+    assert sqs.delete_calls == [["h0"], ["h1"], ["h2"]]
+
+
+def test_visibility_heartbeat_stops_on_client_error():
+    import time
+
+    from app.queue_handler import _VisibilityHeartbeat
+
+    class _ExpiredSQS(_FakeSQS):
+        def change_message_visibility_batch(self, QueueUrl, Entries):
+            super().change_message_visibility_batch(QueueUrl, Entries)
+            raise _client_error("ChangeMessageVisibilityBatch")
+
+    sqs = _ExpiredSQS()
+    heartbeat = _VisibilityHeartbeat(sqs, "url", ["a"], timeout=0.02).start()
+    time.sleep(0.1)
+
+    assert not heartbeat._thread.is_alive()
+    assert len(sqs.visibility_calls) == 1
+    heartbeat.stop()
+
+
+def test_put_work_gives_up_after_shutdown_without_workers():
+    import queue
+
+    from app import queue_handler
+
+    work = queue.Queue(maxsize=1)
+    work.put("full")
+    queue_handler.shutdown_event.set()
+    try:
+        assert queue_handler._put_work(work, "batch", workers=[]) is False
+    finally:
+        queue_handler.shutdown_event.clear()
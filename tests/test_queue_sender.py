@@ -0,0 +1,381 @@
+import json
+import threading
+
+import pytest
+from pika.exceptions import AMQPConnectionError
+
+
+class _FakeChannel:
+    def __init__(self, connection):
+        self.connection = connection
+        self.is_open = True
+
+    def basic_publish(self, exchange, routing_key, body):
+        if self.connection.fail_after is not None and not self.connection.fail_after:
+            self.connection.fail_after = None
+            self.connection.is_open = self.is_open = False
+            raise AMQPConnectionError("connection lost")
+        if self.connection.fail_after:
+            self.connection.fail_after -= 1
+        self.connection.published.append((exchange, routing_key, json.loads(body)))
+
+
+class _FakeConnection:
+    def __init__(self, published, fail_after=None):
+        self.published = published
+        self.fail_after = fail_after
+        self.is_open = True
+        self.channels = 0
+        self.dropped = False
+
+    def channel(self):
+        self.channels += 1
+        return _FakeChannel(self)
+
+    def process_data_events(self, time_limit=None):
+        from pika.exceptions import StreamLostError
+
+        if self.dropped:
+            # Dropped by the broker while idle; pika only notices when it reads the socket
+            raise StreamLostError("Transport indicated EOF")
+
+    def close(self):
+        self.is_open = False
+
+
+@pytest.fixture
+def publisher(monkeypatch):
+    import pika
+    from tenacity import wait_none
+
+    from app import queue_sender
+
+    published = []
+    connections = []
+
+    def connect(params):
+        # Only the first connection drops, after the number of publishes set by the test
+        fail_after = publisher.fail_after if not connections else None
+        connections.append(_FakeConnection(published, fail_after))
+        return connections[-1]
+
+    monkeypatch.setattr(pika, "BlockingConnection", connect)
+    monkeypatch.setattr(pika, "ConnectionParameters", lambda **kwargs: kwargs)
+    monkeypatch.setattr(queue_sender, "wait_exponential", lambda **kwargs: wait_none())
+    for name in ("host", "port", "vhost", "user", "password", "exchange", "routing_key"):
+        monkeypatch.setattr(queue_sender.config_shared, f"get_rabbitmq_{name}", lambda: "test")
+    monkeypatch.setattr(queue_sender.config_shared, "get_queue_type", lambda: "rabbitmq")
+
+    publisher = queue_sender.RabbitMQPublisher()
+    publisher.fail_after = None
+    publisher.published = published
+    publisher.connections = connections
+    monkeypatch.setattr(queue_sender, "rabbitmq_publisher", publisher)
+    return publisher
+
+
+def test_publish_reuses_connection_across_batches(publisher):
+    from app.queue_sender import publish_to_queue
+
+    publish_to_queue([{"n": 0}, {"n": 1}])
+    publish_to_queue([{"n": 2}], queue="override", exchange="ex")
+
+    assert len(publisher.connections) == 1
+    assert publisher.connections[0].channels == 1
+    assert [body["n"] for _, _, body in publisher.published] == [0, 1, 2]
+    assert publisher.published[-1][:2] == ("ex", "override")
+
+    publisher.close()
+    assert not publisher.connections[0].is_open
+
+
+def test_publish_reconnects_and_resumes_batch(publisher):
+    from app.queue_sender import publish_to_queue
+
+    publisher.fail_after = 2
+    publish_to_queue([{"n": i} for i in range(5)])
+
+    # The batch continues on a new connection without resending the first two
+    assert len(publisher.connections) == 2
+    assert [body["n"] for _, _, body in publisher.published] == [0, 1, 2, 3, 4]
+
+
+def test_publish_reconnects_after_idle_drop(publisher):
+    from app.queue_sender import publish_to_queue
+
+    publish_to_queue([{"n": 0}])
+    publisher.connections[0].dropped = True
+    publish_to_queue([{"n": 1}])
+
+    # The stale connection still reported is_open; the heartbeat check found the drop
+    assert len(publisher.connections) == 2
+    assert [body["n"] for _, _, body in publisher.published] == [0, 1]
+
+
+def test_publish_is_serialized_across_threads(publisher):
+    from app.queue_sender import publish_to_queue
+
+    def send(thread):
+        for batch in range(20):
+            publish_to_queue([{"thread": thread, "batch": batch, "n": n} for n in range(5)])
+
+    threads = [threading.Thread(target=send, args=(i,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(publisher.connections) == 1
+    bodies = [body for _, _, body in publisher.published]
+    assert len(bodies) == 4 * 20 * 5
+    # Each batch is published contiguously
+    for start in range(0, len(bodies), 5):
+        batch = bodies[start : start + 5]
+        assert [body["n"] for body in batch] == list(range(5))
+        assert len({(body["thread"], body["batch"]) for body in batch}) == 1
+
+
+class _FakeSQS:
+    def __init__(self, failures=()):
+        # One {entry index: sender fault} mapping, or an exception to raise, per request
+        self.failures = list(failures)
+        self.calls = []
+
+    def send_message_batch(self, QueueUrl, Entries):
+        self.calls.append([int(entry["Id"]) for entry in Entries])
+        failing = self.failures.pop(0) if self.failures else {}
+        if isinstance(failing, Exception):
+            raise failing
+        return {
+            "ResponseMetadata": {"HTTPStatusCode": 200},
+            "Successful": [{"Id": e["Id"]} for e in Entries if int(e["Id"]) not in failing],
+            "Failed": [
+                {"Id": e["Id"], "Code": "InternalError", "SenderFault": failing[int(e["Id"])]}
+                for e in Entries
+                if int(e["Id"]) in failing
+            ],
+        }
+
+
+@pytest.fixture
+def sqs(monkeypatch):
+    import time
+
+    from app import queue_sender
+
+    client = _FakeSQS()
+    monkeypatch.setattr(queue_sender, "_get_sqs_client", lambda region: client)
+    monkeypatch.setattr(queue_sender.config_shared, "get_queue_type", lambda: "sqs")
+    monkeypatch.setattr(queue_sender.config_shared, "get_sqs_queue_url", lambda: "url")
+    monkeypatch.setattr(queue_sender.config_shared, "get_sqs_region", lambda: "us-east-1")
+    monkeypatch.setattr(time, "sleep", lambda seconds: None)
+    return client
+
+
+def test_sqs_batches_respect_entry_and_size_limits():
+    from app.queue_sender import SQS_MAX_BATCH_BYTES, _sqs_batches
+
+    batches = list(_sqs_batches(["x"] * 23))
+    assert [len(batch) for batch in batches] == [10, 10, 3]
+    assert [entry["Id"] for entry in batches[1]] == [str(i) for i in range(10, 20)]
+
+    large = "x" * (SQS_MAX_BATCH_BYTES // 3)
+    assert [len(batch) for batch in _sqs_batches([large] * 5)] == [3, 2]
+
+
+def test_sqs_publish_sends_batches(sqs):
+    from app.queue_sender import publish_to_queue
+
+    publish_to_queue([{"n": i} for i in range(12)])
+
+    assert sqs.calls == [list(range(10)), [10, 11]]
+
+
+def test_sqs_publish_retries_only_failed_entries(sqs):
+    from app.queue_sender import SQSMessageSendError, publish_to_queue
+
+    sqs.failures = [{2: False, 5: False}, {5: False}]
+    publish_to_queue([{"n": i} for i in range(8)])
+    assert sqs.calls == [list(range(8)), [2, 5], [5]]
+
+    # Sender faults are not retried and fail the publish
+    sqs.calls.clear()
+    sqs.failures = [{1: True, 3: False}]
+    with pytest.raises(SQSMessageSendError):
+        publish_to_queue([{"n": i} for i in range(4)])
+    assert sqs.calls == [[0, 1, 2, 3], [3]]
+
+
+def test_sqs_client_is_cached_per_region(monkeypatch):
+    import boto3
+
+    from app import queue_sender
+
+    monkeypatch.setattr(boto3, "client", lambda service, region_name: object())
+    queue_sender._get_sqs_client.cache_clear()
+    try:
+        first = queue_sender._get_sqs_client("us-east-1")
+        assert queue_sender._get_sqs_client("us-east-1") is first
+        assert queue_sender._get_sqs_client("eu-west-1") is not first
+    finally:
+        queue_sender._get_sqs_client.cache_clear()
+
+
+class _ConfirmingChannel:
+    """Asynchronous channel implementation that records publishes for the connection to confirm."""
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.is_open = True
+        self._impl = self
+
+    def confirm_delivery(self, ack_nack_callback, callback):
+        self.connection.on_confirm = ack_nack_callback
+        if not self.connection.silent_select:
+            callback("select-ok")
+
+    def basic_publish(self, exchange, routing_key, body):
+        self.connection.tag += 1
+        self.connection.unconfirmed.append((self.connection.tag, json.loads(body)))
+        self.connection.max_in_flight = max(
+            self.connection.max_in_flight, len(self.connection.unconfirmed)
+        )
+
+
+class _ConfirmingConnection:
+    def __init__(self, nack_ns=(), silent=False, silent_select=False):
+        self.nack_ns = set(nack_ns)
+        self.silent = silent
+        self.silent_select = silent_select
+        self.is_open = True
+        self.tag = 0
+        self.unconfirmed = []
+        self.confirmed = []
+        self.max_in_flight = 0
+
+    def channel(self):
+        return _ConfirmingChannel(self)
+
+    def process_data_events(self, time_limit):
+        import pika
+
+        if self.silent:
+            return
+        # Nack flagged messages once each, then ack the rest in one multiple ack
+        for tag, body in list(self.unconfirmed):
+            if body["n"] in self.nack_ns:
+                self.nack_ns.discard(body["n"])
+                self.unconfirmed.remove((tag, body))
+                self.on_confirm(pika.frame.Method(1, pika.spec.Basic.Nack(tag, multiple=False)))
+        if self.unconfirmed:
+            last = self.unconfirmed[-1][0]
+            self.confirmed += [body["n"] for _, body in self.unconfirmed]
+            self.unconfirmed = []
+            self.on_confirm(pika.frame.Method(1, pika.spec.Basic.Ack(last, multiple=True)))
+
+    def close(self):
+        self.is_open = False
+
+
+def _confirming_publisher(monkeypatch, connection, window=4, timeout=30.0):
+    import pika
+
+    from app import queue_sender
+
+    monkeypatch.setattr(pika, "BlockingConnection", lambda params: connection)
+    monkeypatch.setattr(pika, "ConnectionParameters", lambda **kwargs: kwargs)
+    for name in ("host", "port", "vhost", "user", "password"):
+        monkeypatch.setattr(queue_sender.config_shared, f"get_rabbitmq_{name}", lambda: "test")
+    return queue_sender.RabbitMQPublisher(confirm_window=window, confirm_timeout=timeout)
+
+
+def test_confirm_mode_keeps_window_in_flight_and_retries_nacks(monkeypatch):
+    connection = _ConfirmingConnection(nack_ns={3, 7})
+    publisher = _confirming_publisher(monkeypatch, connection)
+
+    publisher.publish([{"n": i} for i in range(10)], "ex", "key")
+
+    assert sorted(connection.confirmed) == list(range(10))
+    assert connection.confirmed[-2:] == [3, 7]
+    assert connection.max_in_flight == 4
+    assert not publisher._in_flight
+
+
+def test_confirm_mode_fails_without_confirms(monkeypatch):
+    from app.queue_sender import RabbitMQPublishError
+
+    connection = _ConfirmingConnection(silent=True)
+    publisher = _confirming_publisher(monkeypatch, connection, timeout=0.2)
+
+    with pytest.raises(RabbitMQPublishError):
+        publisher.publish([{"n": 0}], "ex", "key")
+    assert not connection.is_open
+
+
+def test_confirm_select_times_out(monkeypatch):
+    from app.queue_sender import RabbitMQPublishError
+
+    connection = _ConfirmingConnection(silent_select=True)
+    publisher = _confirming_publisher(monkeypatch, connection, timeout=0.2)
+
+    with pytest.raises(RabbitMQPublishError):
+        publisher.publish([{"n": 0}], "ex", "key")
+    assert connection.unconfirmed == []
+
+
+def test_confirm_latency_is_recorded_separately(monkeypatch):
+    from app.utils.metrics import queue_publish_confirm_latency, queue_publish_latency
+
+    def count(histogram, status):
+        samples = histogram.labels(queue_type="rabbitmq", status=status).collect()[0].samples
+        return next(s.value for s in samples if s.name.endswith("_count"))
+
+    before = count(queue_publish_confirm_latency, "confirmed")
+    publisher = _confirming_publisher(monkeypatch, _ConfirmingConnection())
+    publisher.publish([{"n": i} for i in range(3)], "ex", "key")
+
+    assert count(queue_publish_confirm_latency, "confirmed") == before + 3
+    assert count(queue_publish_latency, "confirmed") == 0
+
+
+def _throttled():
+    from botocore.exceptions import ClientError
+
+    return ClientError({"Error": {"Code": "ThrottlingException"}}, "SendMessageBatch")
+
+
+def test_sqs_publish_retries_transient_errors_per_chunk(sqs):
+    from app.queue_sender import publish_to_queue
+
+    sqs.failures = [{}, _throttled()]
+    publish_to_queue([{"n": i} for i in range(12)])
+
+    # Only the chunk that failed is resent; the first chunk is not duplicated
+    assert sqs.calls == [list(range(10)), [10, 11], [10, 11]]
+
+
+def test_sqs_publish_retries_pending_entries_after_transient_error(sqs):
+    from botocore.exceptions import ClientError, EndpointConnectionError
+
+    from app.queue_sender import SQS_SEND_ATTEMPTS, publish_to_queue
+
+    sqs.failures = [{3: False}, EndpointConnectionError(endpoint_url="url")]
+    publish_to_queue([{"n": i} for i in range(5)])
+    assert sqs.calls == [list(range(5)), [3], [3]]
+
+    sqs.calls.clear()
+    sqs.failures = [_throttled() for _ in range(SQS_SEND_ATTEMPTS)]
+    with pytest.raises(ClientError):
+        publish_to_queue([{"n": 0}])
+    assert len(sqs.calls) == SQS_SEND_ATTEMPTS
+
+
+def test_sqs_publish_rejects_oversized_messages_up_front(sqs):
+    from app.queue_sender import SQS_MAX_BATCH_BYTES, SQSMessageSendError, publish_to_queue
+
+    messages = [{"n": 0}, {"n": 1, "blob": "x" * SQS_MAX_BATCH_BYTES}]
+    with pytest.raises(SQSMessageSendError, match="exceed the SQS limit"):
+        publish_to_queue(messages)
+
+    # Nothing is sent, so the small message is not published ahead of a failure
+    assert sqs.calls == []
@@ -0,0 +1,163 @@
+import gzip
+import json
+import time
+
+import pytest
+
+from app.s3_sink import BufferedS3Sink
+
+
+class _FakeS3:
+    def __init__(self, fail=0):
+        self.objects = {}
+        self.fail = fail
+        self.parts = {}
+        self.aborted = []
+
+    def put_object(self, Bucket, Key, Body):
+        if self.fail:
+            self.fail -= 1
+            raise RuntimeError("S3 unavailable")
+        self.objects[Key] = Body
+
+    def create_multipart_upload(self, Bucket, Key):
+        self.parts[Key] = []
+        return {"UploadId": "upload-1"}
+
+    def upload_part(self, Bucket, Key, UploadId, PartNumber, Body):
+        self.parts[Key].append(Body)
+        return {"ETag": f"etag-{PartNumber}"}
+
+    def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload):
+        assert [p["PartNumber"] for p in MultipartUpload["Parts"]] == list(
+            range(1, len(self.parts[Key]) + 1)
+        )
+        self.objects[Key] = b"".join(self.parts[Key])
+
+    def abort_multipart_upload(self, Bucket, Key, UploadId):
+        self.aborted.append(Key)
+
+
+def _records(symbol, count, timestamp=1714560000):
+    return [
+        {"symbol": symbol, "result": {"timestamp": timestamp, "SMA_3": i}} for i in range(count)
+    ]
+
+
+def _sink(client, **kwargs):
+    options = dict(bucket="bucket", prefix="out", flush_bytes=10**6, flush_seconds=60)
+    options.update(kwargs)
+    return BufferedS3Sink(client=client, **options)
+
+
+def _read(body):
+    return [json.loads(line) for line in gzip.decompress(body).splitlines()]
+
+
+def test_flush_writes_one_object_per_partition():
+    client = _FakeS3()
+    sink = _sink(client)
+    sink.add(_records("AAPL", 3) + _records("BRK/B", 2, timestamp="2024-05-02T10:00:00Z"))
+    sink.add(_records("AAPL", 1))
+    assert client.objects == {}
+
+    sink.close()
+
+    keys = sorted(client.objects)
+    assert [key.rsplit("/", 1)[0] for key in keys] == [
+        "out/date=2024-05-01/symbol=AAPL",
+        "out/date=2024-05-02/symbol=BRK_B",
+    ]
+    assert all(key.endswith(".ndjson.gz") for key in keys)
+    assert len(_read(client.objects[keys[0]])) == 4
+    assert sink.buffered_bytes == 0
+
+
+def test_size_threshold_flushes_in_background():
+    client = _FakeS3()
+    sink = _sink(client, flush_bytes=2000)
+    sink.add(_records("AAPL", 5))
+    time.sleep(0.05)
+    assert client.objects == {}
+
+    sink.add(_records("AAPL", 50))
+    deadline = time.monotonic() + 2
+    while not client.objects and time.monotonic() < deadline:
+        time.sleep(0.01)
+    sink.close()
+
+    assert sum(len(_read(body)) for body in client.objects.values()) == 55
+
+
+def test_age_threshold_flushes_in_background():
+    client = _FakeS3()
+    sink = _sink(client, flush_seconds=0.05)
+    sink.add(_records("AAPL", 1))
+    deadline = time.monotonic() + 2
+    while not client.objects and time.monotonic() < deadline:
+        time.sleep(0.01)
+    sink.close()
+
+    assert len(client.objects) == 1
+
+
+def test_large_objects_use_multipart_upload():
+    client = _FakeS3()
+    sink = _sink(client, compression="none", multipart_bytes=1000)
+    sink.add(_records("AAPL", 100))
+    sink.flush()
+
+    (key,) = client.objects
+    assert len(client.parts[key]) > 1
+    lines = client.objects[key].splitlines()
+    assert [json.loads(line)["result"]["SMA_3"] for line in lines] == list(range(100))
+
+
+def test_failed_upload_is_retried_on_next_flush():
+    client = _FakeS3(fail=1)
+    sink = _sink(client)
+    sink.add(_records("AAPL", 2))
+    sink.flush()
+    assert client.objects == {} and sink.buffered_bytes > 0
+
+    sink.add(_records("AAPL", 1))
+    sink.flush()
+    (body,) = client.objects.values()
+    assert len(_read(body)) == 3
+
+
+def test_rejects_unknown_format():
+    with pytest.raises(ValueError):
+        _sink(_FakeS3(), output_format="csv")
+
+
+def test_tables_are_written_as_columnar_partitions():
+    pyarrow = pytest.importorskip("pyarrow")
+    import pyarrow.ipc
+
+    client = _FakeS3()
+    sink = _sink(client, output_format="arrow", compression="zstd")
+    table = pyarrow.table(
+        {
+            "timestamp": [1714560000, 1714560060, 1714646400],
+            "symbol": ["AAPL", "AAPL", "MSFT"],
+            "SMA_3": [1.0, 2.0, 3.0],
+        }
+    )
+    sink.add_table(table)
+    sink.add_table(table.slice(0, 1))
+    sink.close()
+
+    keys = sorted(client.objects)
+    assert [key.rsplit("/", 1)[0] for key in keys] == [
+        "out/date=2024-05-01/symbol=AAPL",
+        "out/date=2024-05-02/symbol=MSFT",
+    ]
+    assert all(key.endswith(".arrow") for key in keys)
+    written = pyarrow.ipc.open_file(pyarrow.BufferReader(client.objects[keys[0]])).read_all()
+    assert written.column("SMA_3").to_pylist() == [1.0, 2.0, 1.0]
+
+
+def test_rejects_gzip_arrow_output():
+    with pytest.raises(ValueError):
+        _sink(_FakeS3(), output_format="arrow", compression="gzip")
@@ -0,0 +1,76 @@
+import logging
+
+import pytest
+
+from app.utils import hot_path_logging
+from app.utils.hot_path_logging import HotPathLogger
+
+
+class _Records(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+@pytest.fixture
+def hot_logger(monkeypatch):
+    def make(enabled, level=logging.DEBUG, sample_every=3, summary_seconds=3600.0):
+        config = hot_path_logging.config_shared
+        monkeypatch.setattr(config, "get_hot_path_logging", lambda: enabled)
+        monkeypatch.setattr(config, "get_log_sample_every", lambda: sample_every)
+        monkeypatch.setattr(config, "get_log_summary_seconds", lambda: summary_seconds)
+        logger = logging.getLogger(f"test.hot_path.{enabled}.{level}.{summary_seconds}")
+        logger.handlers[:] = [handler := _Records()]
+        logger.setLevel(level)
+        logger.propagate = False
+        return HotPathLogger(logger), handler.records
+
+    return make
+
+
+class _Unformattable:
+    def __str__(self):
+        raise AssertionError("formatted a record that was not emitted")
+
+
+def test_default_mode_logs_every_computation_at_info(hot_logger):
+    log, records = hot_logger(False)
+
+    for window in range(4):
+        log.computation("Calculating %s with window=%d", "SMA", window)
+
+    assert [r.levelno for r in records] == [logging.INFO] * 4
+    assert records[1].getMessage() == "Calculating SMA with window=1"
+
+
+def test_hot_path_mode_samples_debug_and_skips_formatting(hot_logger):
+    log, records = hot_logger(True)
+    for window in range(7):
+        log.computation("Calculating %s with window=%d", "SMA", window)
+    assert [(r.levelno, r.args[1]) for r in records] == [(logging.DEBUG, w) for w in (0, 3, 6)]
+
+    quiet, quiet_records = hot_logger(True, level=logging.INFO)
+    quiet.computation("Calculating %s", _Unformattable())
+    assert quiet_records == []
+
+
+def test_hot_path_mode_counts_symbol_results(hot_logger):
+    log, records = hot_logger(True, summary_seconds=3600.0)
+    before = hot_path_logging.symbol_results_total.labels(analysis="SMA_3")._value.get()
+
+    for symbol in ("A", "B", "A"):
+        log.symbol_result(symbol, "SMA_3", "Calculated %s for symbol: %s", "SMA_3", symbol)
+
+    assert records == []
+    after = hot_path_logging.symbol_results_total.labels(analysis="SMA_3")._value.get()
+    assert after - before == 3
+
+    summary, summary_records = hot_logger(True, summary_seconds=0.0)
+    summary.symbol_result("A", "SMA_3", "unused")
+    summary.symbol_result("B", "SMA_3", "unused")
+    assert [r.getMessage() for r in summary_records][-1].startswith(
+        "Computed 1 result(s) for 1 symbol(s)"
+    )
@@ -1,4 +1,10 @@
+import gzip
+import json
+import threading
+import time
 import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock, patch
 
 from app.output_handler import OutputDispatcher
 from app.utils.types import OutputMode
@@ -15,5 +21,255 @@ class TestOutputDispatcherBasic(unittest.TestCase):
         self.assertTrue(callable(method))
 
 
+class TestOutputDispatcherFanOut(unittest.TestCase):
+    def setUp(self):
+        self.dispatcher = OutputDispatcher()
+        self.dispatcher.output_modes = ["rest", "s3", "log"]
+        self.release = threading.Event()
+        self.calls = []
+
+    def tearDown(self):
+        self.release.set()
+
+    def _slow(self, data):
+        self.release.wait(5)
+
+    def _fail(self, data):
+        raise RuntimeError("sink down")
+
+    def test_sinks_run_concurrently_with_timeout(self):
+        sinks = {"rest": self._slow, "s3": self._fail, "log": self.calls.append}
+
+        with (
+            patch.object(OutputDispatcher, "_get_dispatch_method", lambda _, m: sinks[m.value]),
+            patch("app.output_handler.config_shared.get_output_sink_timeout", lambda: 0.2),
+            patch("app.output_handler.config_shared.get_paper_trading_enabled", lambda: False),
+            patch("app.output_handler.record_sink_metrics") as record_sink,
+        ):
+            start = time.perf_counter()
+            self.dispatcher.send([{"symbol": "A"}])
+            elapsed = time.perf_counter() - start
+
+        self.assertLess(elapsed, 1.0)
+        self.assertEqual(self.calls, [[{"symbol": "A"}]])
+        recorded = sorted(call.args[:2] for call in record_sink.call_args_list)
+        self.assertEqual(recorded, [("rest", "timeout"), ("s3", "exception")])
+
+    def test_hung_sink_does_not_starve_healthy_sinks(self):
+        from concurrent.futures import ThreadPoolExecutor
+
+        self.dispatcher.output_modes = ["rest", "log"]
+        hung = []
+        sinks = {
+            "rest": lambda data: (hung.append(data), self.release.wait(5)),
+            "log": self.calls.append,
+        }
+        executor = ThreadPoolExecutor(max_workers=2)
+        self.addCleanup(executor.shutdown)
+
+        with (
+            patch.object(OutputDispatcher, "_get_dispatch_method", lambda _, m: sinks[m.value]),
+            patch("app.output_handler._executor", executor),
+            patch.dict("app.output_handler._sink_slots", clear=True),
+            patch("app.output_handler.config_shared.get_output_sink_max_in_flight", lambda: 1),
+            patch("app.output_handler.config_shared.get_output_sink_timeout", lambda: 0.2),
+            patch("app.output_handler.config_shared.get_paper_trading_enabled", lambda: False),
+            patch("app.output_handler.record_sink_metrics") as record_sink,
+        ):
+            for n in range(4):
+                self.dispatcher.send([{"n": n}])
+
+            # The hung sink holds one pool thread; later batches skip it as busy
+            self.assertEqual(len(hung), 1)
+            self.assertEqual(self.calls, [[{"n": n}] for n in range(4)])
+            statuses = [call.args[:2] for call in record_sink.call_args_list]
+            self.assertEqual(statuses, [("rest", "timeout")] + [("rest", "busy")] * 3)
+
+            # Once the sink returns, its slot is free again
+            self.release.set()
+            deadline = time.monotonic() + 2
+            while time.monotonic() < deadline and len(hung) < 2:
+                self.dispatcher.send([{"n": 4}])
+                time.sleep(0.01)
+            self.assertEqual(len(hung), 2)
+
+    def test_single_sink_runs_inline(self):
+        self.dispatcher.output_modes = ["log"]
+        threads = []
+
+        with (
+            patch.object(
+                OutputDispatcher,
+                "_output_to_log",
+                lambda _, data: threads.append(threading.current_thread()),
+            ),
+            patch("app.output_handler.config_shared.get_paper_trading_enabled", lambda: False),
+        ):
+            self.dispatcher.send([{"symbol": "A"}])
+
+        self.assertEqual(threads, [threading.current_thread()])
+
+
+class _CollectorHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        server = self.server
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        if self.headers.get("Content-Encoding") == "gzip":
+            body = gzip.decompress(body)
+        server.requests.append((self.client_address, json.loads(body)))
+        status = server.statuses.pop(0) if server.statuses else 200
+        self.send_response(status)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+class TestRestOutputSession(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _CollectorHandler)
+        self.server.requests = []
+        self.server.statuses = []
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{self.server.server_port}/collect"
+        patches = {
+            "get_rest_output_url": lambda: url,
+            "get_rest_output_backoff": lambda: 0,
+            "get_rest_output_gzip": lambda: True,
+        }
+        for name, value in patches.items():
+            patcher = patch(f"app.output_handler.config_shared.{name}", value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_rest_output_reuses_connection_and_retries(self):
+        dispatcher = OutputDispatcher()
+        self.server.statuses = [200, 503, 429]
+
+        with patch("app.output_handler.record_sink_metrics") as record_sink:
+            for n in range(3):
+                dispatcher._output_to_rest([{"n": n}])
+
+        bodies = [body for _, body in self.server.requests]
+        # The second batch is retried after the 503 and again after the 429
+        self.assertEqual(bodies, [[{"n": 0}]] + [[{"n": 1}]] * 3 + [[{"n": 2}]])
+        # Every request went over the same pooled connection
+        self.assertEqual(len({address for address, _ in self.server.requests}), 1)
+        statuses = [call.args[1] for call in record_sink.call_args_list]
+        self.assertEqual(statuses, ["200", "200", "200"])
+
+
+class TestDatabaseOutput(unittest.TestCase):
+    def setUp(self):
+        import tempfile
+
+        import sqlalchemy
+
+        from app import output_handler
+
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        url = f"sqlite:///{directory.name}/output.db"
+        output_handler._get_database_engine.cache_clear()
+        self.addCleanup(output_handler._get_database_engine.cache_clear)
+        with sqlalchemy.create_engine(url).begin() as conn:
+            conn.execute(sqlalchemy.text("CREATE TABLE bars (symbol TEXT, value REAL)"))
+        self.url = url
+
+    def test_batch_is_written_with_cached_engine(self):
+        import sqlalchemy
+
+        from app import output_handler
+
+        dispatcher = OutputDispatcher()
+        insert_sql = "INSERT INTO bars (symbol, value) VALUES (:symbol, :value)"
+        with (
+            patch("app.output_handler.config_shared.get_database_output_url", lambda: self.url),
+            patch("app.output_handler.config_shared.get_database_insert_sql", lambda: insert_sql),
+            patch("app.output_handler.config_shared.get_database_copy_table", lambda: ""),
+            patch("app.output_handler.record_sink_metrics") as record_sink,
+        ):
+            dispatcher._output_to_database([{"symbol": "A", "value": 1.0}, "bad"])
+            dispatcher._output_to_database([{"symbol": "B", "value": i} for i in range(500)])
+
+        self.assertEqual(output_handler._get_database_engine.cache_info().misses, 1)
+        self.assertEqual([call.args[1] for call in record_sink.call_args_list], ["success"] * 2)
+        engine = output_handler._get_database_engine(self.url)
+        with engine.connect() as conn:
+            count = conn.execute(sqlalchemy.text("SELECT COUNT(*) FROM bars")).scalar()
+        self.assertEqual(count, 501)
+
+    def test_copy_rows_streams_csv(self):
+        from app.output_handler import _copy_rows
+
+        class _Cursor:
+            def copy_expert(self, statement, buffer):
+                self.statement = statement
+                self.data = buffer.read()
+
+            def close(self):
+                pass
+
+        cursor = _Cursor()
+        conn = MagicMock()
+        conn.dialect.identifier_preparer.quote = lambda name: f'"{name}"'
+        conn.connection.driver_connection.cursor.return_value = cursor
+
+        rows = [{"symbol": "A", "result": {"SMA_3": 1.5}}, {"symbol": "B", "result": None}]
+        _copy_rows(conn, "public.bars", ["symbol", "result"], rows)
+
+        self.assertEqual(
+            cursor.statement,
+            'COPY "public"."bars" ("symbol", "result") FROM STDIN WITH (FORMAT csv)',
+        )
+        self.assertEqual(cursor.data, 'A,"{""SMA_3"": 1.5}"\r\nB,\r\n')
+
+    def test_copy_rows_writes_csv_with_psycopg3(self):
+        from app.output_handler import _copy_rows
+
+        class _Copy:
+            def __init__(self):
+                self.data = []
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc_info):
+                pass
+
+            def write(self, data):
+                self.data.append(data)
+
+            def write_row(self, row):
+                raise AssertionError("write_row sends TEXT format, not CSV")
+
+        class _Cursor:
+            def copy(self, statement):
+                self.statement = statement
+                self.copy_obj = _Copy()
+                return self.copy_obj
+
+            def close(self):
+                pass
+
+        cursor = _Cursor()
+        conn = MagicMock()
+        conn.dialect.identifier_preparer.quote = lambda name: f'"{name}"'
+        conn.connection.driver_connection.cursor.return_value = cursor
+
+        rows = [{"symbol": "A", "result": {"SMA_3": 1.5}}, {"symbol": "B", "result": None}]
+        _copy_rows(conn, "bars", ["symbol", "result"], rows)
+
+        self.assertTrue(cursor.statement.endswith("WITH (FORMAT csv)"))
+        self.assertEqual("".join(cursor.copy_obj.data), 'A,"{""SMA_3"": 1.5}"\r\nB,\r\n')
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,113 @@
+import logging
+import queue
+import threading
+import time
+
+import pytest
+
+from app.utils import queue_logging
+from app.utils.queue_logging import BoundedQueueHandler, flush_log_queue, queue_handler
+from app.utils.setup_logger import setup_logger
+
+
+class _Records(logging.Handler):
+    def __init__(self, delay=0.0):
+        super().__init__()
+        self.delay = delay
+        self.records = []
+        self.threads = set()
+
+    def emit(self, record):
+        time.sleep(self.delay)
+        self.threads.add(threading.current_thread().name)
+        self.records.append(record.getMessage())
+
+
+@pytest.fixture(autouse=True)
+def fresh_queue(monkeypatch):
+    monkeypatch.setattr(queue_logging, "_queue", None)
+    monkeypatch.setattr(queue_logging, "_listener", None)
+    monkeypatch.setattr(queue_logging, "_stopped", False)
+    monkeypatch.setattr(queue_logging.config_shared, "get_log_queue_size", lambda: 1000)
+    monkeypatch.setattr(queue_logging.config_shared, "get_log_queue_drop_policy", lambda: "newest")
+    yield
+    flush_log_queue()
+
+
+def _logger(name, handler):
+    logger = logging.getLogger(name)
+    logger.handlers[:] = [handler]
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    return logger
+
+
+def test_slow_handler_does_not_block_the_caller():
+    target = _Records(delay=0.05)
+    logger = _logger("test.queue_logging.slow", queue_handler([target]))
+
+    started = time.perf_counter()
+    for i in range(10):
+        logger.info("record %d", i)
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 0.25
+    flush_log_queue()
+    assert target.records == [f"record {i}" for i in range(10)]
+    assert threading.current_thread().name not in target.threads
+
+
+def test_full_queue_drops_newest_and_counts():
+    dropped_metric = queue_logging.log_records_dropped_total._value.get()
+    handler = BoundedQueueHandler(queue.Queue(maxsize=2), [_Records()], "newest")
+    logger = _logger("test.queue_logging.newest", handler)
+
+    for i in range(5):
+        logger.info("record %d", i)
+
+    queued = [handler.queue.get_nowait()[1].getMessage() for _ in range(2)]
+    assert queued == ["record 0", "record 1"]
+    assert handler.dropped == 3
+    assert queue_logging.log_records_dropped_total._value.get() == dropped_metric + 3
+
+
+def test_full_queue_drops_oldest():
+    handler = BoundedQueueHandler(queue.Queue(maxsize=2), [_Records()], "oldest")
+    logger = _logger("test.queue_logging.oldest", handler)
+
+    for i in range(5):
+        logger.info("record %d", i)
+
+    queued = [handler.queue.get_nowait()[1].getMessage() for _ in range(2)]
+    assert queued == ["record 3", "record 4"]
+    assert handler.dropped == 3
+
+
+def test_unknown_drop_policy_is_rejected():
+    with pytest.raises(ValueError):
+        BoundedQueueHandler(queue.Queue(), [], "random")
+
+
+def test_records_after_flush_are_written_synchronously():
+    target = _Records()
+    logger = _logger("test.queue_logging.after_flush", queue_handler([target]))
+    logger.info("queued")
+    flush_log_queue()
+
+    logger.info("direct")
+
+    assert target.records == ["queued", "direct"]
+    assert threading.current_thread().name in target.threads
+
+
+def test_setup_logger_attaches_queue_handler():
+    logger = logging.getLogger("test.queue_logging.setup")
+    logger.handlers.clear()
+    logger.propagate = False
+
+    setup_logger(logger.name, level=logging.INFO, structured=False, redact=True, queued=True)
+
+    assert len(logger.handlers) == 1
+    handler = logger.handlers[0]
+    assert isinstance(handler, BoundedQueueHandler)
+    assert [type(target) for target in handler.targets] == [logging.StreamHandler]
@@ -1,5 +1,7 @@
 import os
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
+
+import pytest
 
 from app.utils.vault_client import get_config_value_cached
 
@@ -14,3 +16,136 @@ def test_get_config_value_cached_returns_env():
 def test_get_config_value_cached_uses_default():
     value = get_config_value_cached("MISSING_KEY", default="default")
     assert value == "default"
+
+
+class _FakeKV:
+    def __init__(self, data):
+        self.data = data
+        self.reads = 0
+
+    def read_secret_version(self, path):
+        self.reads += 1
+        return {"data": {"data": self.data}}
+
+
+class _FakeHvac:
+    logins = 0
+
+    def __init__(self, url):
+        self.kv = _FakeKV({"DB_PASSWORD": "hunter2", "RETRIES": 5})
+        self.secrets = MagicMock()
+        self.secrets.kv.v2 = self.kv
+
+    def auth_approle(self, role_id, secret_id):
+        _FakeHvac.logins += 1
+        return {"auth": {"client_token": "token"}}
+
+
+def test_shared_client_reads_secret_once(monkeypatch):
+    from app.utils import vault_client
+
+    monkeypatch.setattr(vault_client.hvac, "Client", _FakeHvac)
+    monkeypatch.setattr(vault_client, "VAULT_ROLE_ID", "role")
+    monkeypatch.setattr(vault_client, "VAULT_SECRET_ID", "secret")
+    monkeypatch.setattr(vault_client, "POLLER_NAME", "poller")
+    vault_client.get_vault_client.cache_clear()
+    vault_client.get_config_value_cached.cache_clear()
+    try:
+        assert get_config_value_cached("DB_PASSWORD") == "hunter2"
+        assert get_config_value_cached("RETRIES") == "5"
+        assert get_config_value_cached("UNSET_KEY", "fallback") == "fallback"
+
+        client = vault_client.get_vault_client()
+        assert client.client.kv.reads == 1
+        assert _FakeHvac.logins == 1
+    finally:
+        vault_client.get_vault_client.cache_clear()
+        vault_client.get_config_value_cached.cache_clear()
+
+
+@pytest.fixture
+def fake_vault(monkeypatch):
+    from app.utils import vault_client
+
+    monkeypatch.setattr(vault_client.hvac, "Client", _FakeHvac)
+    monkeypatch.setattr(vault_client, "VAULT_ROLE_ID", "role")
+    monkeypatch.setattr(vault_client, "VAULT_SECRET_ID", "secret")
+    monkeypatch.setattr(vault_client, "POLLER_NAME", "poller")
+    monkeypatch.setattr(vault_client, "_listeners", ())
+    vault_client.get_vault_client.cache_clear()
+    vault_client.get_config_value_cached.cache_clear()
+    yield vault_client
+    vault_client.get_vault_client().stop_refresher()
+    vault_client.get_vault_client.cache_clear()
+    vault_client.get_config_value_cached.cache_clear()
+
+
+def test_refresh_publishes_new_snapshot_and_notifies_listeners(fake_vault):
+    from app import config_shared
+
+    calls = []
+    fake_vault.on_config_change(None, config_shared._clear_getter_caches)
+    fake_vault.on_config_change({"RABBITMQ_PASS"}, lambda keys: calls.append(("rabbit", keys)))
+    fake_vault.on_config_change({"DB_PASSWORD"}, lambda keys: calls.append(("db", keys)))
+    client = fake_vault.get_vault_client()
+    client.client.kv.data = {"RABBITMQ_PASS": "old"}
+    assert config_shared.get_rabbitmq_password() == "old"
+    first = fake_vault.current_config()
+
+    assert client.refresh() == frozenset()
+    assert calls == []
+
+    client.client.kv.data = {"RABBITMQ_PASS": "new"}
+    assert client.refresh() == {"RABBITMQ_PASS"}
+
+    assert calls == [("rabbit", frozenset({"RABBITMQ_PASS"}))]
+    assert config_shared.get_rabbitmq_password() == "new"
+    assert fake_vault.current_config().version == first.version + 1
+    assert first.values["RABBITMQ_PASS"] == "old"
+    with pytest.raises(TypeError):
+        first.values["RABBITMQ_PASS"] = "changed"
+
+
+def test_failed_refresh_keeps_snapshot(fake_vault):
+    client = fake_vault.get_vault_client()
+    before = client.snapshot
+
+    def fail(path):
+        raise RuntimeError("vault sealed")
+
+    client.client.kv.read_secret_version = fail
+    assert client.refresh() == frozenset()
+    assert client.snapshot is before
+
+
+def test_background_refresher_picks_up_changes(fake_vault, monkeypatch):
+    import time
+
+    monkeypatch.setattr(fake_vault, "VAULT_REFRESH_SECONDS", 0.01)
+    monkeypatch.setattr(fake_vault, "MIN_REFRESH_SECONDS", 0.01)
+    client = fake_vault.get_vault_client()
+    assert get_config_value_cached("DB_PASSWORD") == "hunter2"
+
+    client.client.kv.data = {"DB_PASSWORD": "rotated"}
+    assert client.start_refresher()
+    deadline = time.monotonic() + 2
+    while client.snapshot.values.get("DB_PASSWORD") != "rotated" and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert get_config_value_cached("DB_PASSWORD") == "rotated"
+
+
+def test_refresh_interval_keeps_last_lease(fake_vault):
+    client = fake_vault.get_vault_client()
+    kv = client.client.kv
+    kv.read_secret_version = lambda path: {"data": {"data": kv.data}, "lease_duration": 30}
+    fake_vault.get_config_value_cached.cache_clear()
+    client._snapshot = None
+    assert client.refresh_interval() == 30
+    assert client.start_refresher()
+
+    # A later read without a lease must not drop the interval to 0 and spin
+    kv.read_secret_version = lambda path: {"data": {"data": {"DB_PASSWORD": "new"}}}
+    client.refresh()
+    assert client.snapshot.lease_seconds == 0
+    assert client.refresh_interval() == 30